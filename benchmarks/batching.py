@@ -0,0 +1,82 @@
+"""
+Benchmark the throughput of publishing small messages one by one and in batches.
+
+Every message published individually costs one round trip through the transport, and one
+packet on the wire on networked transports. Publishing them in batches amortizes that cost,
+either explicitly with ``Publisher.publish_many`` or with publishers created with ``batch_size``.
+Throughput is measured from the first message published until the last one is received.
+
+Pass the host name of an MQTT broker to also benchmark the MQTT transport.
+
+Usage::
+
+    python benchmarks/batching.py [--mqtt HOST] [--messages N]
+"""
+
+import argparse
+import threading
+import time
+
+from compas_eve import InMemoryTransport
+from compas_eve import Message
+from compas_eve import Publisher
+from compas_eve import Subscriber
+from compas_eve import Topic
+
+BATCH_SIZES = [1, 10, 100, 1000]
+
+
+def run(transport, messages, batch_size, mode):
+    topic = Topic("/benchmark/batching/{}/{}/".format(mode, batch_size), Message)
+    done = threading.Event()
+    received = [0]
+
+    def callback(msg):
+        received[0] += 1
+        if received[0] == messages:
+            done.set()
+
+    subscriber = Subscriber(topic, callback, transport=transport)
+    subscriber.subscribe()
+    time.sleep(0.2)
+
+    samples = [Message(sequence=i, timestamp=time.time(), value=0.5) for i in range(messages)]
+    start = time.perf_counter()
+    if mode == "publish_many":
+        publisher = Publisher(topic, transport=transport)
+        for i in range(0, messages, batch_size):
+            publisher.publish_many(samples[i : i + batch_size])
+    else:
+        publisher = Publisher(topic, transport=transport, batch_size=batch_size)
+        for sample in samples:
+            publisher.publish(sample)
+        publisher.flush()
+
+    if not done.wait(timeout=60):
+        raise RuntimeError("Only received {} of {} messages".format(received[0], messages))
+    elapsed = time.perf_counter() - start
+    subscriber.unsubscribe()
+    return messages / elapsed
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--mqtt", metavar="HOST", help="also benchmark an MQTT broker on this host")
+    parser.add_argument("--messages", type=int, default=20000, help="number of messages per run")
+    args = parser.parse_args()
+
+    transports = [("in-memory", InMemoryTransport())]
+    if args.mqtt:
+        from compas_eve.mqtt import MqttTransport
+
+        transports.append(("mqtt", MqttTransport(args.mqtt)))
+
+    print("{:>10} {:>14} {:>11} {:>14} {:>9}".format("transport", "mode", "batch size", "messages / s", "speedup"))
+    for name, transport in transports:
+        for mode in ["publish_many", "batch_size"]:
+            baseline = None
+            for batch_size in BATCH_SIZES:
+                throughput = run(transport, args.messages, batch_size, mode)
+                baseline = baseline or throughput
+                print("{:>10} {:>14} {:>11} {:>14.0f} {:>8.1f}x".format(name, mode, batch_size, throughput, throughput / baseline))
+        transport.close()
@@ -0,0 +1,230 @@
+"""
+Benchmark suite of all codecs on a fixed corpus of representative COMPAS payloads.
+
+For every codec and payload, it measures encode and decode latency (mean and percentiles),
+throughput, encoded size and peak memory allocated while encoding and decoding. Results are
+printed as a table, and can be written as JSON to compare them across versions of compas_eve,
+COMPAS or the codec dependencies::
+
+    python benchmarks/codecs.py --output before.json
+    # upgrade something
+    python benchmarks/codecs.py --output after.json --compare before.json
+
+Codecs whose dependencies are not installed are skipped, and payloads a codec cannot
+handle are reported with their error instead of timings.
+
+Usage::
+
+    python benchmarks/codecs.py [--quick] [--codec NAME ...] [--payload NAME ...] [--output FILE] [--compare FILE]
+"""
+
+import argparse
+import datetime
+import gc
+import json
+import math
+import platform
+import sys
+import time
+import tracemalloc
+
+import compas
+from compas.datastructures import Graph
+from compas.datastructures import Mesh
+from compas.geometry import Frame
+
+import compas_eve
+from compas_eve import Message
+from compas_eve import codecs
+from compas_eve.codecs import CompressedMessageCodec
+from compas_eve.codecs import FastJsonMessageCodec
+from compas_eve.codecs import JsonMessageCodec
+from compas_eve.codecs import MsgPackMessageCodec
+from compas_eve.codecs import ProtobufMessageCodec
+
+# Timing stops at whichever limit comes first, after at least MIN_ITERATIONS
+MIN_ITERATIONS = 5
+MAX_ITERATIONS = 10000
+MIN_TIME = 1.0
+
+PERCENTILES = (50, 90, 99)
+
+PAYLOADS = ("small_dict", "frame", "mesh", "graph", "nested_messages")
+
+
+def available_codecs():
+    result = {"json": JsonMessageCodec, "fast_json": FastJsonMessageCodec}
+    if codecs.MSGPACK_AVAILABLE:
+        result["msgpack"] = MsgPackMessageCodec
+    if codecs.COMPAS_PB_AVAILABLE:
+        result["protobuf"] = ProtobufMessageCodec
+    result["compressed_fast_json"] = lambda: CompressedMessageCodec(FastJsonMessageCodec())
+    return result
+
+
+def corpus(quick=False):
+    graph = Graph()
+    for i in range(1000):
+        graph.add_node(i, x=float(i), y=0.0, z=0.0)
+    for i in range(999):
+        graph.add_edge(i, i + 1)
+
+    # (nx + 1)^2 vertices: ~10k in quick mode, ~100k otherwise
+    mesh = Mesh.from_meshgrid(dx=10, nx=100 if quick else 316)
+
+    return {
+        "small_dict": {"sequence": 1, "status": "ok", "values": [0.5, 1.5, 2.5]},
+        "frame": Message(frame=Frame.worldXY()),
+        "mesh": Message(mesh=mesh),
+        "graph": Message(graph=graph),
+        "nested_messages": Message(
+            header=Message(sequence=1, stamp=1700000000.0, frame_id="world"),
+            targets=[Message(name="target_{}".format(i), frame=Frame([i, 0, 0], [1, 0, 0], [0, 1, 0]), tolerance=0.01) for i in range(50)],
+        ),
+    }
+
+
+def percentile(samples, value):
+    # Nearest-rank percentile of sorted samples
+    index = max(0, int(math.ceil(value / 100.0 * len(samples))) - 1)
+    return samples[index]
+
+
+def measure(func, *args):
+    samples = []
+    deadline = time.perf_counter() + MIN_TIME
+    gc.disable()
+    try:
+        while len(samples) < MAX_ITERATIONS and (len(samples) < MIN_ITERATIONS or time.perf_counter() < deadline):
+            start = time.perf_counter()
+            func(*args)
+            samples.append(time.perf_counter() - start)
+    finally:
+        gc.enable()
+
+    samples.sort()
+    total = sum(samples)
+    result = dict(iterations=len(samples), mean_us=total / len(samples) * 1e6, min_us=samples[0] * 1e6)
+    for value in PERCENTILES:
+        result["p{}_us".format(value)] = percentile(samples, value) * 1e6
+    result["ops_per_s"] = len(samples) / total if total else float("inf")
+    return result
+
+
+def peak_memory(func, *args):
+    gc.collect()
+    tracemalloc.start()
+    try:
+        func(*args)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+
+def run(codec, message):
+    encoded = codec.encode(message)
+    wire = encoded.encode("utf-8") if isinstance(encoded, str) else encoded
+    encode = measure(codec.encode, message)
+    decode = measure(codec.decode, wire, Message)
+    for stats in (encode, decode):
+        stats["mb_per_s"] = len(wire) * stats["ops_per_s"] / 1e6
+    encode["peak_memory_bytes"] = peak_memory(codec.encode, message)
+    decode["peak_memory_bytes"] = peak_memory(codec.decode, wire, Message)
+    return dict(size_bytes=len(wire), encode=encode, decode=decode)
+
+
+def metadata(quick):
+    return dict(
+        timestamp=datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        python=sys.version.split()[0],
+        implementation=platform.python_implementation(),
+        platform=platform.platform(),
+        compas_eve=compas_eve.__version__,
+        compas=compas.__version__,
+        quick=quick,
+        orjson=codecs.ORJSON_AVAILABLE,
+        msgpack=codecs.MSGPACK_AVAILABLE,
+        compas_pb=codecs.COMPAS_PB_AVAILABLE,
+        lz4=codecs.LZ4_AVAILABLE,
+        zstd=codecs.ZSTD_AVAILABLE,
+    )
+
+
+def compare(results, baseline):
+    # Ratios above 1 mean slower (or larger) than the baseline
+    previous = {(result["payload"], result["codec"]): result for result in baseline["results"]}
+    print()
+    print("{:>16} {:>22} {:>10} {:>10} {:>10}".format("payload", "codec", "encode x", "decode x", "size x"))
+    for result in results:
+        before = previous.get((result["payload"], result["codec"]))
+        if before is None or "error" in result or "error" in before:
+            continue
+        print(
+            "{:>16} {:>22} {:>10.2f} {:>10.2f} {:>10.2f}".format(
+                result["payload"],
+                result["codec"],
+                result["encode"]["p50_us"] / before["encode"]["p50_us"],
+                result["decode"]["p50_us"] / before["decode"]["p50_us"],
+                result["size_bytes"] / before["size_bytes"],
+            )
+        )
+
+
+def main(argv=None):
+    codec_factories = available_codecs()
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--quick", action="store_true", help="use a smaller mesh and shorter timings, e.g. for CI")
+    parser.add_argument("--codec", action="append", choices=sorted(codec_factories), help="codec to run (default: all available)")
+    parser.add_argument("--payload", action="append", choices=PAYLOADS, help="payload to run (default: all)")
+    parser.add_argument("--output", help="write results as JSON to this file")
+    parser.add_argument("--compare", help="JSON results of a previous run to compare with")
+    args = parser.parse_args(argv)
+
+    global MIN_TIME
+    if args.quick:
+        MIN_TIME = 0.2
+
+    payloads = corpus(args.quick)
+    selected_payloads = args.payload or list(payloads)
+    selected_codecs = args.codec or list(codec_factories)
+
+    print("{:>16} {:>22} {:>10} {:>10} {:>10} {:>10} {:>10} {:>10}".format("payload", "codec", "bytes", "enc p50us", "enc p99us", "dec p50us", "dec p99us", "dec peakKB"))
+    results = []
+    for payload_name in selected_payloads:
+        message = payloads[payload_name]
+        for codec_name in selected_codecs:
+            result = dict(payload=payload_name, codec=codec_name)
+            try:
+                result.update(run(codec_factories[codec_name](), message))
+            except Exception as error:
+                result["error"] = "{}: {}".format(type(error).__name__, error)
+                print("{:>16} {:>22} {}".format(payload_name, codec_name, result["error"]))
+            else:
+                print(
+                    "{:>16} {:>22} {:>10} {:>10.1f} {:>10.1f} {:>10.1f} {:>10.1f} {:>10.1f}".format(
+                        payload_name,
+                        codec_name,
+                        result["size_bytes"],
+                        result["encode"]["p50_us"],
+                        result["encode"]["p99_us"],
+                        result["decode"]["p50_us"],
+                        result["decode"]["p99_us"],
+                        result["decode"]["peak_memory_bytes"] / 1024.0,
+                    )
+                )
+            results.append(result)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(dict(metadata=metadata(args.quick), results=results), f, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            compare(results, json.load(f))
+
+    return results
+
+
+if __name__ == "__main__":
+    main()
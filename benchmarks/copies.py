@@ -0,0 +1,87 @@
+"""
+Benchmark the payload copies made between publishing a message and receiving it.
+
+Each scenario publishes a message holding one large field (a string, or a NumPy array with the
+NumPy codec) to a local subscriber, and measures the peak memory allocated while the message
+travels from the publisher to the subscriber, relative to the size of that field. An ideal
+pipeline keeps about two payload-sized buffers alive: the encoded message and the decoded field
+(or only one, when the decoded array is a view on the received payload).
+Every extra copy of the payload adds about one to the ratio.
+
+Usage::
+
+    python benchmarks/copies.py [--size MB]
+"""
+
+import argparse
+import gc
+import time
+import tracemalloc
+
+import numpy
+
+from compas_eve import InMemoryTransport
+from compas_eve import Message
+from compas_eve import Publisher
+from compas_eve import Subscriber
+from compas_eve import Topic
+from compas_eve.codecs import CompressedMessageCodec
+from compas_eve.codecs import FastJsonMessageCodec
+from compas_eve.codecs import JsonMessageCodec
+from compas_eve.codecs import NumpyMessageCodec
+from compas_eve.shm import SharedMemoryTransport
+
+REPEAT = 5
+
+
+def measure(transport, message, size):
+    topic = Topic("/benchmark/copies/", Message)
+    received = []
+    subscriber = Subscriber(topic, received.append, transport=transport)
+    subscriber.subscribe()
+    publisher = Publisher(topic, transport=transport)
+
+    ratios = []
+    durations = []
+    for _ in range(REPEAT):
+        received.clear()
+        gc.collect()
+        tracemalloc.start()
+        start = time.perf_counter()
+        publisher.publish(message)
+        while not received:
+            time.sleep(0.0001)
+        durations.append(time.perf_counter() - start)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        ratios.append(peak / size)
+
+    subscriber.unsubscribe()
+    return min(ratios), min(durations)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--size", type=float, default=8, help="size of the large field in MB")
+    args = parser.parse_args()
+
+    size = int(args.size * 1e6)
+    text = Message(text="x" * size)
+    array = Message(points=numpy.random.rand(size // 8))
+
+    scenarios = [
+        ("in-memory", "json", lambda: InMemoryTransport(codec=JsonMessageCodec()), text),
+        ("in-memory", "fast_json", lambda: InMemoryTransport(codec=FastJsonMessageCodec()), text),
+        ("in-memory", "compressed (raw)", lambda: InMemoryTransport(codec=CompressedMessageCodec(FastJsonMessageCodec(), min_size=2 * size)), text),
+        ("in-memory", "numpy", lambda: InMemoryTransport(codec=NumpyMessageCodec(FastJsonMessageCodec())), array),
+        ("shm", "fast_json", lambda: SharedMemoryTransport(codec=FastJsonMessageCodec(), slot_size=2 * size, slot_count=2), text),
+        ("shm", "numpy", lambda: SharedMemoryTransport(codec=NumpyMessageCodec(FastJsonMessageCodec()), slot_size=2 * size, slot_count=2), array),
+    ]
+
+    print("{:>10} {:>18} {:>16} {:>10}".format("transport", "codec", "peak / payload", "ms"))
+    for transport_name, codec_name, factory, message in scenarios:
+        transport = factory()
+        ratio, duration = measure(transport, message, size)
+        if hasattr(transport, "close"):
+            transport.close()
+        print("{:>10} {:>18} {:>16.2f} {:>10.2f}".format(transport_name, codec_name, ratio, duration * 1e3))
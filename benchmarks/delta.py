@@ -0,0 +1,93 @@
+"""
+Benchmark the bandwidth of delta encoding on streams of robot states.
+
+Each message holds the state of a robot, as published by a digital twin: joint values and
+the frame of the tool center point change in every message, while the digital inputs and outputs,
+the status and the mesh of the tool rarely or never change. The stream is published on a topic
+with and without the ``delta`` option, and the size of the encoded payloads and the time
+from publishing to receiving every message are measured.
+
+Usage::
+
+    python benchmarks/delta.py [--messages N] [--keyframe-interval N]
+"""
+
+import argparse
+import math
+import time
+
+from compas.datastructures import Mesh
+from compas.geometry import Frame
+
+from compas_eve import InMemoryTransport
+from compas_eve import Message
+from compas_eve import Publisher
+from compas_eve import Subscriber
+from compas_eve import Topic
+from compas_eve.codecs import FastJsonMessageCodec
+
+
+class CountingCodec(FastJsonMessageCodec):
+    def __init__(self):
+        super(CountingCodec, self).__init__()
+        self.encoded_bytes = 0
+
+    def encode(self, message):
+        encoded = super(CountingCodec, self).encode(message)
+        self.encoded_bytes += len(encoded)
+        return encoded
+
+
+def robot_states(messages):
+    tool = Mesh.from_meshgrid(dx=0.1, nx=10)
+    io = {"do{}".format(i): False for i in range(32)}
+    for i in range(messages):
+        t = i / 100.0
+        io = dict(io, do0=(i // 50) % 2 == 1)
+        yield Message(
+            robot="robot_1",
+            status="running" if i < messages - 1 else "idle",
+            joints=[math.sin(t + j) for j in range(6)],
+            tcp=Frame([0.5 + 0.1 * math.cos(t), 0.1 * math.sin(t), 0.8], [1, 0, 0], [0, 1, 0]),
+            io=io,
+            tool=tool,
+            sequence=i,
+        )
+
+
+def run(messages, delta, keyframe_interval):
+    codec = CountingCodec()
+    transport = InMemoryTransport(codec=codec)
+    topic = Topic("/benchmark/delta/", Message, delta=delta, keyframe_interval=keyframe_interval)
+    received = []
+    Subscriber(topic, received.append, transport=transport).subscribe()
+    publisher = Publisher(topic, transport=transport)
+
+    states = list(robot_states(messages))
+    start = time.perf_counter()
+    for state in states:
+        publisher.publish(state)
+    elapsed = time.perf_counter() - start
+
+    assert len(received) == messages
+    assert received[-1].status == "idle" and received[-1].joints == states[-1].joints
+    return codec.encoded_bytes / messages, elapsed / messages * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--messages", type=int, default=1000, help="Number of messages to publish")
+    parser.add_argument("--keyframe-interval", type=int, default=100, help="Number of messages between keyframes")
+    args = parser.parse_args()
+
+    full_size, full_time = run(args.messages, False, args.keyframe_interval)
+    delta_size, delta_time = run(args.messages, True, args.keyframe_interval)
+
+    print("{:>10} {:>16} {:>14}".format("mode", "bytes / message", "ms / message"))
+    print("{:>10} {:>16.0f} {:>14.3f}".format("full", full_size, full_time))
+    print("{:>10} {:>16.0f} {:>14.3f}".format("delta", delta_size, delta_time))
+    print("Bandwidth reduced {:.1f}x".format(full_size / delta_size))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""
+Benchmark the throughput of ``EventEmitterMixin.emit`` against the number of listeners and threads.
+
+``emit`` reads an immutable snapshot of the listeners of the event, without taking
+any lock, so throughput should not collapse when several threads emit concurrently,
+and emitting events without listeners should cost next to nothing.
+
+Usage::
+
+    python benchmarks/emit.py
+"""
+
+import threading
+import time
+
+from compas_eve.event_emitter import EventEmitterMixin
+
+EMITS_PER_THREAD = 20000
+LISTENER_COUNTS = [0, 1, 10, 100]
+THREAD_COUNTS = [1, 2, 4, 8]
+
+
+class Emitter(EventEmitterMixin):
+    pass
+
+
+def run(listener_count, thread_count):
+    ee = Emitter()
+    for _ in range(listener_count):
+        ee.on("event", lambda value: None)
+
+    def emit():
+        for i in range(EMITS_PER_THREAD):
+            ee.emit("event", i)
+
+    threads = [threading.Thread(target=emit) for _ in range(thread_count)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    return EMITS_PER_THREAD * thread_count / elapsed
+
+
+if __name__ == "__main__":
+    print("{:>10} {:>8} {:>16}".format("listeners", "threads", "emits / second"))
+    for listener_count in LISTENER_COUNTS:
+        for thread_count in THREAD_COUNTS:
+            print("{:>10} {:>8} {:>16,.0f}".format(listener_count, thread_count, run(listener_count, thread_count)))
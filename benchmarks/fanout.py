@@ -0,0 +1,61 @@
+"""
+Benchmark the cost of publishing to a topic with a growing number of local subscribers.
+
+Every incoming payload is decoded once and shared by all subscribers of the
+topic, so the time per published message should stay almost flat as the
+number of subscribers grows (only the cost of invoking each callback remains).
+
+Usage::
+
+    python benchmarks/fanout.py
+"""
+
+import time
+
+from compas.geometry import Frame
+
+from compas_eve import InMemoryTransport
+from compas_eve import Message
+from compas_eve import Publisher
+from compas_eve import Subscriber
+from compas_eve import Topic
+from compas_eve.codecs import JsonMessageCodec
+
+ITERATIONS = 2000
+SUBSCRIBER_COUNTS = [1, 2, 5, 10, 20, 50]
+
+
+class CountingCodec(JsonMessageCodec):
+    def __init__(self):
+        super(CountingCodec, self).__init__()
+        self.decode_count = 0
+
+    def decode(self, encoded_data, message_type):
+        self.decode_count += 1
+        return super(CountingCodec, self).decode(encoded_data, message_type)
+
+
+def run(subscriber_count):
+    codec = CountingCodec()
+    tx = InMemoryTransport(codec=codec)
+    topic = Topic("/benchmark/fanout/", Message)
+
+    for _ in range(subscriber_count):
+        Subscriber(topic, lambda msg: None, transport=tx).subscribe()
+
+    publisher = Publisher(topic, transport=tx)
+    message = Message(frames=[Frame.worldXY() for _ in range(10)], status="ok", timestamp=time.time())
+
+    start = time.perf_counter()
+    for _ in range(ITERATIONS):
+        publisher.publish(message)
+    elapsed = time.perf_counter() - start
+
+    return elapsed / ITERATIONS, codec.decode_count / ITERATIONS
+
+
+if __name__ == "__main__":
+    print("{:>12} {:>16} {:>18}".format("subscribers", "us / message", "decodes / message"))
+    for count in SUBSCRIBER_COUNTS:
+        per_message, decodes = run(count)
+        print("{:>12} {:>16.1f} {:>18.1f}".format(count, per_message * 1e6, decodes))
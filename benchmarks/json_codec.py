@@ -0,0 +1,63 @@
+"""
+Benchmark `FastJsonMessageCodec` against `JsonMessageCodec` on typical COMPAS payloads.
+
+Encoding is where orjson shines. When decoding, most of the time is spent
+rebuilding the COMPAS objects themselves, which is the same for both codecs.
+
+Usage::
+
+    python benchmarks/json_codec.py
+"""
+
+import time
+
+from compas.datastructures import Graph
+from compas.datastructures import Mesh
+from compas.geometry import Frame
+
+from compas_eve import Message
+from compas_eve.codecs import ORJSON_AVAILABLE
+from compas_eve.codecs import FastJsonMessageCodec
+from compas_eve.codecs import JsonMessageCodec
+
+ITERATIONS = 200
+
+
+def payloads():
+    graph = Graph()
+    for i in range(1000):
+        graph.add_node(i, x=float(i), y=0.0, z=0.0)
+    for i in range(999):
+        graph.add_edge(i, i + 1)
+
+    return {
+        "frame": Message(frame=Frame.worldXY()),
+        "100 frames": Message(frames=[Frame.worldXY() for _ in range(100)]),
+        "mesh (10k faces)": Message(mesh=Mesh.from_meshgrid(dx=10, nx=100)),
+        "graph (1k nodes)": Message(graph=graph),
+    }
+
+
+def measure(func, *args):
+    iterations = ITERATIONS
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func(*args)
+    return (time.perf_counter() - start) / iterations
+
+
+def run(codec, message):
+    encoded = codec.encode(message)
+    wire = encoded if isinstance(encoded, bytes) else encoded.encode("utf-8")
+    encode_time = measure(codec.encode, message)
+    decode_time = measure(codec.decode, wire, Message)
+    return encode_time, decode_time, len(wire)
+
+
+if __name__ == "__main__":
+    print("orjson available: {}".format(ORJSON_AVAILABLE))
+    print("{:>18} {:>22} {:>12} {:>12} {:>10}".format("payload", "codec", "encode us", "decode us", "bytes"))
+    for name, message in payloads().items():
+        for codec in (JsonMessageCodec(), FastJsonMessageCodec()):
+            encode_time, decode_time, size = run(codec, message)
+            print("{:>18} {:>22} {:>12.1f} {:>12.1f} {:>10}".format(name, type(codec).__name__, encode_time * 1e6, decode_time * 1e6, size))
@@ -0,0 +1,79 @@
+"""
+Benchmark memory per instance and field access cost of the message classes.
+
+Compares `Message` with `CompactMessage`, `FrozenMessage`, `StructMessage` and a plain dict
+holding the same four fields, for: memory per instance, reading and writing a field, creating
+a message and parsing one from decoded data (as done by every codec on every message).
+
+Usage::
+
+    python benchmarks/messages.py
+"""
+
+import gc
+import timeit
+import tracemalloc
+
+from compas_eve import Message
+from compas_eve.compact import CompactMessage
+from compas_eve.compact import FrozenMessage
+from compas_eve.structs import StructMessage
+
+INSTANCES = 100000
+NUMBER = 200000
+
+VALUES = dict(sequence=1, timestamp=1700000000.0, status="ok", value=0.5)
+
+
+class CompactState(CompactMessage):
+    __fields__ = ["sequence", "timestamp", "status", "value"]
+
+
+class FrozenState(FrozenMessage):
+    __fields__ = ["sequence", "timestamp", "status", "value"]
+
+
+class StructState(StructMessage):
+    __fields__ = [("sequence", "I"), ("timestamp", "d"), ("status", "8s"), ("value", "d")]
+
+
+def memory_per_instance(factory):
+    gc.collect()
+    tracemalloc.start()
+    instances = [factory() for _ in range(INSTANCES)]
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del instances
+    # Exclude the list holding the instances
+    return (size - INSTANCES * 8) / INSTANCES
+
+
+def per_call(statement, namespace):
+    return min(timeit.repeat(statement, globals=namespace, number=NUMBER, repeat=3)) / NUMBER
+
+
+if __name__ == "__main__":
+    classes = [("dict", dict), ("Message", Message), ("CompactMessage", CompactState), ("FrozenMessage", FrozenState), ("StructMessage", StructState)]
+
+    print("{:>16} {:>12} {:>10} {:>10} {:>10} {:>10}".format("class", "bytes/inst", "get ns", "set ns", "create ns", "parse ns"))
+    for name, cls in classes:
+        instance = cls(**VALUES)
+        namespace = dict(cls=cls, instance=instance, values=VALUES)
+        is_dict = cls is dict
+
+        memory = memory_per_instance(lambda: cls(**VALUES))
+        get = per_call("instance['value']" if is_dict else "instance.value", namespace)
+        if is_dict:
+            set_ = per_call("instance['value'] = 1.0", namespace)
+        elif cls is FrozenState:
+            set_ = None
+        else:
+            set_ = per_call("instance.value = 1.0", namespace)
+        create = per_call("cls(**values)", namespace)
+        parse = per_call("dict(values)" if is_dict else "cls.parse(values)", namespace)
+
+        print(
+            "{:>16} {:>12.0f} {:>10.1f} {:>10} {:>10.1f} {:>10.1f}".format(
+                name, memory, get * 1e9, "-" if set_ is None else "{:.1f}".format(set_ * 1e9), create * 1e9, parse * 1e9
+            )
+        )
@@ -0,0 +1,83 @@
+"""
+Benchmark decoding several streams of large meshes in-process and in worker processes.
+
+Every topic receives large meshes, decoded by subscribers running on a thread pool, while a
+ticker thread measures how long the other threads of the process are frozen (the largest delay
+of a 1 ms sleep), e.g. the network thread of a transport. Decoding in-process holds the GIL for
+the whole decoding, while with `OffloadCodec`, the subscribing process only holds it to unpickle
+the results, and the streams are decoded in parallel on as many cores as there are workers.
+
+Usage::
+
+    python benchmarks/offload.py [--topics N] [--messages N] [--size N]
+"""
+
+import argparse
+import threading
+import time
+
+from compas.datastructures import Mesh
+
+from compas_eve import InMemoryTransport
+from compas_eve import Message
+from compas_eve import Publisher
+from compas_eve import Subscriber
+from compas_eve import Topic
+from compas_eve.codecs import FastJsonMessageCodec
+from compas_eve.executors import ThreadExecutor
+from compas_eve.offload import OffloadCodec
+
+
+class Ticker(threading.Thread):
+    def __init__(self):
+        super(Ticker, self).__init__(daemon=True)
+        self.max_delay = 0.0
+        self.running = True
+
+    def run(self):
+        while self.running:
+            start = time.perf_counter()
+            time.sleep(0.001)
+            self.max_delay = max(self.max_delay, time.perf_counter() - start - 0.001)
+
+
+def run(codec, topics, messages, mesh):
+    tx = InMemoryTransport(codec=codec)
+    executor = ThreadExecutor(workers=topics)
+    for index in range(topics):
+        Subscriber(Topic("/benchmark/offload/{}/".format(index)), lambda msg: None, transport=tx, executor=executor).subscribe()
+
+    # Warm up, e.g. to start the worker processes
+    Publisher(Topic("/benchmark/offload/0/"), transport=tx).publish(Message(mesh=mesh))
+    executor.join()
+
+    ticker = Ticker()
+    ticker.start()
+    start = time.perf_counter()
+    for _ in range(messages):
+        for index in range(topics):
+            Publisher(Topic("/benchmark/offload/{}/".format(index)), transport=tx).publish(Message(mesh=mesh))
+    executor.join()
+    elapsed = time.perf_counter() - start
+    ticker.running = False
+    executor.close()
+    return elapsed, ticker.max_delay
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--topics", type=int, default=4, help="number of topics")
+    parser.add_argument("--messages", type=int, default=3, help="number of messages per topic")
+    parser.add_argument("--size", type=int, default=200, help="number of faces per side of the meshes")
+    args = parser.parse_args()
+
+    mesh = Mesh.from_meshgrid(dx=10, nx=args.size)
+    size = len(FastJsonMessageCodec().encode(Message(mesh=mesh)))
+    print("{} topics x {} messages of {:.1f} MB".format(args.topics, args.messages, size / 1e6))
+
+    offload = OffloadCodec(FastJsonMessageCodec(), workers=args.topics)
+    print("{:>12} {:>12} {:>14} {:>18}".format("codec", "total s", "messages / s", "max freeze ms"))
+    for name, codec in [("in-process", FastJsonMessageCodec()), ("offload", offload)]:
+        elapsed, freeze = run(codec, args.topics, args.messages, mesh)
+        print("{:>12} {:>12.2f} {:>14.2f} {:>18.1f}".format(name, elapsed, args.topics * args.messages / elapsed, freeze * 1e3))
+    offload.close()
@@ -0,0 +1,41 @@
+"""
+Benchmark typed protobuf messages generated for struct messages against the generic protobuf map.
+
+Usage::
+
+    python benchmarks/protobuf_codec.py
+"""
+
+import time
+
+from compas_eve import Message
+from compas_eve.codecs import ProtobufMessageCodec
+from compas_eve.structs import StructMessage
+
+ITERATIONS = 10000
+
+
+class JointState(StructMessage):
+    __fields__ = [("sequence", "I"), ("timestamp", "d"), ("positions", "6d"), ("velocities", "6d"), ("robot", "16s")]
+
+
+def measure(func, *args):
+    start = time.perf_counter()
+    for _ in range(ITERATIONS):
+        func(*args)
+    return (time.perf_counter() - start) / ITERATIONS
+
+
+def run(codec, message, message_type):
+    encoded = codec.encode(message)
+    return measure(codec.encode, message), measure(codec.decode, encoded, message_type), len(encoded)
+
+
+if __name__ == "__main__":
+    codec = ProtobufMessageCodec()
+    state = JointState(sequence=1, timestamp=time.time(), positions=(0.1, -1.2, 1.5, 0.0, 0.7, 3.1), velocities=(0.01,) * 6, robot="robot_1")
+
+    print("{:>10} {:>12} {:>12} {:>8}".format("schema", "encode us", "decode us", "bytes"))
+    for name, message, message_type in [("generic", Message(**state.data), Message), ("typed", state, JointState)]:
+        encode_time, decode_time, size = run(codec, message, message_type)
+        print("{:>10} {:>12.2f} {:>12.2f} {:>8}".format(name, encode_time * 1e6, decode_time * 1e6, size))
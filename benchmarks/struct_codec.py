@@ -0,0 +1,50 @@
+"""
+Benchmark `StructMessageCodec` against the JSON and MessagePack codecs on a small control message.
+
+Usage::
+
+    python benchmarks/struct_codec.py
+"""
+
+import time
+
+from compas_eve import Message
+from compas_eve.codecs import MSGPACK_AVAILABLE
+from compas_eve.codecs import JsonMessageCodec
+from compas_eve.codecs import MsgPackMessageCodec
+from compas_eve.codecs import StructMessageCodec
+from compas_eve.structs import StructMessage
+
+ITERATIONS = 100000
+
+
+class JointState(StructMessage):
+    __fields__ = [("sequence", "I"), ("timestamp", "d"), ("positions", "6d")]
+
+
+def measure(func, *args):
+    start = time.perf_counter()
+    for _ in range(ITERATIONS):
+        func(*args)
+    return (time.perf_counter() - start) / ITERATIONS
+
+
+def run(codec, message, message_type):
+    encoded = codec.encode(message)
+    wire = encoded if isinstance(encoded, bytes) else encoded.encode("utf-8")
+    return measure(codec.encode, message), measure(codec.decode, wire, message_type), len(wire)
+
+
+if __name__ == "__main__":
+    positions = (0.1, -1.2, 1.5, 0.0, 0.7, 3.1)
+    state = JointState(sequence=1, timestamp=time.time(), positions=positions)
+    message = Message(sequence=1, timestamp=time.time(), positions=positions)
+
+    cases = [("struct", StructMessageCodec(), state, JointState), ("json", JsonMessageCodec(), message, Message)]
+    if MSGPACK_AVAILABLE:
+        cases.append(("msgpack", MsgPackMessageCodec(), message, Message))
+
+    print("{:>10} {:>12} {:>12} {:>8}".format("codec", "encode us", "decode us", "bytes"))
+    for name, codec, msg, message_type in cases:
+        encode_time, decode_time, size = run(codec, msg, message_type)
+        print("{:>10} {:>12.2f} {:>12.2f} {:>8}".format(name, encode_time * 1e6, decode_time * 1e6, size))
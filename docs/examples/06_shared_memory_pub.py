@@ -0,0 +1,16 @@
+import time
+
+from compas_eve import Publisher
+from compas_eve import Topic
+from compas_eve.shm import SharedMemoryTransport
+
+topic = Topic("/hello/shm")
+tx = SharedMemoryTransport()
+
+publisher = Publisher(topic, transport=tx)
+
+for i in range(20):
+    msg = dict(text=f"Hello world #{i} over shared memory")
+    print(f"Publishing message: {msg}")
+    publisher.publish(msg)
+    time.sleep(1)
@@ -0,0 +1,30 @@
+import asyncio
+
+from compas_eve import Message
+from compas_eve import Topic
+from compas_eve.aio import AsyncPublisher
+from compas_eve.aio import AsyncSubscriber
+
+topic = Topic("/compas_eve/hello_asyncio/")
+
+
+async def produce():
+    publisher = AsyncPublisher(topic)
+    for i in range(10):
+        await publisher.publish(Message(text="Hello world #{}".format(i)))
+        await asyncio.sleep(0.5)
+
+
+async def consume(subscriber):
+    async for msg in subscriber:
+        print("Received message: " + msg.text)
+
+
+async def main():
+    async with AsyncSubscriber(topic) as subscriber:
+        consumer = asyncio.create_task(consume(subscriber))
+        await produce()
+    await consumer
+
+
+asyncio.run(main())
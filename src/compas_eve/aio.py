@@ -0,0 +1,329 @@
+"""
+Asyncio counterparts of [Publisher][compas_eve.Publisher] and [Subscriber][compas_eve.Subscriber].
+
+Transports deliver messages on their own threads (e.g. the network thread of MQTT or Zenoh).
+[AsyncSubscriber][compas_eve.aio.AsyncSubscriber] bridges those threads into an asyncio event loop:
+messages are buffered in a bounded queue and the loop is woken up once per batch of messages,
+instead of once per message, so that a single event loop can consume thousands of messages
+per second without a thread per subscriber.
+
+Examples
+--------
+>>> import asyncio
+>>> from compas_eve import Message, Topic
+>>> from compas_eve.aio import AsyncPublisher, AsyncSubscriber
+>>> async def main():
+...     topic = Topic("/compas_eve/aio/doctest/")
+...     async with AsyncSubscriber(topic) as subscriber:
+...         await AsyncPublisher(topic).publish(Message(text="hello"))
+...         async for message in subscriber:
+...             return message.text
+>>> asyncio.run(main())
+'hello'
+"""
+
+import asyncio
+import functools
+import threading
+from collections import deque
+from concurrent.futures import Executor
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Union
+
+from compas_eve.core import Message
+from compas_eve.core import Publisher
+from compas_eve.core import Subscriber
+from compas_eve.core import Topic
+from compas_eve.core import Transport
+from compas_eve.queues import BLOCK
+from compas_eve.queues import DROP_NEWEST
+from compas_eve.queues import KEEP_LATEST
+from compas_eve.queues import POLICIES
+
+__all__ = ["AsyncPublisher", "AsyncSubscriber"]
+
+
+class AsyncPublisher(Publisher):
+    """Publisher for a specific topic, with an awaitable publish.
+
+    Parameters
+    ----------
+    topic
+        The topic to publish messages to. If a string is provided, a new topic instance
+        will be created using the string as topic name.
+    transport
+        The transport to use for publishing. If not provided, the default transport will be used.
+    executor
+        If set, messages are encoded and published on this executor, so that large messages
+        do not block the event loop. By default, messages are published directly on the
+        event loop, which is the fastest option for small messages.
+    """
+
+    def __init__(self, topic: Union[Topic, str], transport: Optional[Transport] = None, executor: Optional[Executor] = None) -> None:
+        super(AsyncPublisher, self).__init__(topic, transport=transport)
+        self.executor = executor
+
+    async def publish(self, message: Union[Message, dict], **options: Any) -> None:
+        """Publish a message to the topic.
+
+        Parameters
+        ----------
+        message
+            The message to publish.
+        **options
+            Transport-specific options passed through to the underlying transport.
+        """
+        if not self.is_advertised:
+            self.advertise()
+
+        published = self._published(message, options)
+        if self.executor is None:
+            self.transport.publish(self.topic, published, **options)
+        else:
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(self.executor, functools.partial(self.transport.publish, self.topic, published, **options))
+        self.message_published(message)
+
+
+class AsyncSubscriber(Subscriber):
+    """Subscriber for a specific topic that delivers messages to an asyncio event loop.
+
+    Messages can be consumed either with ``async for message in subscriber`` (or ``await subscriber.get()``),
+    or by passing a callback, which can be a regular function or a coroutine function, and which
+    is invoked on the event loop for each message.
+
+    Parameters
+    ----------
+    topic
+        The topic to subscribe to. If a string is provided, a new topic instance
+        will be created using the string as topic name.
+    callback
+        Function or coroutine function invoked on the event loop for each message. If set,
+        the subscriber consumes its own messages, so they cannot be iterated as well.
+    transport
+        The transport to use for subscribing. If not provided, the default transport will be used.
+    loop
+        The event loop to deliver messages to. Defaults to the running loop at the time of subscribing.
+    queue_size
+        Maximum number of messages waiting to be consumed. Defaults to 1024.
+    overflow
+        Policy applied when the queue is full: ``"block"`` (default) holds up the thread of the
+        transport until there is room, ``"drop_oldest"`` discards the oldest pending message,
+        ``"drop_newest"`` discards the new message, and ``"keep_latest"`` only keeps the most
+        recent pending message. Messages published from the event loop itself are never blocked,
+        since that would deadlock the loop.
+    fields
+        If set, only these fields of received messages are decoded (see [Subscriber][compas_eve.Subscriber]).
+    """
+
+    def __init__(
+        self,
+        topic: Union[Topic, str],
+        callback: Optional[Callable] = None,
+        transport: Optional[Transport] = None,
+        loop: Optional[asyncio.AbstractEventLoop] = None,
+        queue_size: int = 1024,
+        overflow: str = BLOCK,
+        fields: Optional[List[str]] = None,
+    ) -> None:
+        if overflow not in POLICIES:
+            raise ValueError("Unknown overflow policy {!r}, expected one of: {}".format(overflow, ", ".join(POLICIES)))
+        if queue_size < 1:
+            raise ValueError("Queue size must be at least 1, got {}".format(queue_size))
+        super(AsyncSubscriber, self).__init__(topic, callback=callback, transport=transport, fields=fields)
+        self.loop = loop
+        self.queue_size = 1 if overflow == KEEP_LATEST else queue_size
+        self.overflow = overflow
+        self.received = 0
+        self.delivered = 0
+        self.dropped = 0
+        self.max_depth = 0
+
+        self._messages = deque()
+        self._closed = False
+        self._lock = threading.Lock()
+        self._not_full = threading.Condition(self._lock)
+        self._wakeup_pending = False
+        self._waiters = []
+        self._task = None
+
+    @property
+    def depth(self) -> int:
+        """Number of messages waiting to be consumed."""
+        return len(self._messages)
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        """Metrics of the subscriber: number of received, delivered and dropped messages, and current and maximum depth of its queue."""
+        return dict(
+            received=self.received,
+            delivered=self.delivered,
+            dropped=self.dropped,
+            depth=self.depth,
+            max_depth=self.max_depth,
+            max_size=self.queue_size,
+            policy=self.overflow,
+        )
+
+    def message_received(self, message: Union[Message, dict]) -> Any:
+        """Handler called on the event loop for each message, if the subscriber has a callback.
+
+        By default, this implementation will simply invoke the callback used on init
+        and return its result, which is awaited if it is a coroutine."""
+        return self._callback(message)
+
+    def subscribe(self) -> None:
+        """Subscribe to the topic, delivering messages to the event loop.
+
+        Raises
+        ------
+        RuntimeError
+            If no loop was given and there is no running event loop.
+        """
+        if self._subscribe_id:
+            return
+
+        if self.loop is None:
+            self.loop = asyncio.get_running_loop()
+        self._closed = False
+
+        if self._callback:
+            if self._in_loop():
+                self._task = self.loop.create_task(self._consume())
+            else:
+                self._task = asyncio.run_coroutine_threadsafe(self._consume(), self.loop)
+
+        super(AsyncSubscriber, self).subscribe()
+
+    def unsubscribe(self) -> None:
+        """Unregister the subscriber from its topic.
+
+        Messages already queued can still be consumed, after which iteration stops.
+        """
+        if not self._subscribe_id:
+            return
+
+        super(AsyncSubscriber, self).unsubscribe()
+
+        with self._lock:
+            self._closed = True
+            self._not_full.notify_all()
+        self._schedule_wakeup()
+
+    async def get(self) -> Union[Message, dict, Any]:
+        """Wait for the next message.
+
+        Returns
+        -------
+        Union[Message, dict, Any]
+            The next message received on the topic.
+
+        Raises
+        ------
+        StopAsyncIteration
+            If the subscriber was unsubscribed and all queued messages were consumed.
+        """
+        while True:
+            with self._lock:
+                if self._messages:
+                    message = self._messages.popleft()
+                    self.delivered += 1
+                    self._not_full.notify()
+                    return message
+                if self._closed:
+                    raise StopAsyncIteration
+                # Every consumer waiting on the loop gets its own waiter
+                waiter = self.loop.create_future()
+                self._waiters.append(waiter)
+            await waiter
+
+    def __aiter__(self) -> "AsyncSubscriber":
+        return self
+
+    async def __anext__(self) -> Union[Message, dict, Any]:
+        return await self.get()
+
+    async def __aenter__(self) -> "AsyncSubscriber":
+        self.subscribe()
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        self.unsubscribe()
+
+    def _message_handler(self) -> Callable:
+        # Messages are queued for the event loop, after being rebuilt from frames on delta topics
+        return self._put
+
+    def _in_loop(self) -> bool:
+        try:
+            return asyncio.get_running_loop() is self.loop
+        except RuntimeError:
+            # Called from a thread without event loop, e.g. the thread of the transport
+            return False
+
+    def _put(self, message: Union[Message, dict, Any]) -> None:
+        # Called by the transport, on any thread
+        with self._not_full:
+            if self._closed:
+                return
+            self.received += 1
+
+            if len(self._messages) >= self.queue_size:
+                if self.overflow == BLOCK:
+                    # The event loop must never wait on itself, so it may exceed the bound instead
+                    if not self._in_loop():
+                        self._not_full.wait_for(lambda: len(self._messages) < self.queue_size or self._closed)
+                    if self._closed:
+                        self.dropped += 1
+                        return
+                elif self.overflow == DROP_NEWEST:
+                    self.dropped += 1
+                    return
+                else:
+                    while len(self._messages) >= self.queue_size:
+                        self._messages.popleft()
+                        self.dropped += 1
+
+            self._messages.append(message)
+            self.max_depth = max(self.max_depth, len(self._messages))
+
+            # Only one wake-up of the loop is pending at a time, however many messages arrive meanwhile
+            if self._wakeup_pending:
+                return
+            self._wakeup_pending = True
+
+        self._schedule_wakeup()
+
+    def _schedule_wakeup(self) -> None:
+        if self.loop is None:
+            return
+        if self._in_loop():
+            self._wakeup()
+        else:
+            try:
+                self.loop.call_soon_threadsafe(self._wakeup)
+            except RuntimeError:
+                # The loop has been closed, nobody is left to consume
+                pass
+
+    def _wakeup(self) -> None:
+        with self._lock:
+            self._wakeup_pending = False
+            waiters, self._waiters = self._waiters, []
+        # Waiters that do not get a message wait again
+        for waiter in waiters:
+            if not waiter.done():
+                waiter.set_result(None)
+
+    async def _consume(self) -> None:
+        async for message in self:
+            try:
+                result = self.message_received(message)
+                if asyncio.iscoroutine(result):
+                    await result
+            except Exception as exc:
+                self.loop.call_exception_handler(dict(message="Exception in callback of subscriber to topic {}".format(self.topic.name), exception=exc))
@@ -0,0 +1,213 @@
+"""
+Batching of several messages into a single payload.
+
+Every message published individually costs a round trip through the transport and, on MQTT
+and Zenoh, its own packet on the wire, which dominates when streaming many small messages
+(e.g. sensor samples). [Publisher.publish_many][compas_eve.Publisher.publish_many] encodes
+several messages and sends them together as one batch, and publishers created with
+``batch_size`` or ``linger`` collect published messages and send them in batches automatically.
+
+A batch starts with a magic marker, followed by the number of messages, the size of each
+encoded message and the encoded messages themselves. Receiving transports split batches
+back into messages, so subscribers still receive every message individually, in order.
+Payloads that start with the magic marker but are not valid batches are received as single
+messages, since any binary encoding may happen to start like a batch.
+"""
+
+import struct
+import threading
+import time
+import traceback
+from typing import Any
+from typing import Callable
+from typing import List
+from typing import Optional
+from typing import Sequence
+from typing import Union
+
+__all__ = ["pack_batch", "unpack_batch", "is_batch", "Batcher"]
+
+MAGIC = b"\xceBAT"
+
+# Magic, number of messages
+HEADER = struct.Struct("<4sI")
+
+
+def is_batch(data: Union[bytes, bytearray, memoryview]) -> bool:
+    """Check if a received payload is a batch of messages.
+
+    Parameters
+    ----------
+    data
+        Received payload.
+
+    Returns
+    -------
+    bool
+        True if the payload is a batch, False if it is a single message.
+    """
+    return len(data) >= HEADER.size and data[: len(MAGIC)] == MAGIC
+
+
+def pack_batch(payloads: Sequence[Union[bytes, bytearray, memoryview, List[Any]]]) -> bytes:
+    """Pack encoded messages into one batch.
+
+    Parameters
+    ----------
+    payloads
+        Encoded messages. Each of them is either a buffer, or a list of buffers as returned
+        by [MessageCodec.encode_buffers][compas_eve.MessageCodec.encode_buffers].
+
+    Returns
+    -------
+    bytes
+        The batch.
+    """
+    sizes = []
+    buffers = []
+    for payload in payloads:
+        if isinstance(payload, list):
+            sizes.append(sum(memoryview(buffer).nbytes for buffer in payload))
+            buffers.extend(payload)
+        else:
+            sizes.append(len(payload))
+            buffers.append(payload)
+    return b"".join([HEADER.pack(MAGIC, len(payloads)), struct.pack("<{}I".format(len(sizes)), *sizes)] + buffers)
+
+
+def unpack_batch(data: Union[bytes, bytearray, memoryview]) -> List[memoryview]:
+    """Split a batch into its encoded messages, without copying them.
+
+    Parameters
+    ----------
+    data
+        The batch.
+
+    Returns
+    -------
+    list of memoryview
+        Encoded messages, in order.
+
+    Raises
+    ------
+    ValueError
+        If the data is not a valid batch.
+    """
+    view = memoryview(data)
+    if not is_batch(view):
+        raise ValueError("Invalid batch: missing batch header")
+    _magic, count = HEADER.unpack_from(view)
+    offset = HEADER.size + 4 * count
+    if offset > len(view):
+        raise ValueError("Invalid batch: expected at least {} bytes, got {}".format(offset, len(view)))
+    sizes = struct.unpack_from("<{}I".format(count), view, HEADER.size)
+    if offset + sum(sizes) != len(view):
+        raise ValueError("Invalid batch: expected {} bytes, got {}".format(offset + sum(sizes), len(view)))
+
+    payloads = []
+    for size in sizes:
+        payloads.append(view[offset : offset + size])
+        offset += size
+    return payloads
+
+
+class Batcher(object):
+    """Collects items and hands them over in batches.
+
+    A batch is flushed as soon as it contains ``batch_size`` items, or ``linger`` seconds after
+    its first item was added, whichever comes first. Lingering batches are flushed by a
+    background thread, started with the first batch.
+
+    Parameters
+    ----------
+    flush
+        Function invoked with the list of items of every batch.
+    batch_size
+        Maximum number of items per batch. Unlimited by default, in which case ``linger`` must be set.
+    linger
+        Maximum time in seconds an item waits for its batch to be flushed. By default, batches
+        are only flushed when they are full, or when [flush][compas_eve.batching.Batcher.flush] is called.
+    name
+        Name of the background thread.
+    """
+
+    def __init__(self, flush: Callable[[List[Any]], None], batch_size: Optional[int] = None, linger: Optional[float] = None, name: Optional[str] = None) -> None:
+        if batch_size is None and linger is None:
+            raise ValueError("Either batch_size or linger must be set")
+        if batch_size is not None and batch_size < 1:
+            raise ValueError("Batch size must be at least 1, got {}".format(batch_size))
+        self.batch_size = batch_size
+        self.linger = linger
+        self.name = name or "compas_eve-batcher"
+        self._flush = flush
+        self._items = []
+        self._deadline = None
+        self._closed = False
+        # Batches are flushed under a separate lock, so that they are handed over in order
+        self._flush_lock = threading.RLock()
+        self._lock = threading.Lock()
+        self._changed = threading.Condition(self._lock)
+        self._thread = None
+
+    def add(self, item: Any) -> None:
+        """Add an item to the current batch, flushing it if it is full.
+
+        Parameters
+        ----------
+        item
+            Item to add.
+        """
+        with self._flush_lock:
+            with self._lock:
+                if self._closed:
+                    raise RuntimeError("Cannot add items to a closed batcher")
+                self._items.append(item)
+                if self.batch_size is None or len(self._items) < self.batch_size:
+                    if len(self._items) == 1 and self.linger is not None:
+                        self._start_linger()
+                    return
+                items = self._take()
+            self._flush(items)
+
+    def flush(self) -> None:
+        """Flush the current batch immediately, if it is not empty."""
+        with self._flush_lock:
+            with self._lock:
+                items = self._take()
+            if items:
+                self._flush(items)
+
+    def close(self) -> None:
+        """Flush the current batch and stop the background thread."""
+        self.flush()
+        with self._lock:
+            self._closed = True
+            self._changed.notify_all()
+            thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join()
+
+    def _take(self) -> List[Any]:
+        items, self._items = self._items, []
+        self._deadline = None
+        return items
+
+    def _start_linger(self) -> None:
+        self._deadline = time.monotonic() + self.linger
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name=self.name)
+            self._thread.daemon = True
+            self._thread.start()
+        self._changed.notify()
+
+    def _run(self) -> None:
+        while True:
+            with self._lock:
+                while not self._closed and (self._deadline is None or time.monotonic() < self._deadline):
+                    self._changed.wait(None if self._deadline is None else self._deadline - time.monotonic())
+                if self._closed:
+                    return
+            try:
+                self.flush()
+            except Exception:
+                traceback.print_exc()
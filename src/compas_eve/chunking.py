@@ -0,0 +1,222 @@
+"""
+Chunked transfer of large encoded messages.
+
+Very large messages (e.g. meshes or point clouds of hundreds of megabytes) exceed the payload
+limits of MQTT brokers, hold up the network thread while they are sent, and need the whole
+payload in memory more than once. When a transport is created with a ``chunk_size``, encoded
+messages larger than that are split into chunks that are sent one by one, and reassembled on
+the receiving side before being decoded. Subscribers are not aware of chunking at all, and
+receiving chunked messages does not require any configuration, only sending them does.
+
+Every chunk starts with a fixed header: a magic marker, the identifier of the message, the
+index of the chunk, the number of chunks, the total size of the message and the offset of the
+chunk within it. Chunks can therefore arrive in any order, and duplicated chunks are ignored.
+
+Received chunks are written directly into a buffer of the size of the whole message. Pending
+messages are bounded both in time (incomplete messages are discarded after a timeout) and in
+memory (when the total size of pending messages would exceed a limit, the oldest ones are
+discarded).
+"""
+
+import collections
+import struct
+import threading
+import time
+import uuid
+from typing import Callable
+from typing import Iterator
+from typing import Optional
+from typing import Union
+
+__all__ = ["Chunk", "ChunkAssembler", "split_payload", "is_chunk"]
+
+MAGIC = b"\xceCHK"
+
+# Magic, message id, chunk index, chunk count, total size, offset of the chunk
+HEADER = struct.Struct("<4s16sIIQQ")
+
+DEFAULT_TIMEOUT = 30.0
+DEFAULT_MAX_PENDING_BYTES = 512 * 1024 * 1024
+
+# Number of recently completed or discarded messages whose late chunks are ignored
+_FINISHED_HISTORY = 1024
+
+Chunk = collections.namedtuple("Chunk", ["topic_name", "message_id", "index", "count", "offset", "total_size", "data"])
+Chunk.__doc__ = """Chunk of a message, as passed to streaming callbacks.
+
+``data`` is a memoryview of the received chunk, only valid during the callback."""
+
+
+def is_chunk(data: Union[bytes, bytearray, memoryview]) -> bool:
+    """Check if a received payload is a chunk of a larger message.
+
+    Parameters
+    ----------
+    data
+        Received payload.
+
+    Returns
+    -------
+    bool
+        True if the payload is a chunk, False if it is a complete message.
+    """
+    return len(data) >= HEADER.size and data[: len(MAGIC)] == MAGIC
+
+
+def split_payload(data: Union[bytes, bytearray, memoryview], chunk_size: int) -> Iterator[bytes]:
+    """Split an encoded message into chunks.
+
+    Chunks are generated one at a time, so that only one of them needs to be
+    in memory at once, in addition to the encoded message.
+
+    Parameters
+    ----------
+    data
+        Encoded message.
+    chunk_size
+        Maximum size in bytes of the data of each chunk, excluding its header.
+
+    Yields
+    ------
+    bytes
+        The chunks, in order, each one with its header.
+    """
+    if chunk_size < 1:
+        raise ValueError("Chunk size must be at least 1, got {}".format(chunk_size))
+    view = memoryview(data).cast("B")
+    total_size = view.nbytes
+    count = max(1, -(-total_size // chunk_size))
+    message_id = uuid.uuid4().bytes
+    for index in range(count):
+        offset = index * chunk_size
+        yield HEADER.pack(MAGIC, message_id, index, count, total_size, offset) + view[offset : offset + chunk_size]
+
+
+class _PendingMessage(object):
+    __slots__ = ("buffer", "count", "received", "started")
+
+    def __init__(self, total_size: int, count: int, started: float) -> None:
+        self.buffer = bytearray(total_size)
+        self.count = count
+        self.received = set()
+        self.started = started
+
+
+class ChunkAssembler(object):
+    """Reassembles messages from their chunks.
+
+    Parameters
+    ----------
+    timeout
+        Time in seconds after which an incomplete message is discarded. Expired messages
+        are discarded when the next chunk is received. Defaults to 30 seconds.
+    max_pending_bytes
+        Maximum total size of the incomplete messages kept in memory. When a new message does not
+        fit, the oldest incomplete messages are discarded, and messages larger than this limit are
+        discarded right away. Defaults to 512 MiB.
+    on_chunk
+        Function invoked with every received [Chunk][compas_eve.chunking.Chunk], e.g. to report
+        progress or process large messages incrementally.
+    """
+
+    def __init__(
+        self,
+        timeout: float = DEFAULT_TIMEOUT,
+        max_pending_bytes: int = DEFAULT_MAX_PENDING_BYTES,
+        on_chunk: Optional[Callable[[Chunk], None]] = None,
+    ) -> None:
+        self.timeout = timeout
+        self.max_pending_bytes = max_pending_bytes
+        self.on_chunk = on_chunk
+        self.pending_bytes = 0
+        self.completed = 0
+        self.discarded = 0
+        self._pending = collections.OrderedDict()
+        self._finished = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def stats(self) -> dict:
+        """Metrics of the assembler: number of completed and discarded messages, and number and size of pending messages."""
+        with self._lock:
+            return dict(completed=self.completed, discarded=self.discarded, pending=len(self._pending), pending_bytes=self.pending_bytes)
+
+    def add(self, data: Union[bytes, bytearray, memoryview], topic_name: Optional[str] = None) -> Optional[Union[bytes, bytearray, memoryview]]:
+        """Add a received payload.
+
+        Parameters
+        ----------
+        data
+            Received payload, either a chunk or a complete message.
+        topic_name
+            Name of the topic the payload was received on, passed to the streaming callback.
+
+        Returns
+        -------
+        bytes or bytearray or memoryview, optional
+            The complete message if the payload completes it (or is not a chunk at all), None otherwise.
+        """
+        if not is_chunk(data):
+            return data
+
+        view = memoryview(data)
+        _magic, message_id, index, count, total_size, offset = HEADER.unpack_from(view)
+        chunk_data = view[HEADER.size :]
+        if index >= count or offset + len(chunk_data) > total_size:
+            # Not a valid chunk, so it must be a message that happens to start like one
+            return data
+
+        if self.on_chunk:
+            self.on_chunk(Chunk(topic_name, message_id, index, count, offset, total_size, chunk_data))
+
+        if count == 1:
+            return chunk_data
+
+        now = time.monotonic()
+        with self._lock:
+            self._expire(now)
+            if message_id in self._finished:
+                return None
+
+            pending = self._pending.get(message_id)
+            if pending is None:
+                if total_size > self.max_pending_bytes:
+                    self._finish(message_id)
+                    self.discarded += 1
+                    return None
+                while self._pending and self.pending_bytes + total_size > self.max_pending_bytes:
+                    self._discard(next(iter(self._pending)))
+                pending = self._pending[message_id] = _PendingMessage(total_size, count, now)
+                self.pending_bytes += total_size
+
+            if index in pending.received:
+                return None
+            pending.buffer[offset : offset + len(chunk_data)] = chunk_data
+            pending.received.add(index)
+            if len(pending.received) < pending.count:
+                return None
+
+            del self._pending[message_id]
+            self.pending_bytes -= total_size
+            self._finish(message_id)
+            self.completed += 1
+            return pending.buffer
+
+    def _expire(self, now: float) -> None:
+        # Pending messages are ordered by arrival of their first chunk
+        while self._pending:
+            message_id, pending = next(iter(self._pending.items()))
+            if now - pending.started < self.timeout:
+                break
+            self._discard(message_id)
+
+    def _discard(self, message_id: bytes) -> None:
+        pending = self._pending.pop(message_id)
+        self.pending_bytes -= len(pending.buffer)
+        self.discarded += 1
+        self._finish(message_id)
+
+    def _finish(self, message_id: bytes) -> None:
+        self._finished[message_id] = None
+        if len(self._finished) > _FINISHED_HISTORY:
+            self._finished.popitem(last=False)
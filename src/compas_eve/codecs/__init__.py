@@ -1,21 +1,124 @@
+import functools
+import json
+import struct
+import threading
+import time
+import zlib
 from typing import Any
+from typing import List
 from typing import Optional
+from typing import Tuple
 from typing import Union
 
 from compas.data import json_dumps
 from compas.data import json_loads
+from compas.data.encoders import DataDecoder
+from compas.data.encoders import DataEncoder
 
 from compas_eve.core import Message
+from compas_eve.lazy import LazyMessage
+from compas_eve.structs import StructMessage
 
 try:
     import compas_pb
 
+    from compas_eve.codecs import schemas
+
     COMPAS_PB_AVAILABLE = True
 except ImportError:
     COMPAS_PB_AVAILABLE = False
 
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import msgpack
+
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    MSGPACK_AVAILABLE = False
+
+try:
+    import numpy
+
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+try:
+    import lz4.frame
+
+    LZ4_AVAILABLE = True
+except ImportError:
+    LZ4_AVAILABLE = False
+
+try:
+    import zstandard
+
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+
+__all__ = [
+    "MessageCodec",
+    "JsonMessageCodec",
+    "FastJsonMessageCodec",
+    "MsgPackMessageCodec",
+    "NumpyMessageCodec",
+    "CompressedMessageCodec",
+    "StructMessageCodec",
+    "ProtobufMessageCodec",
+    "SharedPayload",
+]
+
 
-__all__ = ["MessageCodec", "JsonMessageCodec", "ProtobufMessageCodec"]
+def _to_bytes(encoded: Union[bytes, str]) -> bytes:
+    return encoded.encode("utf-8") if isinstance(encoded, str) else encoded
+
+
+def _wrapped_content_type(content_type: str, codec: "MessageCodec") -> Optional[str]:
+    # Codecs wrapping another one are identified by both, e.g. "application/x-compas-eve-numpy+application/json"
+    if codec.content_type is None:
+        return None
+    return "{}+{}".format(content_type, codec.content_type)
+
+
+def _is_lazy(message_type: type) -> bool:
+    return isinstance(message_type, type) and issubclass(message_type, LazyMessage)
+
+
+def _revive_json(object_hook: Any, obj: Any) -> Any:
+    # Rebuild COMPAS Data objects bottom-up, like the object hook of the COMPAS decoder.
+    # JSON parsers only create plain dicts and lists, so exact type checks are enough (and much faster)
+    obj_type = type(obj)
+    if obj_type is dict:
+        for key, value in obj.items():
+            value_type = type(value)
+            if value_type is dict or value_type is list:
+                obj[key] = _revive_json(object_hook, value)
+        if "dtype" in obj:
+            return object_hook(obj)
+    elif obj_type is list:
+        for index, value in enumerate(obj):
+            value_type = type(value)
+            if value_type is dict or value_type is list:
+                obj[index] = _revive_json(object_hook, value)
+    return obj
+
+
+def _parse_lazy(data: Any, message_type: type, revive: Any) -> Any:
+    # Only the fields of a top-level dictionary can be decoded lazily
+    if type(data) is dict and "dtype" not in data:
+        return message_type.from_raw(data, revive)
+    data = revive(data)
+    if hasattr(data, "__data__"):
+        return data
+    return message_type.parse(data)
 
 
 class MessageCodec(object):
@@ -23,8 +126,29 @@ class MessageCodec(object):
 
     A codec is responsible for encoding and decoding messages
     to/from a specific representation format (e.g., JSON, Protocol Buffers).
+
+    Transports hand received payloads to [decode][compas_eve.MessageCodec.decode] without copying
+    them, so codecs receive any object supporting the buffer protocol: ``bytes``, but also e.g.
+    a ``memoryview`` on a batch, on a reassembled chunked message or on shared memory.
+
+    Codecs producing their output in several parts can implement
+    [encode_buffers][compas_eve.MessageCodec.encode_buffers], so that transports able to
+    write the parts directly to their destination do not need to join them first.
     """
 
+    #: True if ``decode`` also accepts the ``str`` returned by ``encode``, which transports
+    #: that do not send messages over the wire (i.e. in-memory) then pass along as is.
+    decodes_str = False
+
+    #: True if decoded messages can reference the data passed to ``decode`` instead of copying it
+    #: (e.g. NumPy arrays), in which case transports only pass buffers they own to the codec.
+    references_payload = False
+
+    #: Content type identifying the encoding on the wire, required to use the codec on a single
+    #: topic (see [compas_eve.codecs.registry][]), where it is sent as one-byte codec ids. Codecs with the
+    #: same content type must be interchangeable.
+    content_type = None
+
     def encode(self, message: Union[Message, dict, Any]) -> Union[bytes, str]:
         """Encode a message to the codec's representation format.
 
@@ -41,13 +165,30 @@ class MessageCodec(object):
         """
         raise NotImplementedError("Subclasses must implement encode()")
 
+    def encode_buffers(self, message: Union[Message, dict, Any]) -> List[Union[bytes, memoryview]]:
+        """Encode a message to a sequence of buffers, whose concatenation is the encoded message.
+
+        By default, the result of [encode][compas_eve.MessageCodec.encode] as the only buffer.
+
+        Parameters
+        ----------
+        message
+            Message to encode.
+
+        Returns
+        -------
+        list
+            Buffers of the encoded message, in order.
+        """
+        return [_to_bytes(self.encode(message))]
+
     def decode(self, encoded_data: bytes) -> Union[Message, dict, Any]:
         """Decode data from the codec's representation format.
 
         Parameters
         ----------
         encoded_data
-            Encoded data to decode.
+            Encoded data to decode, as bytes or any other object supporting the buffer protocol.
 
         Returns
         -------
@@ -57,14 +198,107 @@ class MessageCodec(object):
         raise NotImplementedError("Subclasses must implement decode()")
 
 
+class SharedPayload(object):
+    """Encoded payload received on a topic, decoded at most once per message type.
+
+    Transports wrap every incoming payload in one instance and hand that same
+    instance to all local listeners of the topic, so that a topic with many
+    subscribers only pays for decoding once.
+
+    Note
+    ----
+    All subscribers requesting the same message type receive the *same* decoded
+    object, so it should be treated as read-only. Subscribers that need to modify
+    a message must copy it first.
+
+    Parameters
+    ----------
+    payload
+        Encoded message data as received from the wire.
+    codec
+        The codec used to decode the payload.
+    """
+
+    __slots__ = ("payload", "codec", "_decoded", "_derived")
+
+    def __init__(self, payload: bytes, codec: MessageCodec) -> None:
+        self.payload = payload
+        self.codec = codec
+        self._decoded = {}
+        self._derived = None
+
+    def for_codec(self, codec: MessageCodec) -> "SharedPayload":
+        """Get the payload to decode with another codec of the same content type, e.g. the codec of the subscribed topic.
+
+        Codecs with the same content type can still differ in their settings (e.g. compression
+        dictionaries), so subscribers of topics declaring a codec decode with that instance.
+
+        Parameters
+        ----------
+        codec
+            The codec of the subscribed topic.
+
+        Returns
+        -------
+        SharedPayload
+            The payload decoded with ``codec``, shared by all callers with that codec, or this payload
+            if it was encoded with another content type.
+        """
+        if codec is self.codec or codec.content_type != self.codec.content_type:
+            return self
+        derived = self._derived
+        if derived is None:
+            # A concurrent caller may replace it, which only costs one more decoding
+            derived = self._derived = {}
+        try:
+            return derived[codec]
+        except KeyError:
+            return derived.setdefault(codec, SharedPayload(self.payload, codec))
+
+    def decode(self, message_type: type) -> Union[Message, dict, Any]:
+        """Decode the payload into the given message type, reusing earlier results.
+
+        Parameters
+        ----------
+        message_type
+            The message type class to use for parsing.
+
+        Returns
+        -------
+        Union[Message, dict, Any]
+            Decoded message, shared with every other caller using the same message type.
+        """
+        try:
+            return self._decoded[message_type]
+        except KeyError:
+            message = self.codec.decode(self.payload, message_type)
+            # Subscribers decoding concurrently on different threads still share the first result
+            return self._decoded.setdefault(message_type, message)
+
+
 class JsonMessageCodec(MessageCodec):
     """JSON codec for message serialization.
 
     This codec uses the COMPAS framework's JSON serialization functions
     to encode and decode message data. It can handle Message objects,
     COMPAS Data objects, and regular dictionaries.
+
+    Messages decoded as [LazyMessage][compas_eve.lazy.LazyMessage] only reconstruct
+    COMPAS Data objects of the fields that are accessed.
     """
 
+    decodes_str = True
+    content_type = "application/json"
+
+    def __init__(self) -> None:
+        super(JsonMessageCodec, self).__init__()
+        self._revive = functools.partial(_revive_json, DataDecoder().object_hook)
+
+    def __reduce__(self) -> Tuple[type, tuple]:
+        # The COMPAS encoder and decoder hooks cannot be pickled, but are recreated by the initializer,
+        # e.g. to send the codec to worker processes (see compas_eve.offload)
+        return type(self), ()
+
     def encode(self, message: Union[Message, dict, Any]) -> str:
         """Encode a message to JSON string.
 
@@ -103,19 +337,756 @@ class JsonMessageCodec(MessageCodec):
         Message
             Decoded message object.
         """
-        data = json_loads(encoded_data.decode())
+        # str() decodes directly from any buffer (e.g. memoryview) without copying it first
+        if not isinstance(encoded_data, str):
+            encoded_data = str(encoded_data, "utf-8")
+        if _is_lazy(message_type):
+            return _parse_lazy(json.loads(encoded_data), message_type, self._revive)
+
+        data = json_loads(encoded_data)
+        if hasattr(data, "__data__"):
+            return data
+        else:
+            return message_type.parse(data)
+
+
+class FastJsonMessageCodec(MessageCodec):
+    """JSON codec for message serialization, optimized for speed.
+
+    This codec produces the same JSON documents as [JsonMessageCodec][compas_eve.codecs.JsonMessageCodec],
+    so both can be used interchangeably on the two ends of a topic, including for messages
+    containing COMPAS Data objects. However, it encodes directly to UTF-8 bytes, and uses
+    [orjson](https://github.com/ijl/orjson) when it is installed, which is several times faster
+    than the JSON module of the standard library, especially for large messages.
+
+    Note
+    ----
+    If `orjson` is not available, this codec falls back to the standard library,
+    with the same performance as [JsonMessageCodec][compas_eve.codecs.JsonMessageCodec].
+    To install it: ``pip install orjson``.
+    """
+
+    decodes_str = True
+    content_type = "application/json"
+
+    def __init__(self) -> None:
+        super(FastJsonMessageCodec, self).__init__()
+        self._revive = functools.partial(_revive_json, DataDecoder().object_hook)
+        self._default = DataEncoder().default
+
+    def __reduce__(self) -> Tuple[type, tuple]:
+        return type(self), ()
+
+    def encode(self, message: Union[Message, dict, Any]) -> bytes:
+        """Encode a message to JSON bytes.
+
+        Parameters
+        ----------
+        message
+            Message to encode. Can be a Message instance, a dict, or
+            an object implementing the COMPAS data framework.
+
+        Returns
+        -------
+        bytes
+            UTF-8 encoded JSON representation of the message.
+        """
+        try:
+            data = message.data
+        except (KeyError, AttributeError):
+            data = message
+
+        if not ORJSON_AVAILABLE:
+            return json_dumps(data).encode("utf-8")
+
+        try:
+            # COMPAS Data objects are serialized by the default hook of the COMPAS encoder
+            return orjson.dumps(data, default=self._default, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+        except TypeError:
+            return orjson.dumps(dict(message), default=self._default, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+
+    def decode(self, encoded_data: bytes, message_type: type) -> Message:
+        """Decode JSON message payloads to message object.
+
+        Parameters
+        ----------
+        encoded_data
+            JSON data to decode, as bytes, any other buffer, or string.
+        message_type
+            The message type class to use for parsing.
+
+        Returns
+        -------
+        Message
+            Decoded message object.
+        """
+        if _is_lazy(message_type):
+            if ORJSON_AVAILABLE:
+                data = orjson.loads(encoded_data)
+            else:
+                data = json.loads(encoded_data if isinstance(encoded_data, str) else str(encoded_data, "utf-8"))
+            return _parse_lazy(data, message_type, self._revive)
+
+        if ORJSON_AVAILABLE:
+            data = self._revive(orjson.loads(encoded_data))
+        else:
+            if not isinstance(encoded_data, str):
+                encoded_data = str(encoded_data, "utf-8")
+            data = json_loads(encoded_data)
+
         if hasattr(data, "__data__"):
             return data
         else:
             return message_type.parse(data)
 
 
+class MsgPackMessageCodec(MessageCodec):
+    """MessagePack codec for message serialization.
+
+    [MessagePack](https://msgpack.org/) is a binary format that stores numbers in their binary
+    representation instead of as text, which makes numeric-heavy messages (e.g. geometry)
+    considerably smaller and faster to encode and decode than JSON.
+
+    It can handle Message objects, COMPAS Data objects, and regular dictionaries. COMPAS Data
+    objects are stored as a MessagePack extension type wrapping their type and data, so they are
+    reconstructed on decoding, and never confused with regular dictionaries. Messages decoded as
+    [LazyMessage][compas_eve.lazy.LazyMessage] only reconstruct the COMPAS Data objects of the
+    fields that are accessed.
+
+    Note
+    ----
+    This codec requires the `msgpack` package to be installed.
+    If `msgpack` is not available, attempting to create the codec
+    will raise an [ImportError][]. To install it: ``pip install msgpack``.
+    """
+
+    EXT_COMPAS_DATA = 1
+
+    content_type = "application/msgpack"
+
+    def __init__(self) -> None:
+        super(MsgPackMessageCodec, self).__init__()
+        if not MSGPACK_AVAILABLE:
+            raise ImportError("The MsgPackMessageCodec requires 'msgpack' to be installed. Please install it with: pip install msgpack")
+        self._object_hook = DataDecoder().object_hook
+        self._json_default = DataEncoder().default
+
+    def __reduce__(self) -> Tuple[type, tuple]:
+        return type(self), ()
+
+    def encode(self, message: Union[Message, dict, Any]) -> bytes:
+        """Encode a message to MessagePack binary format.
+
+        Parameters
+        ----------
+        message
+            Message to encode. Can be a Message instance, a dict, or
+            an object implementing the COMPAS data framework.
+
+        Returns
+        -------
+        bytes
+            MessagePack binary representation of the message.
+        """
+        if isinstance(message, Message):
+            message = message.data
+        return msgpack.packb(message, default=self._default, use_bin_type=True)
+
+    def decode(self, encoded_data: bytes, message_type: type) -> Message:
+        """Decode MessagePack binary data to message object.
+
+        Parameters
+        ----------
+        encoded_data
+            MessagePack data to decode, as bytes or any other buffer.
+        message_type
+            The message type class to use for parsing.
+
+        Returns
+        -------
+        Message
+            Decoded message object.
+        """
+        if _is_lazy(message_type):
+            # Leave COMPAS Data objects as extension types until their field is accessed
+            data = msgpack.unpackb(encoded_data, raw=False, strict_map_key=False)
+            return _parse_lazy(data, message_type, self._revive)
+
+        data = self._unpack(encoded_data)
+        if hasattr(data, "__data__"):
+            return data
+        else:
+            return message_type.parse(data)
+
+    def _unpack(self, encoded_data: bytes) -> Any:
+        return msgpack.unpackb(encoded_data, ext_hook=self._ext_hook, raw=False, strict_map_key=False)
+
+    def _default(self, obj: Any) -> Any:
+        if isinstance(obj, Message):
+            return obj.data
+        if hasattr(obj, "__data__"):
+            return msgpack.ExtType(self.EXT_COMPAS_DATA, msgpack.packb(obj.__jsondump__(), default=self._default, use_bin_type=True))
+        # Numpy values, iterators, etc. are converted the same way as with JSON
+        return self._json_default(obj)
+
+    def _ext_hook(self, code: int, data: bytes) -> Any:
+        if code == self.EXT_COMPAS_DATA:
+            return self._object_hook(self._unpack(data))
+        return msgpack.ExtType(code, data)
+
+    def _revive(self, obj: Any) -> Any:
+        obj_type = type(obj)
+        if obj_type is msgpack.ExtType:
+            return self._ext_hook(obj.code, obj.data)
+        if obj_type is dict:
+            for key, value in obj.items():
+                obj[key] = self._revive(value)
+        elif obj_type is list:
+            for index, value in enumerate(obj):
+                obj[index] = self._revive(value)
+        return obj
+
+
+class _RawData(object):
+    """Message type that leaves decoded data untouched, for codecs wrapping other codecs."""
+
+    @staticmethod
+    def parse(data: Any) -> Any:
+        return data
+
+
+class NumpyMessageCodec(MessageCodec):
+    """Codec extension that sends NumPy arrays of messages as raw binary buffers.
+
+    Arrays found anywhere in the message (i.e. as values of the message, or nested in
+    dictionaries and lists) are taken out of it and sent after the rest of the message,
+    which is encoded with the wrapped codec. Each array is described by a small header
+    (dtype, shape and memory order) followed by its raw buffer, so it does not need to be
+    converted to a list, and is not inflated by a text representation.
+
+    On decoding, arrays are created directly over the received bytes, without copying them.
+    Hence, decoded arrays are read-only, and must be copied if they need to be modified.
+
+    Messages without arrays are encoded by the wrapped codec alone, exactly as if it was used
+    directly. Arrays of objects, and arrays within COMPAS Data objects, are left to the
+    wrapped codec.
+
+    Note
+    ----
+    This codec requires the `numpy` package to be installed.
+
+    Parameters
+    ----------
+    codec
+        The codec used to encode the rest of the message.
+        If not provided, defaults to [JsonMessageCodec][compas_eve.codecs.JsonMessageCodec].
+    """
+
+    MAGIC = b"\xceNDA"
+    ALIGNMENT = 64
+    _HEADER_SIZE = struct.Struct("<I")
+
+    def __init__(self, codec: Optional[MessageCodec] = None) -> None:
+        super(NumpyMessageCodec, self).__init__()
+        if not NUMPY_AVAILABLE:
+            raise ImportError("The NumpyMessageCodec requires 'numpy' to be installed. Please install it with: pip install numpy")
+        self.codec = codec or JsonMessageCodec()
+
+    references_payload = True
+
+    @property
+    def decodes_str(self) -> bool:
+        return self.codec.decodes_str
+
+    @property
+    def content_type(self) -> Optional[str]:
+        return _wrapped_content_type("application/x-compas-eve-numpy", self.codec)
+
+    def encode(self, message: Union[Message, dict, Any]) -> Union[bytes, str]:
+        """Encode a message, sending its arrays as raw buffers.
+
+        Parameters
+        ----------
+        message
+            Message to encode. Can be a Message instance, a dict, or
+            an object implementing the COMPAS data framework.
+
+        Returns
+        -------
+        bytes or str
+            Encoded message. If the message contains no arrays, this is
+            the output of the wrapped codec.
+        """
+        chunks = self._encode_chunks(message)
+        if chunks is None:
+            return self.codec.encode(message)
+        return b"".join(chunks)
+
+    def encode_buffers(self, message: Union[Message, dict, Any]) -> List[Union[bytes, memoryview]]:
+        """Encode a message to a sequence of buffers, referencing the data of its arrays instead of copying it.
+
+        Parameters
+        ----------
+        message
+            Message to encode.
+
+        Returns
+        -------
+        list
+            Buffers of the encoded message, in order.
+        """
+        chunks = self._encode_chunks(message)
+        if chunks is None:
+            return self.codec.encode_buffers(message)
+        return [memoryview(chunk).cast("B") for chunk in chunks]
+
+    def _encode_chunks(self, message: Union[Message, dict, Any]) -> Optional[List[Any]]:
+        data = message.data if isinstance(message, Message) else message
+        arrays = []
+        data = self._extract(data, [], arrays)
+        if not arrays:
+            return None
+
+        encoded = _to_bytes(self.codec.encode(data))
+
+        # Layout: magic, header size, header, then the encoded message and arrays, each aligned
+        buffers = [encoded]
+        descriptions = []
+        for path, array in arrays:
+            order = "F" if array.flags.f_contiguous and not array.flags.c_contiguous else "C"
+            if not (array.flags.c_contiguous or array.flags.f_contiguous):
+                array = numpy.ascontiguousarray(array)
+            descriptions.append(dict(path=path, dtype=numpy.lib.format.dtype_to_descr(array.dtype), shape=array.shape, order=order))
+            buffers.append(array.ravel(order="A"))
+
+        sizes = [memoryview(buffer).nbytes for buffer in buffers]
+        header = json.dumps(dict(sizes=sizes, arrays=descriptions), separators=(",", ":")).encode("utf-8")
+
+        chunks = [self.MAGIC, self._HEADER_SIZE.pack(len(header)), header]
+        offset = len(self.MAGIC) + self._HEADER_SIZE.size + len(header)
+        for buffer, size in zip(buffers, sizes):
+            padding = -offset % self.ALIGNMENT
+            chunks.append(b"\0" * padding)
+            chunks.append(buffer)
+            offset += padding + size
+        return chunks
+
+    def decode(self, encoded_data: bytes, message_type: type) -> Union[Message, dict, Any]:
+        """Decode a message, creating its arrays over the received data without copying it.
+
+        Parameters
+        ----------
+        encoded_data
+            Encoded data to decode, as bytes or any other buffer.
+        message_type
+            The message type class to use for parsing.
+
+        Returns
+        -------
+        Union[Message, dict, Any]
+            Decoded message object.
+        """
+        if isinstance(encoded_data, str):
+            return self.codec.decode(encoded_data, message_type)
+        view = memoryview(encoded_data)
+        if view[: len(self.MAGIC)] != self.MAGIC:
+            return self.codec.decode(encoded_data, message_type)
+
+        offset = len(self.MAGIC)
+        (header_size,) = self._HEADER_SIZE.unpack_from(view, offset)
+        offset += self._HEADER_SIZE.size
+        header = json.loads(str(view[offset : offset + header_size], "utf-8"))
+        offset += header_size
+
+        sizes = header["sizes"]
+        offsets = []
+        for size in sizes:
+            offset += -offset % self.ALIGNMENT
+            offsets.append(offset)
+            offset += size
+
+        data = self.codec.decode(view[offsets[0] : offsets[0] + sizes[0]], _RawData)
+        for description, offset, size in zip(header["arrays"], offsets[1:], sizes[1:]):
+            dtype = numpy.lib.format.descr_to_dtype(description["dtype"])
+            array = numpy.frombuffer(view, dtype=dtype, count=size // dtype.itemsize if dtype.itemsize else 0, offset=offset)
+            array = array.reshape(description["shape"], order=description["order"])
+            data = self._insert(data, description["path"], array)
+
+        if hasattr(data, "__data__"):
+            return data
+        return message_type.parse(data)
+
+    def _extract(self, obj: Any, path: List[Union[str, int]], arrays: List[Tuple[list, Any]]) -> Any:
+        # Return obj with its arrays replaced by None, copying only the containers that change
+        if isinstance(obj, numpy.ndarray) and not obj.dtype.hasobject:
+            arrays.append((list(path), obj))
+            return None
+        if isinstance(obj, dict):
+            items = obj.items()
+        elif isinstance(obj, (list, tuple)):
+            items = enumerate(obj)
+        else:
+            return obj
+
+        copy = None
+        for key, value in items:
+            if isinstance(value, (dict, list, tuple, numpy.ndarray)):
+                path.append(key)
+                new_value = self._extract(value, path, arrays)
+                path.pop()
+                if new_value is not value:
+                    if copy is None:
+                        copy = dict(obj) if isinstance(obj, dict) else list(obj)
+                    copy[key] = new_value
+        return obj if copy is None else copy
+
+    def _insert(self, data: Any, path: List[Union[str, int]], array: Any) -> Any:
+        if not path:
+            return array
+        container = data
+        for key in path[:-1]:
+            container = container[key]
+        container[path[-1]] = array
+        return data
+
+
+class CompressedMessageCodec(MessageCodec):
+    """Codec extension that compresses the output of another codec.
+
+    Every encoded message starts with one byte indicating how the rest is compressed,
+    so that the decoder does not need to be configured with the same algorithm as the
+    encoder (although the algorithm needs to be installed on both sides). Messages
+    smaller than ``min_size`` are not compressed at all, since the time spent compressing
+    them outweighs the savings, and neither are messages that do not get smaller when
+    compressed (e.g. data that is already compressed).
+
+    Three algorithms are supported:
+
+    - ``"zlib"``: always available, good compression but slow.
+    - ``"lz4"``: very fast, lower compression. Requires ``pip install lz4``.
+    - ``"zstd"``: fast and good compression, supports dictionaries. Requires ``pip install zstandard``.
+
+    For small, repetitive messages (e.g. robot states), compressing with a zstd dictionary
+    trained on sample messages (see [train_dictionary][compas_eve.codecs.CompressedMessageCodec.train_dictionary])
+    is far more effective than compressing each message on its own. Both publishers and
+    subscribers must use the same dictionary.
+
+    The ratio and time spent compressing and decompressing are available in
+    [stats][compas_eve.codecs.CompressedMessageCodec.stats].
+
+    Parameters
+    ----------
+    codec
+        The codec used to encode messages before compressing them.
+        If not provided, defaults to [JsonMessageCodec][compas_eve.codecs.JsonMessageCodec].
+    algorithm
+        The compression algorithm: ``"zlib"``, ``"lz4"``, ``"zstd"`` or ``"auto"`` (default),
+        which selects the best one installed, in that order of preference: zstd, lz4, zlib.
+    min_size
+        Size in bytes below which messages are not compressed. Defaults to 1024.
+    level
+        Compression level, specific to the algorithm. Defaults to the default level of the algorithm.
+    dictionary
+        A zstd dictionary, e.g. created with [train_dictionary][compas_eve.codecs.CompressedMessageCodec.train_dictionary].
+    """
+
+    RAW = 0
+    ZLIB = 1
+    LZ4 = 2
+    ZSTD = 3
+
+    ALGORITHMS = {"zlib": ZLIB, "lz4": LZ4, "zstd": ZSTD}
+
+    def __init__(
+        self,
+        codec: Optional[MessageCodec] = None,
+        algorithm: str = "auto",
+        min_size: int = 1024,
+        level: Optional[int] = None,
+        dictionary: Optional[bytes] = None,
+    ) -> None:
+        super(CompressedMessageCodec, self).__init__()
+        if algorithm == "auto":
+            algorithm = "zstd" if ZSTD_AVAILABLE else "lz4" if LZ4_AVAILABLE else "zlib"
+        if algorithm not in self.ALGORITHMS:
+            raise ValueError("Unknown compression algorithm {!r}, expected one of: auto, {}".format(algorithm, ", ".join(self.ALGORITHMS)))
+        if algorithm == "lz4" and not LZ4_AVAILABLE:
+            raise ImportError("The lz4 compression algorithm requires 'lz4' to be installed. Please install it with: pip install lz4")
+        if (algorithm == "zstd" or dictionary is not None) and not ZSTD_AVAILABLE:
+            raise ImportError("The zstd compression algorithm requires 'zstandard' to be installed. Please install it with: pip install zstandard")
+        if dictionary is not None and algorithm != "zstd":
+            raise ValueError("Compression dictionaries are only supported by the zstd algorithm")
+
+        self.codec = codec or JsonMessageCodec()
+        self.algorithm = algorithm
+        self.min_size = min_size
+        self.level = level
+        self.dictionary = zstandard.ZstdCompressionDict(dictionary) if dictionary is not None else None
+
+        # zstd (de)compressors cannot be shared across threads
+        self._local = threading.local()
+        self._stats_lock = threading.Lock()
+        self.reset_stats()
+
+    @property
+    def references_payload(self) -> bool:
+        # Messages that were not compressed are decoded by the wrapped codec straight from the payload
+        return self.codec.references_payload
+
+    @property
+    def content_type(self) -> Optional[str]:
+        return _wrapped_content_type("application/x-compas-eve-compressed", self.codec)
+
+    def __reduce__(self) -> Tuple[type, tuple]:
+        dictionary = self.dictionary.as_bytes() if self.dictionary is not None else None
+        return type(self), (self.codec, self.algorithm, self.min_size, self.level, dictionary)
+
+    @staticmethod
+    def train_dictionary(messages: List[Union[Message, dict, Any]], size: int = 16 * 1024, codec: Optional[MessageCodec] = None) -> bytes:
+        """Train a zstd dictionary on sample messages.
+
+        Parameters
+        ----------
+        messages
+            Sample messages, representative of the messages that will be compressed.
+            A few hundred samples are usually needed.
+        size
+            Maximum size of the dictionary in bytes. Defaults to 16 KiB.
+        codec
+            The codec used to encode the messages. Must be the same as the one wrapped
+            by the compressed codec. Defaults to [JsonMessageCodec][compas_eve.codecs.JsonMessageCodec].
+
+        Returns
+        -------
+        bytes
+            The dictionary, to be passed as ``dictionary`` to the codecs of both publishers and subscribers.
+        """
+        if not ZSTD_AVAILABLE:
+            raise ImportError("Training dictionaries requires 'zstandard' to be installed. Please install it with: pip install zstandard")
+        codec = codec or JsonMessageCodec()
+        samples = [_to_bytes(codec.encode(message)) for message in messages]
+        return zstandard.train_dictionary(size, samples).as_bytes()
+
+    @property
+    def stats(self) -> dict:
+        """Metrics of the codec: number of messages encoded and compressed, bytes before and after
+        compression, overall compression ratio, and total time spent compressing and decompressing, in seconds."""
+        with self._stats_lock:
+            stats = dict(self._stats)
+        stats["ratio"] = stats["compressed_bytes"] / stats["uncompressed_bytes"] if stats["uncompressed_bytes"] else 1.0
+        return stats
+
+    def reset_stats(self) -> None:
+        """Reset the metrics of the codec."""
+        with self._stats_lock:
+            self._stats = dict(
+                messages=0,
+                compressed_messages=0,
+                uncompressed_bytes=0,
+                compressed_bytes=0,
+                compress_time=0.0,
+                decompress_time=0.0,
+            )
+
+    def encode(self, message: Union[Message, dict, Any]) -> bytes:
+        """Encode a message with the wrapped codec and compress it.
+
+        Parameters
+        ----------
+        message
+            Message to encode.
+
+        Returns
+        -------
+        bytes
+            One byte indicating the compression algorithm, followed by the compressed message.
+        """
+        return b"".join(self.encode_buffers(message))
+
+    def encode_buffers(self, message: Union[Message, dict, Any]) -> List[Union[bytes, memoryview]]:
+        """Encode a message with the wrapped codec and compress it, without prepending the algorithm byte to a copy of it.
+
+        Parameters
+        ----------
+        message
+            Message to encode.
+
+        Returns
+        -------
+        list
+            One byte indicating the compression algorithm, and the compressed message.
+        """
+        encoded = _to_bytes(self.codec.encode(message))
+        size = len(encoded)
+
+        if size < self.min_size:
+            with self._stats_lock:
+                self._stats["messages"] += 1
+                self._stats["uncompressed_bytes"] += size
+                self._stats["compressed_bytes"] += size
+            return [bytes((self.RAW,)), encoded]
+
+        start = time.perf_counter()
+        compressed = self._compress(encoded)
+        elapsed = time.perf_counter() - start
+
+        if len(compressed) < size:
+            tag, result = self.ALGORITHMS[self.algorithm], compressed
+        else:
+            tag, result = self.RAW, encoded
+
+        with self._stats_lock:
+            self._stats["messages"] += 1
+            self._stats["compressed_messages"] += tag != self.RAW
+            self._stats["uncompressed_bytes"] += size
+            self._stats["compressed_bytes"] += len(result)
+            self._stats["compress_time"] += elapsed
+        return [bytes((tag,)), result]
+
+    def decode(self, encoded_data: bytes, message_type: type) -> Union[Message, dict, Any]:
+        """Decompress a message and decode it with the wrapped codec.
+
+        Parameters
+        ----------
+        encoded_data
+            Encoded data to decode, as bytes or any other buffer.
+        message_type
+            The message type class to use for parsing.
+
+        Returns
+        -------
+        Union[Message, dict, Any]
+            Decoded message object.
+        """
+        view = memoryview(encoded_data)
+        tag = view[0]
+        if tag == self.RAW:
+            return self.codec.decode(view[1:], message_type)
+
+        start = time.perf_counter()
+        data = self._decompress(tag, view[1:])
+        elapsed = time.perf_counter() - start
+        with self._stats_lock:
+            self._stats["decompress_time"] += elapsed
+
+        return self.codec.decode(data, message_type)
+
+    def _compress(self, data: bytes) -> bytes:
+        if self.algorithm == "zlib":
+            return zlib.compress(data, -1 if self.level is None else self.level)
+        if self.algorithm == "lz4":
+            return lz4.frame.compress(data, compression_level=self.level or 0)
+
+        compressor = getattr(self._local, "compressor", None)
+        if compressor is None:
+            compressor = self._local.compressor = zstandard.ZstdCompressor(level=3 if self.level is None else self.level, dict_data=self.dictionary)
+        return compressor.compress(data)
+
+    def _decompress(self, tag: int, data: memoryview) -> bytes:
+        if tag == self.ZLIB:
+            return zlib.decompress(data)
+        if tag == self.LZ4:
+            if not LZ4_AVAILABLE:
+                raise ImportError("Decoding this message requires 'lz4' to be installed. Please install it with: pip install lz4")
+            return lz4.frame.decompress(data)
+        if tag == self.ZSTD:
+            if not ZSTD_AVAILABLE:
+                raise ImportError("Decoding this message requires 'zstandard' to be installed. Please install it with: pip install zstandard")
+            decompressor = getattr(self._local, "decompressor", None)
+            if decompressor is None:
+                decompressor = self._local.decompressor = zstandard.ZstdDecompressor(dict_data=self.dictionary)
+            return decompressor.decompress(data)
+        raise ValueError("Unknown compression algorithm in message header: {}".format(tag))
+
+
+class StructMessageCodec(MessageCodec):
+    """Binary codec for messages with a fixed layout.
+
+    Messages that are instances of [StructMessage][compas_eve.structs.StructMessage] are encoded
+    as the raw values of their fields, without any key names or type information, using the
+    encoder compiled from the declaration of their fields. This is the fastest and most compact
+    encoding available, ideal for small messages sent at high rates.
+
+    Since the encoded data does not describe itself, topics must declare their struct message
+    class as ``message_type``, and publishers must publish instances of that class. Any other
+    message is encoded with the wrapped codec, so one transport can carry both.
+
+    Parameters
+    ----------
+    codec
+        The codec used for messages that are not struct messages.
+        If not provided, defaults to [JsonMessageCodec][compas_eve.codecs.JsonMessageCodec].
+    """
+
+    def __init__(self, codec: Optional[MessageCodec] = None) -> None:
+        super(StructMessageCodec, self).__init__()
+        self.codec = codec or JsonMessageCodec()
+
+    @property
+    def references_payload(self) -> bool:
+        return self.codec.references_payload
+
+    @property
+    def content_type(self) -> Optional[str]:
+        return _wrapped_content_type("application/x-compas-eve-struct", self.codec)
+
+    def encode(self, message: Union[Message, dict, Any]) -> Union[bytes, str]:
+        """Encode a struct message to its binary layout, or any other message with the wrapped codec.
+
+        Parameters
+        ----------
+        message
+            Message to encode.
+
+        Returns
+        -------
+        bytes or str
+            Encoded message.
+        """
+        if isinstance(message, StructMessage):
+            return message.pack()
+        return self.codec.encode(message)
+
+    def encode_buffers(self, message: Union[Message, dict, Any]) -> List[Union[bytes, memoryview]]:
+        """Encode a message like [encode][compas_eve.codecs.StructMessageCodec.encode], to a sequence of buffers."""
+        if isinstance(message, StructMessage):
+            return [message.pack()]
+        return self.codec.encode_buffers(message)
+
+    def decode(self, encoded_data: bytes, message_type: type) -> Union[Message, dict, Any]:
+        """Decode a message of a struct message type from its binary layout, or any other type with the wrapped codec.
+
+        Parameters
+        ----------
+        encoded_data
+            Encoded data to decode, as bytes or any other buffer.
+        message_type
+            The message type class to use for parsing.
+
+        Returns
+        -------
+        Union[Message, dict, Any]
+            Decoded message object.
+        """
+        if isinstance(message_type, type) and issubclass(message_type, StructMessage):
+            return message_type.unpack(encoded_data)
+        return self.codec.decode(encoded_data, message_type)
+
+
 class ProtobufMessageCodec(MessageCodec):
     """Protocol Buffers codec for message serialization.
 
     This codec uses the compas_pb package to encode and decode message data
     using Protocol Buffers binary format.
 
+    Messages are encoded as a map of field names to values of any type. However,
+    for [StructMessage][compas_eve.structs.StructMessage] types, whose fields are
+    declared in advance, a typed protobuf message is generated instead (see
+    [compas_eve.codecs.schemas][]), with proper numeric fields and packed repeated
+    fields, which is much smaller and faster to encode and decode. Since typed messages
+    do not describe themselves, topics must declare their struct message class as
+    ``message_type``, and publishers must publish instances of that class.
+
     Note
     ----
     This codec requires the `compas_pb` package to be installed.
@@ -123,6 +1094,8 @@ class ProtobufMessageCodec(MessageCodec):
     will raise an [ImportError][].
     """
 
+    content_type = "application/x-protobuf"
+
     def __init__(self):
         super(ProtobufMessageCodec, self).__init__()
         if not COMPAS_PB_AVAILABLE:
@@ -144,6 +1117,8 @@ class ProtobufMessageCodec(MessageCodec):
         """
         if not COMPAS_PB_AVAILABLE:
             raise ImportError("The ProtobufMessageCodec requires 'compas_pb' to be installed. Please install it with: pip install compas_pb")
+        if isinstance(message, StructMessage):
+            return schemas.encode_typed(message)
         return compas_pb.pb_dump_bts(message)
 
     def decode(self, encoded_data: bytes, message_type: Optional[type] = None) -> object:
@@ -154,7 +1129,7 @@ class ProtobufMessageCodec(MessageCodec):
         encoded_data
             Protocol Buffers binary data to decode.
         message_type
-            The message type class (not used for protobuf as it's encoded in the data).
+            The message type class. Only used for struct message types, other types are encoded in the data.
 
         Returns
         -------
@@ -163,4 +1138,6 @@ class ProtobufMessageCodec(MessageCodec):
         """
         if not COMPAS_PB_AVAILABLE:
             raise ImportError("The ProtobufMessageCodec requires 'compas_pb' to be installed. Please install it with: pip install compas_pb")
+        if isinstance(message_type, type) and issubclass(message_type, StructMessage):
+            return schemas.decode_typed(encoded_data, message_type)
         return compas_pb.pb_load_bts(encoded_data)
@@ -0,0 +1,283 @@
+"""
+Selection of codecs per topic, identified on the wire by one-byte codec ids.
+
+A transport encodes messages with its own codec, unless the topic they are published on
+declares another one with its ``codec`` option, e.g. to send human-readable JSON on status
+topics and binary data on high-rate point cloud topics over the same connection::
+
+    Topic("/scanner/points/", codec=NumpyMessageCodec(MsgPackMessageCodec()))
+
+Messages of such topics are tagged with the codec ids of the [content type][compas_eve.MessageCodec.content_type]
+of their codec, so that every receiving transport decodes them with the right codec, also
+for subscribers of topics without codec option or of wildcard topics. Messages of topics without
+codec option are not tagged, and are decoded with the codec of the receiving transport.
+
+A tag starts with a magic marker, followed by one byte per codec: codecs wrapping another codec
+(ids from 128) are followed by the id of the codec they wrap, so e.g. compressed NumPy MessagePack
+messages carry a tag of 7 bytes. Subscribers of a topic declaring a codec decode its messages
+with that codec. Other subscribers, e.g. of wildcard topics, decode tagged messages with the codec
+registered for their content type, i.e. the codec of a local topic with that content type,
+or a default instance of the codec class the content type designates.
+
+Codecs of other content types must be given an id with [register_codec_id][compas_eve.codecs.registry.register_codec_id]
+by the publishing and the receiving applications, ids from 64 to 127 are reserved for them.
+"""
+
+import functools
+import threading
+from typing import Any
+from typing import List
+from typing import Tuple
+from typing import Union
+
+from compas_eve.codecs import CompressedMessageCodec
+from compas_eve.codecs import JsonMessageCodec
+from compas_eve.codecs import MessageCodec
+from compas_eve.codecs import MsgPackMessageCodec
+from compas_eve.codecs import NumpyMessageCodec
+from compas_eve.codecs import ProtobufMessageCodec
+from compas_eve.codecs import SharedPayload
+from compas_eve.codecs import StructMessageCodec
+
+__all__ = ["CodecRegistry", "register_codec_id", "tag_buffers", "is_tagged", "untag_payload"]
+
+MAGIC = b"\xceCID"
+
+# First id of codecs wrapping another codec
+WRAPPER_ID = 0x80
+
+# Maximum number of codecs of a tag
+MAX_DEPTH = 8
+
+# Codec ids, by content type
+_CODEC_IDS = {
+    "application/json": 0x01,
+    "application/msgpack": 0x02,
+    "application/x-protobuf": 0x03,
+    "application/x-compas-eve-numpy": 0x80,
+    "application/x-compas-eve-compressed": 0x81,
+    "application/x-compas-eve-struct": 0x82,
+}
+
+_CONTENT_TYPES = {codec_id: content_type for content_type, codec_id in _CODEC_IDS.items()}
+
+_CODEC_IDS_LOCK = threading.Lock()
+
+# Codecs created for content types that were not registered
+_CODECS = {
+    "application/json": JsonMessageCodec,
+    "application/msgpack": MsgPackMessageCodec,
+    "application/x-protobuf": ProtobufMessageCodec,
+}
+
+# Codecs wrapping the codec of the rest of the content type
+_WRAPPERS = {
+    "application/x-compas-eve-numpy": NumpyMessageCodec,
+    "application/x-compas-eve-compressed": CompressedMessageCodec,
+    "application/x-compas-eve-struct": StructMessageCodec,
+}
+
+
+def register_codec_id(content_type: str, codec_id: int) -> None:
+    """Register the codec id of a content type, to use codecs of that content type on topics.
+
+    Parameters
+    ----------
+    content_type
+        Content type of the codec, without ``+``.
+    codec_id
+        Id of the content type on the wire, from 64 to 127.
+    """
+    if not 0x40 <= codec_id < WRAPPER_ID:
+        raise ValueError("Codec ids of applications must be between 64 and 127, got {}".format(codec_id))
+    if "+" in content_type:
+        raise ValueError("Content types of codecs with an id cannot contain +: {}".format(content_type))
+    with _CODEC_IDS_LOCK:
+        if _CODEC_IDS.get(content_type, codec_id) != codec_id or _CONTENT_TYPES.get(codec_id, content_type) != content_type:
+            raise ValueError("Codec id {} or content type {} is already registered".format(codec_id, content_type))
+        _CODEC_IDS[content_type] = codec_id
+        _CONTENT_TYPES[codec_id] = content_type
+
+
+@functools.lru_cache(maxsize=None)
+def _tag(content_type: str) -> bytes:
+    codec_ids = []
+    for part in content_type.split("+"):
+        codec_id = _CODEC_IDS.get(part)
+        if codec_id is None:
+            raise ValueError("Content type {} has no codec id, register one with register_codec_id".format(part))
+        codec_ids.append(codec_id)
+    if len(codec_ids) > MAX_DEPTH or any(codec_id < WRAPPER_ID for codec_id in codec_ids[:-1]) or codec_ids[-1] >= WRAPPER_ID:
+        raise ValueError("Invalid content type {}".format(content_type))
+    return MAGIC + bytes(codec_ids)
+
+
+@functools.lru_cache(maxsize=None)
+def _content_type(codec_ids: bytes) -> str:
+    try:
+        return "+".join(_CONTENT_TYPES[codec_id] for codec_id in codec_ids)
+    except KeyError as error:
+        raise ValueError("Received a message of unknown codec id {}, register it with register_codec_id".format(error.args[0]))
+
+
+def tag_buffers(content_type: str, buffers: List[Any]) -> List[Any]:
+    """Prepend the tag of a content type to the buffers of an encoded message.
+
+    Parameters
+    ----------
+    content_type
+        Content type of the encoded message.
+    buffers
+        Buffers of the encoded message, as returned by [MessageCodec.encode_buffers][compas_eve.MessageCodec.encode_buffers].
+
+    Returns
+    -------
+    list
+        Buffers of the tagged message.
+    """
+    return [_tag(content_type)] + list(buffers)
+
+
+def is_tagged(data: Union[bytes, bytearray, memoryview, str]) -> bool:
+    """Check if a received payload is tagged with a content type.
+
+    Parameters
+    ----------
+    data
+        Received payload.
+
+    Returns
+    -------
+    bool
+        True if the payload starts with a tag.
+    """
+    return not isinstance(data, str) and len(data) > len(MAGIC) and data[: len(MAGIC)] == MAGIC
+
+
+def untag_payload(data: Union[bytes, bytearray, memoryview]) -> Tuple[str, memoryview]:
+    """Split a tagged payload into its content type and encoded message, without copying it.
+
+    Parameters
+    ----------
+    data
+        Tagged payload.
+
+    Returns
+    -------
+    tuple
+        Content type and encoded message.
+    """
+    view = memoryview(data)
+    end = len(MAGIC)
+    while end < len(view) and view[end] >= WRAPPER_ID and end - len(MAGIC) < MAX_DEPTH:
+        end += 1
+    if end >= len(view) or end - len(MAGIC) >= MAX_DEPTH:
+        raise ValueError("Invalid tag: no codec id ends the tag")
+    return _content_type(bytes(view[len(MAGIC) : end + 1])), view[end + 1 :]
+
+
+class CodecRegistry(object):
+    """Codecs of the topics of a transport, by content type.
+
+    Codecs are registered when messages are published or subscribed to on topics declaring them.
+    Tagged messages of other content types are decoded with a default instance of the
+    codec class designated by their content type.
+    """
+
+    def __init__(self) -> None:
+        self._codecs = {}
+        # Tags of the registered codecs, by codec instance
+        self._tags = {}
+        self._lock = threading.Lock()
+
+    def register(self, codec: MessageCodec) -> None:
+        """Register the codec of a topic, to decode messages tagged with its content type.
+
+        Subscribers of the topic itself decode its messages with its codec in any case, registered
+        codecs are used for subscribers of wildcard topics or of topics without codec option. If several
+        codecs of the same content type are registered, the first one is used.
+
+        Parameters
+        ----------
+        codec
+            The codec.
+        """
+        if codec.content_type is None:
+            raise ValueError("{} cannot be used on a topic since it has no content type".format(type(codec).__name__))
+        if codec in self._tags:
+            return
+        # Fail early for content types that cannot be tagged
+        tag = _tag(codec.content_type)
+        with self._lock:
+            self._codecs.setdefault(codec.content_type, codec)
+            self._tags[codec] = tag
+
+    def get(self, content_type: str) -> MessageCodec:
+        """Get the codec of a content type, creating a default one if none was registered.
+
+        Parameters
+        ----------
+        content_type
+            The content type.
+
+        Returns
+        -------
+        MessageCodec
+            The codec.
+        """
+        try:
+            return self._codecs[content_type]
+        except KeyError:
+            codec = self._create(content_type)
+            with self._lock:
+                return self._codecs.setdefault(content_type, codec)
+
+    def _create(self, content_type: str) -> MessageCodec:
+        if content_type in _CODECS:
+            return _CODECS[content_type]()
+        wrapper, _, inner = content_type.partition("+")
+        factory = _WRAPPERS.get(wrapper)
+        if factory is None or not inner:
+            raise ValueError("Received a message of unknown content type {}, declare its codec with the codec option of the subscribed topic".format(content_type))
+        return factory(self.get(inner))
+
+    def encode_buffers(self, codec: MessageCodec, message: Any) -> List[Any]:
+        """Encode a message with the codec of its topic, and tag it with its content type.
+
+        Parameters
+        ----------
+        codec
+            The codec of the topic, which is registered the first time it is used.
+        message
+            Message to encode.
+
+        Returns
+        -------
+        list
+            Buffers of the tagged message.
+        """
+        tag = self._tags.get(codec)
+        if tag is None:
+            self.register(codec)
+            tag = self._tags[codec]
+        return [tag] + list(codec.encode_buffers(message))
+
+    def shared_payload(self, data: Any, default_codec: MessageCodec) -> SharedPayload:
+        """Wrap a received encoded message for decoding, with the codec of its tag if it has one.
+
+        Parameters
+        ----------
+        data
+            Received encoded message.
+        default_codec
+            The codec of messages without tag, i.e. the codec of the transport.
+
+        Returns
+        -------
+        SharedPayload
+            The payload, ready to be decoded.
+        """
+        if not is_tagged(data):
+            return SharedPayload(data, default_codec)
+        content_type, data = untag_payload(data)
+        return SharedPayload(data, self.get(content_type))
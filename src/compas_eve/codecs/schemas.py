@@ -0,0 +1,191 @@
+"""
+Typed Protocol Buffers schemas generated from the fields declared on [StructMessage][compas_eve.structs.StructMessage] classes.
+
+The generic protobuf representation of a message is a map of string keys to ``AnyData`` values,
+which carries the name and type of every field on the wire. For struct messages, whose fields
+and types are known in advance, a dedicated protobuf message type is generated instead, with
+numeric fields and packed repeated fields, so that only field numbers and values are sent.
+
+This module requires the `protobuf` package, which is installed together with `compas_pb`.
+"""
+
+import threading
+from typing import Any
+from typing import List
+from typing import Tuple
+from typing import Type
+
+from google.protobuf import descriptor_pb2
+from google.protobuf import descriptor_pool
+from google.protobuf import message_factory
+
+from compas_eve.structs import StructMessage
+
+__all__ = ["protobuf_message_class", "protobuf_schema", "encode_typed", "decode_typed"]
+
+FieldProto = descriptor_pb2.FieldDescriptorProto
+
+# Struct format characters to protobuf field types. Signed integers use zigzag encoding,
+# which is more compact than the two's complement of int32/int64 for negative values
+_PROTOBUF_TYPES = {
+    "b": FieldProto.TYPE_SINT32,
+    "h": FieldProto.TYPE_SINT32,
+    "i": FieldProto.TYPE_SINT32,
+    "l": FieldProto.TYPE_SINT32,
+    "q": FieldProto.TYPE_SINT64,
+    "B": FieldProto.TYPE_UINT32,
+    "H": FieldProto.TYPE_UINT32,
+    "I": FieldProto.TYPE_UINT32,
+    "L": FieldProto.TYPE_UINT32,
+    "Q": FieldProto.TYPE_UINT64,
+    "?": FieldProto.TYPE_BOOL,
+    "e": FieldProto.TYPE_FLOAT,
+    "f": FieldProto.TYPE_FLOAT,
+    "d": FieldProto.TYPE_DOUBLE,
+    "s": FieldProto.TYPE_STRING,
+}
+
+_PROTOBUF_TYPE_NAMES = {
+    FieldProto.TYPE_SINT32: "sint32",
+    FieldProto.TYPE_SINT64: "sint64",
+    FieldProto.TYPE_UINT32: "uint32",
+    FieldProto.TYPE_UINT64: "uint64",
+    FieldProto.TYPE_BOOL: "bool",
+    FieldProto.TYPE_FLOAT: "float",
+    FieldProto.TYPE_DOUBLE: "double",
+    FieldProto.TYPE_STRING: "string",
+}
+
+_PACKAGE = "compas_eve.typed"
+
+_classes = {}
+_classes_lock = threading.Lock()
+
+
+def _field_types(message_type: Type[StructMessage]):
+    for number, (name, fmt) in enumerate(message_type.__fields__, start=1):
+        code = fmt.lstrip("0123456789")
+        count = fmt[: len(fmt) - len(code)]
+        repeated = code != "s" and count not in ("", "1")
+        yield number, name, _PROTOBUF_TYPES[code], repeated
+
+
+def _file_descriptor(message_type: Type[StructMessage]) -> descriptor_pb2.FileDescriptorProto:
+    file_proto = descriptor_pb2.FileDescriptorProto(name="{}/{}.proto".format(_PACKAGE.replace(".", "/"), message_type.__name__), package=_PACKAGE, syntax="proto3")
+    message_proto = file_proto.message_type.add(name=message_type.__name__)
+    for number, name, field_type, repeated in _field_types(message_type):
+        # Repeated scalar fields are packed by default in proto3
+        label = FieldProto.LABEL_REPEATED if repeated else FieldProto.LABEL_OPTIONAL
+        message_proto.field.add(name=name, number=number, type=field_type, label=label)
+    return file_proto
+
+
+def _compiled(message_type: Type[StructMessage]) -> Tuple[Type[Any], List[Tuple[str, bool]]]:
+    compiled = _classes.get(message_type)
+    if compiled is None:
+        with _classes_lock:
+            compiled = _classes.get(message_type)
+            if compiled is None:
+                # Each class gets its own pool, so that classes with the same name never clash
+                pool = descriptor_pool.DescriptorPool()
+                pool.Add(_file_descriptor(message_type))
+                descriptor = pool.FindMessageTypeByName("{}.{}".format(_PACKAGE, message_type.__name__))
+                fields = [(name, repeated) for _number, name, _field_type, repeated in _field_types(message_type)]
+                compiled = _classes[message_type] = (message_factory.GetMessageClass(descriptor), fields)
+    return compiled
+
+
+def protobuf_message_class(message_type: Type[StructMessage]) -> Type[Any]:
+    """Get the protobuf message class generated for a struct message type.
+
+    Classes are generated the first time they are requested, and cached afterwards.
+
+    Parameters
+    ----------
+    message_type
+        A subclass of [StructMessage][compas_eve.structs.StructMessage].
+
+    Returns
+    -------
+    type
+        Protobuf message class with one field per field of the struct message, in the same order.
+    """
+    return _compiled(message_type)[0]
+
+
+def protobuf_schema(message_type: Type[StructMessage]) -> str:
+    """Generate the ``.proto`` definition of a struct message type.
+
+    The definition can be compiled with ``protoc`` to exchange messages
+    with applications written in other languages.
+
+    Parameters
+    ----------
+    message_type
+        A subclass of [StructMessage][compas_eve.structs.StructMessage].
+
+    Returns
+    -------
+    str
+        Protocol Buffers definition of the message.
+
+    Examples
+    --------
+    >>> class JointState(StructMessage):
+    ...     __fields__ = [("sequence", "I"), ("positions", "6d")]
+    >>> print(protobuf_schema(JointState))
+    syntax = "proto3";
+    <BLANKLINE>
+    package compas_eve.typed;
+    <BLANKLINE>
+    message JointState {
+      uint32 sequence = 1;
+      repeated double positions = 2;
+    }
+    """
+    lines = ['syntax = "proto3";', "", "package {};".format(_PACKAGE), "", "message {} {{".format(message_type.__name__)]
+    for number, name, field_type, repeated in _field_types(message_type):
+        lines.append("  {}{} {} = {};".format("repeated " if repeated else "", _PROTOBUF_TYPE_NAMES[field_type], name, number))
+    lines.append("}")
+    return "\n".join(lines)
+
+
+def encode_typed(message: StructMessage) -> bytes:
+    """Encode a struct message with its generated protobuf message class.
+
+    Parameters
+    ----------
+    message
+        Message to encode.
+
+    Returns
+    -------
+    bytes
+        Protocol Buffers binary representation of the message.
+    """
+    pb_class, _fields = _compiled(type(message))
+    return pb_class(**message.data).SerializeToString()
+
+
+def decode_typed(encoded_data: bytes, message_type: Type[StructMessage]) -> StructMessage:
+    """Decode a struct message with its generated protobuf message class.
+
+    Parameters
+    ----------
+    encoded_data
+        Protocol Buffers binary data to decode.
+    message_type
+        The struct message type to decode.
+
+    Returns
+    -------
+    StructMessage
+        Decoded message.
+    """
+    pb_class, fields = _compiled(message_type)
+    pb = pb_class.FromString(bytes(encoded_data))
+    values = {}
+    for name, repeated in fields:
+        value = getattr(pb, name)
+        values[name] = tuple(value) if repeated else value
+    return message_type(**values)
@@ -1,10 +1,32 @@
 from typing import Any
 from typing import Callable
 from typing import Dict
+from typing import Iterable
+from typing import List
 from typing import Optional
 from typing import Type
 from typing import Union
 
+from compas_eve.batching import Batcher
+from compas_eve.batching import is_batch
+from compas_eve.batching import pack_batch
+from compas_eve.batching import unpack_batch
+from compas_eve.chunking import DEFAULT_MAX_PENDING_BYTES
+from compas_eve.chunking import DEFAULT_TIMEOUT
+from compas_eve.chunking import Chunk
+from compas_eve.chunking import ChunkAssembler
+from compas_eve.chunking import split_payload
+from compas_eve.delta import DEFAULT_KEYFRAME_INTERVAL
+from compas_eve.delta import DeltaDecoder
+from compas_eve.delta import DeltaEncoder
+from compas_eve.delta import resync_topic_name
+from compas_eve.executors import ExecutionStats
+from compas_eve.executors import InlineExecutor
+from compas_eve.executors import SubscriberExecutor
+from compas_eve.executors import get_executor
+from compas_eve.queues import SubscriberQueue
+from compas_eve.trie import is_wildcard
+
 DEFAULT_TRANSPORT = None
 
 
@@ -41,16 +63,144 @@ class Transport(object):
     codec
         The codec to use for encoding and decoding messages.
         If not provided, defaults to [JsonMessageCodec][compas_eve.codecs.JsonMessageCodec].
+    chunk_size
+        If set, encoded messages larger than this size in bytes are sent in chunks of this size,
+        and reassembled by the receiving transports (see [compas_eve.chunking][]). Receiving chunked
+        messages works regardless of this option. By default, messages are never chunked.
+        Supported by the in-memory, MQTT and Zenoh transports.
+    chunk_timeout
+        Time in seconds after which a message whose chunks have not all been received is discarded.
+        Defaults to 30 seconds.
+    chunk_max_pending_bytes
+        Maximum total size of incomplete chunked messages kept in memory. Defaults to 512 MiB.
+    chunk_callback
+        Function invoked with every received [Chunk][compas_eve.chunking.Chunk] of chunked messages,
+        e.g. to report progress or process large messages incrementally.
+
+    Topics can override the codec with their ``codec`` option (see [compas_eve.codecs.registry][]).
+
+    Attributes
+    ----------
+    codecs
+        [CodecRegistry][compas_eve.codecs.registry.CodecRegistry] of the codecs of topics, used to
+        decode messages tagged with their content type. Codecs needing a configuration to decode
+        messages (e.g. a compression dictionary) can be registered in advance for wildcard subscribers.
     """
 
-    def __init__(self, codec: Optional[Any] = None, *args: Any, **kwargs: Any) -> None:
+    def __init__(
+        self,
+        codec: Optional[Any] = None,
+        chunk_size: Optional[int] = None,
+        chunk_timeout: float = DEFAULT_TIMEOUT,
+        chunk_max_pending_bytes: int = DEFAULT_MAX_PENDING_BYTES,
+        chunk_callback: Optional[Callable] = None,
+        *args: Any,
+        **kwargs: Any,
+    ) -> None:
         super(Transport, self).__init__(*args, **kwargs)
         from compas_eve.codecs import JsonMessageCodec
+        from compas_eve.codecs.registry import CodecRegistry
+
+        if chunk_size is not None and chunk_size < 1:
+            raise ValueError("Chunk size must be at least 1, got {}".format(chunk_size))
 
         self._id_counter = 0
         if codec is None:
             codec = JsonMessageCodec()
         self.codec = codec
+        self.codecs = CodecRegistry()
+        self.chunk_size = chunk_size
+        self.chunk_timeout = chunk_timeout
+        self.chunk_max_pending_bytes = chunk_max_pending_bytes
+        self.chunk_callback = chunk_callback
+        self._chunks = self._chunk_assembler()
+
+    def _chunk_assembler(self) -> ChunkAssembler:
+        return ChunkAssembler(self.chunk_timeout, self.chunk_max_pending_bytes, self._on_chunk)
+
+    def _on_chunk(self, chunk: Chunk) -> None:
+        if self.chunk_callback:
+            self.chunk_callback(chunk)
+
+    def _split(self, encoded: Union[bytes, str]) -> Iterable[Union[bytes, str]]:
+        """Split an encoded message into the payloads to send, i.e. chunks if it is larger than the chunk size."""
+        if self.chunk_size is None:
+            return (encoded,)
+        if isinstance(encoded, str):
+            encoded = encoded.encode("utf-8")
+        if len(encoded) <= self.chunk_size:
+            return (encoded,)
+        return split_payload(encoded, self.chunk_size)
+
+    def _topic_codec(self, topic: "Topic") -> Optional[Any]:
+        """Codec of the messages of a topic, if it is not the codec of the transport."""
+        codec = topic.options.get("codec")
+        return None if codec is self.codec else codec
+
+    def _encode(self, topic: "Topic", message: Union["Message", dict]) -> Union[bytes, str]:
+        codec = self._topic_codec(topic)
+        if codec is None:
+            return self.codec.encode(message)
+        return b"".join(self.codecs.encode_buffers(codec, message))
+
+    def _encode_buffers(self, topic: "Topic", message: Union["Message", dict]) -> List[Any]:
+        codec = self._topic_codec(topic)
+        if codec is None:
+            return self.codec.encode_buffers(message)
+        return self.codecs.encode_buffers(codec, message)
+
+    def _encode_batch(self, topic: "Topic", messages: List[Union["Message", dict]]) -> bytes:
+        # The buffers of all messages are joined once, into the batch itself
+        return pack_batch([self._encode_buffers(topic, message) for message in messages])
+
+    def _shared_payload(self, data: Any) -> Any:
+        """Wrap a received encoded message into a [SharedPayload][compas_eve.codecs.SharedPayload] with the codec it was encoded with."""
+        return self.codecs.shared_payload(data, self.codec)
+
+    def _unbatch(self, data: Any) -> Iterable[Any]:
+        """Split a received payload into the encoded messages it contains."""
+        if not is_batch(data):
+            return (data,)
+        try:
+            return unpack_batch(data)
+        except ValueError:
+            # Not a valid batch, so it must be a message that happens to start like one
+            return (data,)
+
+    def _payload_handler(self, topic: "Topic", callback: Callable) -> Callable:
+        """Wrap a subscription callback into a listener of received payloads.
+
+        Callbacks flagged with a ``decodes_payloads`` attribute receive the payload itself, and
+        decode it when and where they need it (e.g. on another thread). All others receive the
+        message decoded into the message type of the topic.
+        """
+        codec = self._topic_codec(topic)
+        if codec is not None:
+            # Registered codecs only decode messages for subscribers of wildcard topics or topics without codec
+            self.codecs.register(codec)
+
+        if codec is None:
+            if getattr(callback, "decodes_payloads", False):
+
+                def _local_callback(payload):
+                    callback(payload)
+
+            else:
+
+                def _local_callback(payload):
+                    callback(payload.decode(topic.message_type))
+
+        elif getattr(callback, "decodes_payloads", False):
+
+            def _local_callback(payload):
+                callback(payload.for_codec(codec))
+
+        else:
+
+            def _local_callback(payload):
+                callback(payload.for_codec(codec).decode(topic.message_type))
+
+        return _local_callback
 
     @property
     def id_counter(self) -> int:
@@ -61,6 +211,24 @@ class Transport(object):
     def publish(self, topic: "Topic", message: Union["Message", dict], **options: Any) -> None:
         pass
 
+    def publish_many(self, topic: "Topic", messages: Iterable[Union["Message", dict]], **options: Any) -> None:
+        """Publish several messages to a topic at once.
+
+        Transports supporting batching (see [compas_eve.batching][]) send them as a single payload.
+        By default, messages are published one by one.
+
+        Parameters
+        ----------
+        topic
+            Instance of the topic to publish to.
+        messages
+            Messages to publish, in order.
+        **options
+            Transport-specific options, as for ``publish``.
+        """
+        for message in messages:
+            self.publish(topic, message, **options)
+
     def subscribe(self, topic: "Topic", callback: Callable) -> Optional[str]:
         pass
 
@@ -91,7 +259,12 @@ class Message(object):
         return str(self.data)
 
     def __getattr__(self, name: str) -> Any:
-        return self.data[name]
+        # Look up `data` through __dict__ to avoid infinite recursion while
+        # the instance is being constructed (e.g. by `copy` or `pickle`)
+        try:
+            return self.__dict__["data"][name]
+        except KeyError:
+            raise AttributeError(name)
 
     def __setattr__(self, key: str, value: Any) -> None:
         if key == "data" or key in self.__dict__:
@@ -129,11 +302,12 @@ class Topic(object):
         a generic, non-typed checked message implementation.
         Defaults to [Message][].
     options
-        A dictionary of options.
+        A dictionary of options. ``codec`` sets the [MessageCodec][compas_eve.MessageCodec] of the
+        messages of the topic, instead of the codec of the transport (see [compas_eve.codecs.registry][]).
+        ``delta`` enables the delta encoding of consecutive messages, with a keyframe every
+        ``keyframe_interval`` messages (see [compas_eve.delta][]).
     """
 
-    # TODO: Add documentation/examples of possible options
-
     def __init__(self, name: str, message_type: Optional[Type[Message]] = None, **options: Any) -> None:
         self.name = name
         self.message_type = message_type or Message
@@ -150,12 +324,29 @@ class Publisher(object):
         will be created using the string as topic name.
     transport
         The transport to use for publishing. If not provided, the default transport will be used.
+    batch_size
+        If set, published messages are collected and sent in batches of up to this number of
+        messages (see [compas_eve.batching][]), which greatly reduces the overhead of publishing
+        many small messages. By default, every message is sent as soon as it is published.
+    linger
+        If set, published messages are collected for up to this time in seconds before being
+        sent as one batch. Can be combined with ``batch_size``, the batch is then sent as soon as
+        it is full or its first message has waited for ``linger`` seconds, whichever comes first.
     """
 
-    def __init__(self, topic: Union[Topic, str], transport: Optional[Transport] = None) -> None:
+    def __init__(self, topic: Union[Topic, str], transport: Optional[Transport] = None, batch_size: Optional[int] = None, linger: Optional[float] = None) -> None:
         self.topic = topic if isinstance(topic, Topic) else Topic(topic)
         self.transport = transport or get_default_transport()
+        self.batch_size = batch_size
+        self.linger = linger
         self._advertise_id = None
+        self._batcher = None
+        self._delta = None
+        self._resync_subscriber = None
+        if self.topic.options.get("delta"):
+            self._delta = DeltaEncoder(self.topic.options.get("keyframe_interval", DEFAULT_KEYFRAME_INTERVAL))
+        if batch_size is not None or linger is not None:
+            self._batcher = self._create_batcher()
 
     @property
     def is_advertised(self) -> bool:
@@ -187,23 +378,96 @@ class Publisher(object):
         if not self.is_advertised:
             self.advertise()
 
-        self.transport.publish(self.topic, message, **options)
+        published = self._published(message, options)
+
+        if self._batcher is None:
+            self.transport.publish(self.topic, published, **options)
+        elif options:
+            # Messages with options are sent on their own, after the ones already collected
+            self._batcher.flush()
+            self.transport.publish(self.topic, published, **options)
+        else:
+            self._batcher.add(published)
         self.message_published(message)
 
+    def publish_many(self, messages: Iterable[Union[Message, dict]], **options: Any) -> None:
+        """Publish several messages to the topic at once.
+
+        The messages are encoded and sent together as a single batch, but subscribers
+        still receive them individually, in order.
+
+        Parameters
+        ----------
+        messages
+            The messages to publish.
+        **options
+            Transport-specific options passed through to the underlying transport.
+        """
+        if not self.is_advertised:
+            self.advertise()
+
+        messages = list(messages)
+        if self._batcher is not None:
+            self._batcher.flush()
+        if messages:
+            published = messages
+            if self._delta is not None:
+                published = [self._delta.encode(message) for message in messages]
+            self.transport.publish_many(self.topic, published, **options)
+        for message in messages:
+            self.message_published(message)
+
+    def _published(self, message: Union[Message, dict], options: Dict[str, Any]) -> Union[Message, dict]:
+        # Message to send, i.e. its frame on delta topics
+        if self._delta is None:
+            return message
+        # Retained messages must be complete on their own
+        return self._delta.encode(message, keyframe=options.get("retain", False))
+
+    def flush(self) -> None:
+        """Send the messages collected for the current batch immediately, if the publisher batches messages."""
+        if self._batcher is not None:
+            self._batcher.flush()
+
+    def _create_batcher(self) -> Batcher:
+        return Batcher(self._publish_batch, self.batch_size, self.linger, name="compas_eve-publisher:{}".format(self.topic.name))
+
+    def _publish_batch(self, messages: List[Union[Message, dict]]) -> None:
+        self.transport.publish_many(self.topic, messages)
+
     def advertise(self) -> None:
         """Advertise the publisher for the topic."""
         if self.is_advertised:
             return
 
         self._advertise_id = self.transport.advertise(self.topic)
+        if self._batcher is None and (self.batch_size is not None or self.linger is not None):
+            self._batcher = self._create_batcher()
+        if self._delta is not None:
+            self._resync_subscriber = Subscriber(Topic(resync_topic_name(self.topic.name)), self._on_resync, transport=self.transport)
+            self._resync_subscriber.subscribe()
 
     def unadvertise(self) -> None:
-        """Unadvertise the publisher for the topic."""
+        """Unadvertise the publisher for the topic.
+
+        Messages collected for the current batch are sent first, and the background thread
+        sending lingering batches is stopped.
+        """
         if not self.is_advertised:
             return
 
+        if self._batcher is not None:
+            self._batcher.close()
+            self._batcher = None
         self.transport.unadvertise(self.topic)
         self._advertise_id = None
+        if self._resync_subscriber is not None:
+            self._resync_subscriber.unsubscribe()
+            self._resync_subscriber = None
+
+    def _on_resync(self, message: Message) -> None:
+        if message.publisher == self._delta.id:
+            self._delta.request_keyframe()
 
 
 class Subscriber(object):
@@ -216,32 +480,111 @@ class Subscriber(object):
         will be created using the string as topic name.
     transport
         The transport to use for subscribing. If not provided, the default transport will be used.
+    queue_size
+        If set, received messages are buffered in a bounded queue of this size and handed to
+        the subscriber by a dedicated thread, so that a slow subscriber does not hold up the
+        transport or other subscribers. By default, messages are handled directly on the
+        thread of the transport, without any queue.
+    overflow
+        Policy applied when the queue is full: ``"block"`` (default) waits for room,
+        ``"drop_oldest"`` discards the oldest pending message, ``"drop_newest"`` discards
+        the new message, and ``"keep_latest"`` only keeps the most recent pending message.
+        Only used if ``queue_size`` is set.
+    fields
+        If set, only these fields of received messages are decoded, and all others are discarded.
+        Messages are received as [LazyMessage][compas_eve.lazy.LazyMessage], so even the selected
+        fields are only decoded when they are accessed. Topics with a custom message type must derive
+        it from [LazyMessage][compas_eve.lazy.LazyMessage] to be subscribed to with fields.
+    executor
+        Where the callback runs (see [compas_eve.executors][]): ``"inline"`` (default) on the thread
+        of the transport, ``"thread"`` on a bounded thread pool shared by all subscribers, ``"process"``
+        on a shared process pool for CPU-heavy callbacks, on an asyncio event loop, or on any
+        [SubscriberExecutor][compas_eve.executors.SubscriberExecutor]. Cannot be combined with ``queue_size``.
+    ordered
+        If True (default), messages handed to the executor are handled one after the other, in the order
+        they were received on the topic. Otherwise, they may be handled concurrently, in any order.
     """
 
-    def __init__(self, topic: Union[Topic, str], callback: Optional[Callable] = None, transport: Optional[Transport] = None) -> None:
+    def __init__(
+        self,
+        topic: Union[Topic, str],
+        callback: Optional[Callable] = None,
+        transport: Optional[Transport] = None,
+        queue_size: Optional[int] = None,
+        overflow: str = "block",
+        fields: Optional[List[str]] = None,
+        executor: Union[str, SubscriberExecutor, Any, None] = None,
+        ordered: bool = True,
+    ) -> None:
+        if queue_size and executor not in (None, "inline"):
+            raise ValueError("Subscribers cannot have both a queue and an executor")
         self.transport = transport or get_default_transport()
         self.topic = topic if isinstance(topic, Topic) else Topic(topic)
+        if fields is not None:
+            from compas_eve.lazy import LazyMessage
+
+            message_type = self.topic.message_type
+            if message_type is Message:
+                message_type = LazyMessage
+            elif not issubclass(message_type, LazyMessage):
+                raise TypeError("Subscribers with fields require a message type derived from LazyMessage, got {}".format(message_type.__name__))
+            self.topic = Topic(self.topic.name, message_type.project(fields), **self.topic.options)
         self._subscribe_id = None
         self._callback = callback
-
-    def message_received(self, message: Union[Message, dict]) -> None:
+        self.queue_size = queue_size
+        self.overflow = overflow
+        self.queue = None
+        self.executor = get_executor(executor)
+        self.ordered = ordered
+        self._execution_stats = ExecutionStats()
+        self._delta = None
+        self._resync_publisher = None
+        if self.topic.options.get("delta"):
+            # Requests of subscribers of wildcard topics could not tell which topic needs a keyframe
+            request_keyframe = None if is_wildcard(self.topic.name) else self._request_keyframe
+            self._delta = DeltaDecoder(self.topic.message_type, request_keyframe)
+
+    def message_received(self, message: Union[Message, dict]) -> Any:
         """Handler called whenever a new message is received.
 
-        By default, this implementation will simply invoke the callback
-        used on init (if any), but sub-classes can override this behavior."""
+        By default, this implementation will simply invoke the callback used on init (if any)
+        and return its result, but sub-classes can override this behavior."""
         if self._callback:
-            self._callback(message)
+            return self._callback(message)
 
     @property
     def is_subscribed(self) -> bool:
         """Indicate if the instace is currently subscribed to its topic or not."""
         return self._subscribe_id is not None
 
+    @property
+    def stats(self) -> Dict[str, Any]:
+        """Metrics of the subscriber.
+
+        For subscribers with a queue, the metrics of the queue (see [SubscriberQueue][compas_eve.queues.SubscriberQueue]).
+        For subscribers with an executor other than inline, the number of received, delivered, failed and pending
+        messages, and the mean and maximum time in seconds that messages waited before being handled
+        (see [ExecutionStats][compas_eve.executors.ExecutionStats]). Empty otherwise.
+        """
+        if self.queue:
+            return self.queue.stats
+        if isinstance(self.executor, InlineExecutor):
+            return {}
+        return self._execution_stats.as_dict()
+
     def subscribe(self) -> None:
         if self._subscribe_id:
             return
 
-        self._subscribe_id = self.transport.subscribe(self.topic, self.message_received)
+        handler = self._message_handler()
+        if self._delta is not None:
+            self._deliver = handler
+            handler = self._receive_delta
+            if self._delta.request_keyframe is not None:
+                # Only advertised when the first keyframe is requested
+                self._resync_publisher = Publisher(Topic(resync_topic_name(self.topic.name)), transport=self.transport)
+
+        self._subscribe_id = self.transport.subscribe(self.topic, handler)
 
     def unsubscribe(self) -> None:
         """Unregister the subscriber from its topic."""
@@ -250,6 +593,49 @@ class Subscriber(object):
 
         self.transport.unsubscribe_by_id(self._subscribe_id)
         self._subscribe_id = None
+        if self.queue:
+            self.queue.close()
+        if self._resync_publisher is not None:
+            self._resync_publisher.unadvertise()
+            self._resync_publisher = None
+
+    def _message_handler(self) -> Callable:
+        # Handler of received messages, which are rebuilt from frames first on delta topics
+        if self.queue_size:
+            self.queue = SubscriberQueue(self.message_received, self.queue_size, self.overflow, name="compas_eve-subscriber:{}".format(self.topic.name))
+            return self.queue.put
+        if not isinstance(self.executor, InlineExecutor):
+            return self._submit
+        return self.message_received
+
+    def _submit(self, payload: Any) -> None:
+        # Payloads are decoded by the executor, not on the thread of the transport
+        if self._callback is not None or not self.executor.runs_in_process:
+            self.executor.submit(self.topic.name if self.ordered else None, self._handle_payload, payload, self._execution_stats)
+
+    # Receive payloads from the transport instead of decoded messages
+    _submit.decodes_payloads = True
+
+    def _handle_payload(self, payload: Any) -> Any:
+        # Payloads of delta topics are decoded by _receive_delta, in order, before they are submitted
+        message = payload if self._delta is not None else payload.decode(self.topic.message_type)
+        if self.executor.runs_in_process:
+            # Subscribers cannot be sent to other processes, only their callback
+            return self.executor.run_in_process(self._callback, message)
+        return self.message_received(message)
+
+    def _receive_delta(self, payload: Any) -> None:
+        message = self._delta.decode(payload.decode(self._delta.frame_type))
+        if message is not None:
+            self._deliver(message)
+
+    # Frames are rebuilt into messages on the thread of the transport, in the order they are received
+    _receive_delta.decodes_payloads = True
+
+    def _request_keyframe(self, publisher_id: str) -> None:
+        resync_publisher = self._resync_publisher
+        if resync_publisher is not None:
+            resync_publisher.publish(Message(publisher=publisher_id))
 
 
 class EchoSubscriber(Subscriber):
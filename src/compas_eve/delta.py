@@ -0,0 +1,295 @@
+"""
+Delta encoding of consecutive messages of a topic.
+
+Streams of robot states or scenes published at high rates usually change only a few fields
+from one message to the next. On topics created with the ``delta`` option, publishers send
+a full message (a keyframe) every ``keyframe_interval`` messages, and in between only the
+fields that changed since the previous message::
+
+    topic = Topic("/robot/state/", delta=True, keyframe_interval=100)
+
+Fields are compared deeply: nested dictionaries and COMPAS Data objects (e.g. meshes) only
+send the items of their data that changed. Lists and NumPy arrays are sent whole when any
+of their items changed.
+
+Subscribers of the topic, which must be created with the ``delta`` option as well, rebuild the
+full messages from the last keyframe and the following deltas, so their callbacks receive complete
+messages. When they miss a message (e.g. if they subscribed after the last keyframe), they
+discard the deltas until the next keyframe, and ask the publisher for one right away on the
+resync topic of the topic (see [resync_topic_name][compas_eve.delta.resync_topic_name]).
+Subscribers of wildcard topics do not ask for keyframes, they wait for the next one.
+
+Every message is sent as a frame, a dictionary holding the identifier of the publisher and
+the sequence number of the message, and either the data of the message (keyframe) or a patch
+(delta). A patch of a dictionary holds the items to set (``s``), the keys to delete (``d``)
+and the patches of nested dictionaries and COMPAS Data objects (``p``).
+
+Note
+----
+Messages rebuilt from deltas share unchanged fields with the previous messages of the topic,
+so they should be treated as read-only.
+"""
+
+import copy
+import threading
+import uuid
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import Optional
+from typing import Tuple
+
+from compas.data import Data
+
+try:
+    import numpy
+
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+__all__ = ["DeltaEncoder", "DeltaDecoder", "resync_topic_name", "RESYNC_TOPIC", "DEFAULT_KEYFRAME_INTERVAL"]
+
+#: Prefix of the names of the topics on which subscribers ask publishers for a keyframe.
+RESYNC_TOPIC = "/compas_eve/delta/resync/"
+
+#: Default number of messages between keyframes.
+DEFAULT_KEYFRAME_INTERVAL = 100
+
+FRAME_KEY = "__delta__"
+
+_IMMUTABLE_TYPES = (str, bytes, int, float, bool, type(None))
+
+_MISSING = object()
+
+
+class _DataState(object):
+    """Snapshot of a COMPAS Data object: its type and a snapshot of its data."""
+
+    __slots__ = ("cls", "data")
+
+    def __init__(self, cls: type, data: Dict[str, Any]) -> None:
+        self.cls = cls
+        self.data = data
+
+
+class _RawFrame(object):
+    """Message type decoding frames as plain dictionaries."""
+
+    @staticmethod
+    def parse(data: Any) -> Any:
+        return data
+
+
+def resync_topic_name(name: str) -> str:
+    """Name of the topic on which subscribers of a topic ask its publishers for a keyframe.
+
+    Parameters
+    ----------
+    name
+        Name of the topic.
+
+    Returns
+    -------
+    str
+        Name of the resync topic, under [RESYNC_TOPIC][compas_eve.delta.RESYNC_TOPIC].
+    """
+    return RESYNC_TOPIC + name.strip("/") + "/"
+
+
+def _message_data(message: Any) -> Dict[str, Any]:
+    if isinstance(message, dict):
+        return message
+    return message.__jsondump__()
+
+
+def _snapshot(value: Any) -> Any:
+    # Copy of a value, which is not affected by later changes made to the value in place
+    if isinstance(value, _IMMUTABLE_TYPES):
+        return value
+    if isinstance(value, dict):
+        return {key: _snapshot(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_snapshot(item) for item in value]
+    if isinstance(value, Data):
+        return _DataState(type(value), _snapshot(value.__data__))
+    if NUMPY_AVAILABLE and isinstance(value, numpy.ndarray):
+        return value.copy()
+    return copy.deepcopy(value)
+
+
+def _equal(a: Any, b: Any) -> bool:
+    # Equality of snapshots
+    if type(a) is not type(b):
+        return False
+    if isinstance(a, dict):
+        return a.keys() == b.keys() and all(_equal(item, b[key]) for key, item in a.items())
+    if isinstance(a, list):
+        return len(a) == len(b) and all(_equal(x, y) for x, y in zip(a, b))
+    if isinstance(a, _DataState):
+        return a.cls is b.cls and _equal(a.data, b.data)
+    if NUMPY_AVAILABLE and isinstance(a, numpy.ndarray):
+        return a.dtype == b.dtype and numpy.array_equal(a, b)
+    return a == b
+
+
+def _diff(old: Dict[str, Any], new: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """Patch turning the snapshot ``old`` into the dictionary ``new``, and the snapshot of ``new``."""
+    changed = {}
+    patches = {}
+    snapshot = {}
+    for key, value in new.items():
+        previous = old.get(key, _MISSING)
+        if isinstance(previous, dict) and isinstance(value, dict):
+            patch, snapshot[key] = _diff(previous, value)
+        elif isinstance(previous, _DataState) and type(value) is previous.cls:
+            patch, data = _diff(previous.data, value.__data__)
+            snapshot[key] = _DataState(previous.cls, data)
+        else:
+            patch = None
+            snapshot[key] = _snapshot(value)
+            if previous is _MISSING or not _equal(previous, snapshot[key]):
+                changed[key] = value
+        if patch:
+            patches[key] = patch
+
+    result = {}
+    if changed:
+        result["s"] = changed
+    deleted = [key for key in old if key not in new]
+    if deleted:
+        result["d"] = deleted
+    if patches:
+        result["p"] = patches
+    return result, snapshot
+
+
+def _apply_patch(value: Any, patch: Dict[str, Any]) -> Any:
+    """Apply a patch to a dictionary or COMPAS Data object, copying only what changes."""
+    if isinstance(value, Data):
+        return type(value).__from_data__(_apply_patch(value.__data__, patch))
+    result = dict(value)
+    for key in patch.get("d", ()):
+        result.pop(key, None)
+    for key, item in patch.get("p", {}).items():
+        result[key] = _apply_patch(result[key], item)
+    result.update(patch.get("s", {}))
+    return result
+
+
+class DeltaEncoder(object):
+    """Encodes consecutive messages of a publisher into keyframes and deltas.
+
+    Parameters
+    ----------
+    keyframe_interval
+        Number of messages between keyframes, i.e. ``1`` to only send keyframes. Defaults to 100.
+    """
+
+    def __init__(self, keyframe_interval: int = DEFAULT_KEYFRAME_INTERVAL) -> None:
+        if keyframe_interval < 1:
+            raise ValueError("Keyframe interval must be at least 1, got {}".format(keyframe_interval))
+        self.keyframe_interval = keyframe_interval
+        self.id = uuid.uuid4().hex[:12]
+        self.keyframes = 0
+        self.deltas = 0
+        self._seq = 0
+        self._snapshot = None
+        self._keyframe_requested = False
+        self._lock = threading.Lock()
+
+    def request_keyframe(self) -> None:
+        """Send the next message as a keyframe."""
+        self._keyframe_requested = True
+
+    def encode(self, message: Any, keyframe: bool = False) -> Dict[str, Any]:
+        """Encode a message into the frame to publish.
+
+        Parameters
+        ----------
+        message
+            Message to encode, a message or a dictionary.
+        keyframe
+            If True, the message is sent as a keyframe, e.g. because it is retained.
+
+        Returns
+        -------
+        dict
+            The frame.
+        """
+        data = _message_data(message)
+        with self._lock:
+            self._seq += 1
+            frame = {FRAME_KEY: [self.id, self._seq]}
+            if keyframe or self._keyframe_requested or self._snapshot is None or (self._seq - 1) % self.keyframe_interval == 0:
+                self._keyframe_requested = False
+                self._snapshot = _snapshot(data)
+                self.keyframes += 1
+                frame["k"] = data
+            else:
+                patch, self._snapshot = _diff(self._snapshot, data)
+                self.deltas += 1
+                frame["p"] = patch
+        return frame
+
+
+class DeltaDecoder(object):
+    """Rebuilds the messages of a topic from the frames of its publishers.
+
+    Parameters
+    ----------
+    message_type
+        Class of the rebuilt messages.
+    request_keyframe
+        Function invoked with the identifier of a publisher when a message was missed,
+        to ask that publisher for a keyframe. Invoked once until the next keyframe.
+    """
+
+    #: Message type decoding frames, to use when decoding payloads for [decode][compas_eve.delta.DeltaDecoder.decode].
+    frame_type = _RawFrame
+
+    def __init__(self, message_type: type, request_keyframe: Optional[Callable[[str], None]] = None) -> None:
+        self.message_type = message_type
+        self.request_keyframe = request_keyframe
+        self.gaps = 0
+        self._states = {}
+        self._lock = threading.Lock()
+
+    def decode(self, frame: Dict[str, Any]) -> Optional[Any]:
+        """Rebuild the message of a frame.
+
+        Parameters
+        ----------
+        frame
+            Decoded frame.
+
+        Returns
+        -------
+        object or None
+            The message, or None if the frame is a delta that cannot be applied because a previous message was missed.
+        """
+        publisher_id, seq = frame[FRAME_KEY]
+        with self._lock:
+            state = self._states.get(publisher_id)
+            if "k" in frame:
+                data = frame["k"]
+            elif state is not None and state[1] is not None and seq == state[0] + 1:
+                data = _apply_patch(state[1], frame["p"])
+            else:
+                # Skip deltas until the next keyframe, asking for it only once
+                self.gaps += 1
+                self._states[publisher_id] = (seq, None)
+                if state is None or state[1] is not None:
+                    request = self.request_keyframe
+                else:
+                    request = None
+                data = None
+
+            if data is not None:
+                self._states[publisher_id] = (seq, data)
+
+        if data is None:
+            if request is not None:
+                request(publisher_id)
+            return None
+        return self.message_type.parse(dict(data))
@@ -0,0 +1,154 @@
+import threading
+import traceback
+from collections import deque
+from typing import Any
+from typing import Callable
+from typing import Hashable
+from typing import Optional
+
+__all__ = ["ShardedDispatcher"]
+
+
+class _Shard(object):
+    """Bounded FIFO of tasks processed by a single worker thread."""
+
+    def __init__(self, dispatcher: "ShardedDispatcher", index: int, max_queue_size: int) -> None:
+        self.dispatcher = dispatcher
+        self.max_queue_size = max_queue_size
+        self.tasks = deque()
+        self.unfinished = 0
+        self.lock = threading.Lock()
+        self.not_empty = threading.Condition(self.lock)
+        self.not_full = threading.Condition(self.lock)
+        self.all_done = threading.Condition(self.lock)
+        self.thread = threading.Thread(target=self.run, name="{}-{}".format(dispatcher.name, index))
+        self.thread.daemon = True
+
+    def put(self, task: Any, block: bool = True, timeout: Optional[float] = None) -> bool:
+        with self.not_full:
+            # Tasks submitted from this shard's own worker are never blocked,
+            # otherwise a callback publishing on a full shard would deadlock
+            if self.max_queue_size and threading.current_thread() is not self.thread:
+                if not block:
+                    if len(self.tasks) >= self.max_queue_size:
+                        return False
+                elif not self.not_full.wait_for(lambda: len(self.tasks) < self.max_queue_size, timeout):
+                    return False
+            self.tasks.append(task)
+            self.unfinished += 1
+            self.not_empty.notify()
+            return True
+
+    def join(self) -> None:
+        with self.all_done:
+            self.all_done.wait_for(lambda: self.unfinished == 0)
+
+    def run(self) -> None:
+        while True:
+            with self.not_empty:
+                self.not_empty.wait_for(lambda: self.tasks)
+                task = self.tasks.popleft()
+                self.not_full.notify()
+
+            try:
+                if task is None:
+                    return
+                func, args = task
+                func(*args)
+            except Exception as exc:
+                self.dispatcher.on_error(exc)
+            finally:
+                with self.all_done:
+                    self.unfinished -= 1
+                    if self.unfinished == 0:
+                        self.all_done.notify_all()
+
+
+class ShardedDispatcher(object):
+    """Dispatches tasks on a pool of worker threads, partitioned by key.
+
+    All tasks submitted with the same key (e.g. the name of a topic) are assigned
+    to the same worker thread, and therefore run sequentially and in submission order,
+    while tasks with keys assigned to different workers run in parallel.
+
+    Parameters
+    ----------
+    workers
+        Number of worker threads. Defaults to 4.
+    max_queue_size
+        Maximum number of pending tasks per worker. When a worker queue is full,
+        [submit][compas_eve.dispatch.ShardedDispatcher.submit] blocks until there is room
+        again. Use ``0`` for unbounded queues. Defaults to 1024.
+    name
+        Prefix for the names of the worker threads.
+    """
+
+    def __init__(self, workers: int = 4, max_queue_size: int = 1024, name: str = "compas_eve-dispatch") -> None:
+        if workers < 1:
+            raise ValueError("ShardedDispatcher requires at least one worker, got {}".format(workers))
+        self.name = name
+        self._closed = False
+        self._shards = [_Shard(self, index, max_queue_size) for index in range(workers)]
+        for shard in self._shards:
+            shard.thread.start()
+
+    @property
+    def workers(self) -> int:
+        """Number of worker threads."""
+        return len(self._shards)
+
+    def queue_sizes(self) -> list:
+        """Number of pending tasks of each worker."""
+        return [len(shard.tasks) for shard in self._shards]
+
+    def submit(self, key: Hashable, func: Callable, *args: Any, block: bool = True, timeout: Optional[float] = None) -> bool:
+        """Schedule ``func(*args)`` on the worker assigned to ``key``.
+
+        Keyword arguments are options of the submission, use ``functools.partial`` to pass
+        keyword arguments to ``func``.
+
+        Parameters
+        ----------
+        key
+            Partitioning key. Tasks with equal keys run in submission order.
+        func
+            Function to invoke.
+        *args
+            Positional arguments of ``func``.
+        block
+            If True (default), wait for room when the queue of the worker is full.
+            Otherwise, the task is rejected immediately.
+        timeout
+            Maximum time in seconds to wait for room in the queue when blocking.
+
+        Returns
+        -------
+        bool
+            True if the task was scheduled, False if it was rejected because the queue was full.
+        """
+        if self._closed:
+            raise RuntimeError("Cannot submit tasks to a closed dispatcher")
+        shard = self._shards[hash(key) % len(self._shards)]
+        return shard.put((func, args), block=block, timeout=timeout)
+
+    def join(self) -> None:
+        """Wait until all tasks submitted so far have been processed."""
+        for shard in self._shards:
+            shard.join()
+
+    def close(self) -> None:
+        """Process pending tasks and stop all worker threads."""
+        if self._closed:
+            return
+        self._closed = True
+        for shard in self._shards:
+            shard.put(None, block=True)
+        for shard in self._shards:
+            if shard.thread is not threading.current_thread():
+                shard.thread.join()
+
+    def on_error(self, exc: Exception) -> None:
+        """Handler called when a task raises an exception.
+
+        By default, the traceback is printed to `stderr`, but sub-classes can override this behavior."""
+        traceback.print_exception(type(exc), exc, exc.__traceback__)
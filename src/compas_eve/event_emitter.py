@@ -39,7 +39,8 @@ except ImportError:
     ensure_future = None
 
 from collections import OrderedDict
-from collections import defaultdict
+from contextlib import contextmanager
+from threading import Lock
 from threading import RLock
 
 __all__ = ["EventEmitterMixin", "EventEmitterException"]
@@ -86,14 +87,53 @@ class EventEmitterMixin(object):
       and emitted under the ``error`` event. **This behavior for async
       functions is inconsistent with node.js**, which unlike this package has
       no facilities for handling returned Promises from handlers.
+
+    Listeners of each event are kept in an immutable snapshot that is replaced
+    as a whole whenever a listener is added or removed (copy-on-write), so
+    ``emit`` never takes a lock nor allocates to find its listeners. Changes
+    to the listeners are serialized with one lock per event, which is dropped
+    with the last listener of its event.
     """
 
     def __init__(self, *args, **kwargs):
         super(EventEmitterMixin, self).__init__(*args, **kwargs)
-        self._events = defaultdict(OrderedDict)
+        # Both maps are only ever updated by replacing their values, never
+        # by mutating them, so readers can use them without locking
+        self._events = {}
+        self._listeners = {}
         self._schedule = kwargs.get("scheduler", ensure_future)
         self._loop = kwargs.get("loop", None)
-        self._event_lock = RLock()
+        self._event_locks = {}
+        self._event_locks_lock = Lock()
+
+    def _get_event_lock(self, event):
+        lock = self._event_locks.get(event)
+        if lock is None:
+            with self._event_locks_lock:
+                lock = self._event_locks.setdefault(event, RLock())
+        return lock
+
+    @contextmanager
+    def _locked(self, event):
+        while True:
+            lock = self._get_event_lock(event)
+            with lock:
+                # The lock may have been dropped with the last listener of
+                # the event while waiting for it, then retry with a new one
+                if self._event_locks.get(event) is lock:
+                    yield
+                    return
+
+    def _set_handlers(self, event, handlers):
+        if handlers:
+            self._events[event] = handlers
+            self._listeners[event] = tuple(handlers.values())
+        else:
+            self._events.pop(event, None)
+            self._listeners.pop(event, None)
+            # Drop the lock too, so that events with dynamic names do not leak locks
+            with self._event_locks_lock:
+                self._event_locks.pop(event, None)
 
     def on(self, event, f=None):
         """Registers the function (or optionally an asyncio coroutine function)
@@ -123,26 +163,27 @@ class EventEmitterMixin(object):
         directly, as well as use them in remove_listener calls.
         """
 
-        with self._event_lock:
-
-            def _on(f):
-                self._add_event_handler(event, f, f)
-                return f
+        def _on(f):
+            self._add_event_handler(event, f, f)
+            return f
 
-            if f is None:
-                return _on
-            else:
-                return _on(f)
+        if f is None:
+            return _on
+        else:
+            return _on(f)
 
     def _add_event_handler(self, event, k, v):
-        # Fire 'new_listener' *before* adding the new listener!
-        self.emit("new_listener", event, k)
-
-        # Add the necessary function
-        # Note that k and v are the same for `on` handlers, but
-        # different for `once` handlers, where v is a wrapped version
-        # of k which removes itself before calling k
-        self._events[event][k] = v
+        with self._locked(event):
+            # Fire 'new_listener' *before* adding the new listener!
+            self.emit("new_listener", event, k)
+
+            # Add the necessary function
+            # Note that k and v are the same for `on` handlers, but
+            # different for `once` handlers, where v is a wrapped version
+            # of k which removes itself before calling k
+            handlers = OrderedDict(self._events.get(event, ()))
+            handlers[k] = v
+            self._set_handlers(event, handlers)
 
     def emit(self, event, *args, **kwargs):
         """Emit ``event``, passing ``*args`` and ``**kwargs`` to each attached
@@ -162,35 +203,36 @@ class EventEmitterMixin(object):
         """
         handled = False
 
-        with self._event_lock:
-            for f in list(self._events[event].values()):
-                result = f(*args, **kwargs)
-
-                # If f was a coroutine function, we need to schedule it and
-                # handle potential errors
-                if iscoroutine and iscoroutine(result):
-                    if self._loop:
-                        d = self._schedule(result, loop=self._loop)
-                    else:
-                        d = self._schedule(result)
-
-                    # scheduler gave us an asyncio Future
-                    if hasattr(d, "add_done_callback"):
-
-                        @d.add_done_callback
-                        def _callback(f):
-                            exc = f.exception()
-                            if exc:
-                                self.emit("error", exc)
+        # The snapshot is immutable, so listeners added or removed while
+        # emitting only take effect on the next emit
+        for f in self._listeners.get(event, ()):
+            result = f(*args, **kwargs)
+
+            # If f was a coroutine function, we need to schedule it and
+            # handle potential errors
+            if iscoroutine and iscoroutine(result):
+                if self._loop:
+                    d = self._schedule(result, loop=self._loop)
+                else:
+                    d = self._schedule(result)
+
+                # scheduler gave us an asyncio Future
+                if hasattr(d, "add_done_callback"):
+
+                    @d.add_done_callback
+                    def _callback(f):
+                        exc = f.exception()
+                        if exc:
+                            self.emit("error", exc)
 
-                    # scheduler gave us a twisted Deferred
-                    elif hasattr(d, "addErrback"):
+                # scheduler gave us a twisted Deferred
+                elif hasattr(d, "addErrback"):
 
-                        @d.addErrback
-                        def _callback(exc):
-                            self.emit("error", exc)
+                    @d.addErrback
+                    def _callback(exc):
+                        self.emit("error", exc)
 
-                handled = True
+            handled = True
 
         if not handled and event == "error":
             if args:
@@ -205,49 +247,58 @@ class EventEmitterMixin(object):
         removed after being called.
         """
 
-        with self._event_lock:
+        def _wrapper(f):
+            def g(*args, **kwargs):
+                # Concurrent emits may both see g in their snapshot,
+                # only the one that actually removes it calls f
+                if self.remove_listener(event, f) is None:
+                    return None
+                # f may return a coroutine, so we need to return that
+                # result here so that emit can schedule it
+                return f(*args, **kwargs)
 
-            def _wrapper(f):
-                def g(*args, **kwargs):
-                    self.remove_listener(event, f)
-                    # f may return a coroutine, so we need to return that
-                    # result here so that emit can schedule it
-                    return f(*args, **kwargs)
+            self._add_event_handler(event, f, g)
+            return f
 
-                self._add_event_handler(event, f, g)
-                return f
-
-            if f is None:
-                return _wrapper
-            else:
-                return _wrapper(f)
+        if f is None:
+            return _wrapper
+        else:
+            return _wrapper(f)
 
     def off(self, event, f):
         """Removes the function ``f`` from ``event``."""
-        with self._event_lock:
-            if f in self._events[event]:
-                return self._events[event].pop(f)
-
-        return None
+        return self.remove_listener(event, f)
 
     def remove_listener(self, event, f):
-        """Removes the function ``f`` from ``event``."""
-        with self._event_lock:
-            if f in self._events[event]:
-                return self._events[event].pop(f)
+        """Removes the function ``f`` from ``event``.
 
-        return None
+        Returns the removed listener, or ``None`` if ``f`` is not a listener
+        of ``event``, in which case nothing is removed.
+        """
+        if f not in self._events.get(event, ()):
+            return None
+
+        with self._locked(event):
+            handlers = self._events.get(event)
+            if handlers is None or f not in handlers:
+                return None
+
+            handlers = OrderedDict(handlers)
+            v = handlers.pop(f)
+            self._set_handlers(event, handlers)
+            return v
 
     def remove_all_listeners(self, event=None):
         """Remove all listeners attached to ``event``.
         If ``event`` is ``None``, remove all listeners on all events.
         """
-        with self._event_lock:
-            if event is not None:
-                self._events[event] = OrderedDict()
-            else:
-                self._events = defaultdict(OrderedDict)
+        if event is not None:
+            with self._locked(event):
+                self._set_handlers(event, None)
+        else:
+            for event in list(self._events):
+                self.remove_all_listeners(event)
 
     def listeners(self, event):
         """Returns a list of all listeners registered to the ``event``."""
-        return list(self._events[event].keys())
+        return list(self._events.get(event, ()))
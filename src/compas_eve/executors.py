@@ -0,0 +1,372 @@
+"""
+Execution policies deciding where subscriber callbacks run.
+
+By default, transports invoke subscriber callbacks on the thread delivering the message: the
+network thread of [MqttTransport][compas_eve.mqtt.MqttTransport] or
+[ZenohTransport][compas_eve.zenoh.ZenohTransport], or the thread of the publisher on
+[InMemoryTransport][compas_eve.InMemoryTransport]. A slow callback therefore holds up the
+delivery of every other message. Subscribers created with an ``executor`` hand their messages
+over to it instead, with the same behavior on every transport:
+
+- ``"inline"`` (default): callbacks run on the thread of the transport.
+- ``"thread"``: callbacks run on a bounded thread pool shared by all subscribers
+  (see [ThreadExecutor][compas_eve.executors.ThreadExecutor]).
+- ``"process"``: callbacks run on a process pool shared by all subscribers, for CPU-heavy callbacks
+  (see [ProcessExecutor][compas_eve.executors.ProcessExecutor]).
+- An asyncio event loop: callbacks, which can be coroutine functions, run on that loop
+  (see [LoopExecutor][compas_eve.executors.LoopExecutor]).
+- Any instance of [SubscriberExecutor][compas_eve.executors.SubscriberExecutor], e.g. a dedicated thread pool.
+
+Subscribers handle messages of their topic in order by default, and report how long messages
+waited before being handled in their [stats][compas_eve.Subscriber.stats].
+
+Examples
+--------
+>>> from compas_eve import Message, Publisher, Subscriber, Topic
+>>> topic = Topic("/compas_eve/executors/doctest/")
+>>> subscriber = Subscriber(topic, lambda msg: None, executor="thread")
+>>> subscriber.subscribe()
+>>> Publisher(topic).publish(Message(text="hello"))
+>>> subscriber.executor.join()
+>>> subscriber.stats["delivered"]
+1
+"""
+
+import asyncio
+import concurrent.futures
+import itertools
+import multiprocessing
+import os
+import threading
+import time
+import traceback
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import Hashable
+from typing import Optional
+from typing import Union
+
+from compas_eve.dispatch import ShardedDispatcher
+
+__all__ = ["SubscriberExecutor", "InlineExecutor", "ThreadExecutor", "ProcessExecutor", "LoopExecutor", "ExecutionStats", "get_executor"]
+
+
+def _process_context() -> Any:
+    # Forking a process while other threads are running (e.g. those of the transports) can deadlock
+    # the child on locks held by those threads, so processes are forked from a clean server process where possible
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("forkserver")
+    return multiprocessing.get_context()
+
+
+class ExecutionStats(object):
+    """Metrics of the messages handed over to an executor by one subscriber.
+
+    Queue wait is the time between the reception of a message and the start of its callback.
+    """
+
+    def __init__(self) -> None:
+        self.received = 0
+        self.delivered = 0
+        self.failed = 0
+        self.total_queue_wait = 0.0
+        self.max_queue_wait = 0.0
+        self._lock = threading.Lock()
+
+    def submitted(self) -> None:
+        with self._lock:
+            self.received += 1
+
+    def started(self, queue_wait: float) -> None:
+        with self._lock:
+            self.total_queue_wait += queue_wait
+            self.max_queue_wait = max(self.max_queue_wait, queue_wait)
+
+    def finished(self, failed: bool = False) -> None:
+        with self._lock:
+            self.delivered += 1
+            if failed:
+                self.failed += 1
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Metrics as a dictionary: number of received, delivered, failed and pending messages, and mean and maximum queue wait in seconds."""
+        with self._lock:
+            return dict(
+                received=self.received,
+                delivered=self.delivered,
+                failed=self.failed,
+                pending=self.received - self.delivered,
+                mean_queue_wait=self.total_queue_wait / self.delivered if self.delivered else 0.0,
+                max_queue_wait=self.max_queue_wait,
+            )
+
+
+class SubscriberExecutor(object):
+    """Base class for the execution policies of subscriber callbacks.
+
+    Sub-classes implement [submit][compas_eve.executors.SubscriberExecutor.submit], which
+    is called on the thread of the transport for every message.
+    """
+
+    #: True if callbacks run in another process, in which case they and the messages must be picklable.
+    runs_in_process = False
+
+    def submit(self, key: Optional[Hashable], func: Callable, message: Any, stats: ExecutionStats) -> None:
+        """Schedule ``func(message)``.
+
+        Parameters
+        ----------
+        key
+            Ordering key. Messages submitted with the same key are handled in submission order.
+            If None, messages can be handled in any order.
+        func
+            Function to invoke.
+        message
+            The received message.
+        stats
+            Metrics of the subscriber, updated when the message is handled.
+        """
+        raise NotImplementedError
+
+    def join(self) -> None:
+        """Wait until all messages submitted so far have been handled."""
+        pass
+
+    def close(self) -> None:
+        """Handle pending messages and release the resources of the executor."""
+        pass
+
+
+class InlineExecutor(SubscriberExecutor):
+    """Invokes callbacks directly, on the thread of the transport."""
+
+    def submit(self, key: Optional[Hashable], func: Callable, message: Any, stats: ExecutionStats) -> None:
+        stats.submitted()
+        stats.started(0.0)
+        try:
+            func(message)
+        except Exception:
+            stats.finished(failed=True)
+            raise
+        stats.finished()
+
+
+class ThreadExecutor(SubscriberExecutor):
+    """Invokes callbacks on a bounded pool of threads.
+
+    Messages with the same ordering key are always handled by the same thread, in order,
+    while messages without ordering key are spread over all threads.
+
+    Parameters
+    ----------
+    workers
+        Number of threads. Defaults to 4.
+    max_queue_size
+        Maximum number of pending messages per thread. When it is reached, the transport
+        waits until there is room again. Use ``0`` for unbounded queues. Defaults to 1024.
+    name
+        Prefix for the names of the threads.
+    """
+
+    def __init__(self, workers: int = 4, max_queue_size: int = 1024, name: str = "compas_eve-executor") -> None:
+        self._dispatcher = ShardedDispatcher(workers, max_queue_size, name=name)
+        self._counter = itertools.count()
+
+    @property
+    def workers(self) -> int:
+        """Number of threads."""
+        return self._dispatcher.workers
+
+    def submit(self, key: Optional[Hashable], func: Callable, message: Any, stats: ExecutionStats) -> None:
+        stats.submitted()
+        if key is None:
+            key = next(self._counter)
+        self._dispatcher.submit(key, self._run, func, message, stats, time.perf_counter())
+
+    def _run(self, func: Callable, message: Any, stats: ExecutionStats, submitted: float) -> None:
+        stats.started(time.perf_counter() - submitted)
+        try:
+            func(message)
+        except Exception:
+            stats.finished(failed=True)
+            raise
+        stats.finished()
+
+    def join(self) -> None:
+        self._dispatcher.join()
+
+    def close(self) -> None:
+        self._dispatcher.close()
+
+
+class ProcessExecutor(ThreadExecutor):
+    """Invokes callbacks on a pool of processes, for CPU-heavy callbacks.
+
+    Callbacks run outside of the subscribing process, so they and the messages must be
+    picklable (e.g. callbacks must be functions defined at the top level of a module), and
+    their side effects are not visible to the subscribing process. Sub-classes of
+    [Subscriber][compas_eve.Subscriber] overriding ``message_received`` are not supported.
+
+    Each process is fed by one thread of the subscribing process, which decodes messages and
+    waits for their callback to complete, so messages with the same ordering key are handled
+    one after the other, in order.
+
+    Parameters
+    ----------
+    workers
+        Number of processes. Defaults to the number of CPUs.
+    max_queue_size
+        Maximum number of pending messages per process. When it is reached, the transport
+        waits until there is room again. Use ``0`` for unbounded queues. Defaults to 1024.
+    mp_context
+        Multiprocessing context used to start the processes, see `concurrent.futures.ProcessPoolExecutor`.
+        Defaults to the ``"forkserver"`` start method where available.
+    """
+
+    runs_in_process = True
+
+    def __init__(self, workers: Optional[int] = None, max_queue_size: int = 1024, mp_context: Any = None) -> None:
+        workers = workers or os.cpu_count() or 1
+        super(ProcessExecutor, self).__init__(workers, max_queue_size, name="compas_eve-process-executor")
+        self._pool = concurrent.futures.ProcessPoolExecutor(workers, mp_context=mp_context or _process_context())
+
+    def run_in_process(self, func: Callable, message: Any) -> Any:
+        """Invoke ``func(message)`` on one of the processes, and wait for its result.
+
+        Parameters
+        ----------
+        func
+            Function to invoke, must be picklable.
+        message
+            The message, must be picklable.
+
+        Returns
+        -------
+        object
+            The result of the function.
+        """
+        return self._pool.submit(func, message).result()
+
+    def close(self) -> None:
+        super(ProcessExecutor, self).close()
+        self._pool.shutdown()
+
+
+class LoopExecutor(SubscriberExecutor):
+    """Invokes callbacks on an asyncio event loop.
+
+    Callbacks can be regular functions or coroutine functions. Coroutines of messages with the
+    same ordering key are awaited one after the other, in order, while coroutines of messages
+    without ordering key run concurrently.
+
+    Parameters
+    ----------
+    loop
+        The event loop to invoke callbacks on.
+    """
+
+    def __init__(self, loop: asyncio.AbstractEventLoop) -> None:
+        self.loop = loop
+        self._tails = {}
+        self._pending = 0
+        self._lock = threading.Lock()
+        self._idle = threading.Condition(self._lock)
+
+    def submit(self, key: Optional[Hashable], func: Callable, message: Any, stats: ExecutionStats) -> None:
+        stats.submitted()
+        with self._lock:
+            self._pending += 1
+        self.loop.call_soon_threadsafe(self._start, key, func, message, stats, time.perf_counter())
+
+    def _start(self, key: Optional[Hashable], func: Callable, message: Any, stats: ExecutionStats, submitted: float) -> None:
+        previous = self._tails.get(key) if key is not None else None
+        if previous is None:
+            task = self._invoke(func, message, stats, submitted)
+        else:
+            task = self.loop.create_task(self._invoke_after(previous, func, message, stats, submitted))
+
+        if task is None:
+            return
+        if key is not None:
+            self._tails[key] = task
+            task.add_done_callback(lambda task: self._tails.pop(key) if self._tails.get(key) is task else None)
+
+    def _invoke(self, func: Callable, message: Any, stats: ExecutionStats, submitted: float) -> Optional[asyncio.Future]:
+        stats.started(time.perf_counter() - submitted)
+        try:
+            result = func(message)
+        except Exception:
+            traceback.print_exc()
+            self._finished(stats, failed=True)
+            return None
+
+        if not asyncio.iscoroutine(result):
+            self._finished(stats)
+            return None
+        return self.loop.create_task(self._await(result, stats))
+
+    async def _invoke_after(self, previous: asyncio.Future, func: Callable, message: Any, stats: ExecutionStats, submitted: float) -> None:
+        await asyncio.wait([previous])
+        task = self._invoke(func, message, stats, submitted)
+        if task is not None:
+            await task
+
+    async def _await(self, coroutine: Any, stats: ExecutionStats) -> None:
+        try:
+            await coroutine
+        except Exception:
+            traceback.print_exc()
+            self._finished(stats, failed=True)
+        else:
+            self._finished(stats)
+
+    def _finished(self, stats: ExecutionStats, failed: bool = False) -> None:
+        stats.finished(failed)
+        with self._idle:
+            self._pending -= 1
+            if not self._pending:
+                self._idle.notify_all()
+
+    def join(self) -> None:
+        """Wait until all messages submitted so far have been handled.
+
+        Must not be called from the event loop itself, which would deadlock. Await
+        the handling of messages from the loop instead.
+        """
+        with self._idle:
+            self._idle.wait_for(lambda: not self._pending)
+
+
+_shared_executors = {}
+_shared_lock = threading.Lock()
+
+
+def get_executor(executor: Union[str, SubscriberExecutor, asyncio.AbstractEventLoop, None]) -> SubscriberExecutor:
+    """Get the executor for an execution policy.
+
+    Parameters
+    ----------
+    executor
+        ``"inline"`` or None, ``"thread"`` or ``"process"`` for executors shared by all
+        subscribers, an asyncio event loop, or an executor instance, which is returned as is.
+
+    Returns
+    -------
+    SubscriberExecutor
+        The executor.
+    """
+    if isinstance(executor, SubscriberExecutor):
+        return executor
+    if isinstance(executor, asyncio.AbstractEventLoop):
+        return LoopExecutor(executor)
+    if executor is None:
+        executor = "inline"
+
+    factories = dict(inline=InlineExecutor, thread=ThreadExecutor, process=ProcessExecutor)
+    if executor not in factories:
+        raise ValueError("Unknown executor {!r}, expected one of: {}, an event loop or an executor instance".format(executor, ", ".join(factories)))
+    with _shared_lock:
+        if executor not in _shared_executors:
+            _shared_executors[executor] = factories[executor]()
+        return _shared_executors[executor]
@@ -0,0 +1,188 @@
+"""
+Messages whose fields are only decoded when they are accessed.
+
+Decoding a message normally turns every COMPAS object it contains into a live instance,
+which for large objects (e.g. meshes) is far more expensive than parsing the message itself.
+A [LazyMessage][compas_eve.lazy.LazyMessage] keeps each top-level field in its parsed, raw
+form (plain dictionaries and lists) until it is accessed for the first time, so fields that
+are never read never cost anything beyond parsing.
+
+On top of that, a subscriber that only needs a few fields can declare them with
+``Subscriber(topic, callback, fields=["timestamp", "status"])``, and all other fields are
+discarded right after parsing, without ever being materialized.
+
+Lazy decoding is supported by [JsonMessageCodec][compas_eve.codecs.JsonMessageCodec],
+[FastJsonMessageCodec][compas_eve.codecs.FastJsonMessageCodec] and
+[MsgPackMessageCodec][compas_eve.codecs.MsgPackMessageCodec], also when they are wrapped by
+[CompressedMessageCodec][compas_eve.codecs.CompressedMessageCodec] or
+[StructMessageCodec][compas_eve.codecs.StructMessageCodec]. With other codecs, lazy messages
+are decoded eagerly, but projections still apply.
+"""
+
+import threading
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import FrozenSet
+from typing import Iterable
+from typing import List
+from typing import Optional
+from typing import Type
+
+from compas_eve.core import Message
+
+__all__ = ["LazyMessage"]
+
+
+def _identity(value: Any) -> Any:
+    return value
+
+
+class LazyMessage(Message):
+    """Message that decodes each of its fields the first time it is accessed.
+
+    Use it as ``message_type`` of a topic to decode messages lazily, or use
+    [project][compas_eve.lazy.LazyMessage.project] to create a lazy message type
+    that only keeps some fields.
+
+    Accessing ``data`` (e.g. to print or re-encode the message) materializes all fields.
+
+    Note
+    ----
+    Lazy messages are safe to share between subscribers on different threads: each field
+    is materialized only once, and the result is shared by all of them.
+    """
+
+    #: Names of the fields to keep, or None to keep all fields
+    __fields__: Optional[FrozenSet[str]] = None
+
+    _projections = {}
+    _projections_lock = threading.Lock()
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        self.__dict__["_raw"] = {}
+        self.__dict__["_revive"] = _identity
+        self.__dict__["_lock"] = threading.Lock()
+        super(LazyMessage, self).__init__(*args, **kwargs)
+
+    @classmethod
+    def project(cls, fields: Iterable[str]) -> Type["LazyMessage"]:
+        """Create a lazy message type that only keeps the given fields.
+
+        Types are cached, so projections on the same fields share one type, and
+        therefore one decoded message per received message.
+
+        Parameters
+        ----------
+        fields
+            Names of the fields to keep.
+
+        Returns
+        -------
+        type
+            Subclass of this message type.
+        """
+        fields = frozenset(fields)
+        key = (cls, fields)
+        projection = cls._projections.get(key)
+        if projection is None:
+            with cls._projections_lock:
+                projection = cls._projections.get(key)
+                if projection is None:
+                    name = "{}[{}]".format(cls.__name__, ",".join(sorted(fields)))
+                    projection = cls._projections[key] = type(name, (cls,), {"__fields__": fields})
+        return projection
+
+    @classmethod
+    def parse(cls, value: Dict[str, Any]) -> "LazyMessage":
+        """Create a message from already decoded values, keeping only the fields of the projection, if any."""
+        if cls.__fields__ is not None:
+            value = {key: item for key, item in value.items() if key in cls.__fields__}
+        return cls(**value)
+
+    @classmethod
+    def from_raw(cls, raw: Dict[str, Any], revive: Callable[[Any], Any]) -> "LazyMessage":
+        """Create a message from parsed but not yet decoded values.
+
+        This is meant to be used by codecs supporting lazy decoding.
+
+        Parameters
+        ----------
+        raw
+            Parsed values of the message, by field name.
+        revive
+            Function turning a parsed value into its final form, e.g. reconstructing COMPAS objects.
+
+        Returns
+        -------
+        LazyMessage
+            The message, with no field decoded yet.
+        """
+        if cls.__fields__ is not None:
+            raw = {key: item for key, item in raw.items() if key in cls.__fields__}
+        message = cls()
+        message.__dict__["_raw"] = raw
+        message.__dict__["_revive"] = revive
+        return message
+
+    @property
+    def data(self) -> Dict[str, Any]:
+        """All fields of the message, materializing the ones not yet decoded."""
+        for name in list(self._raw):
+            self._materialize(name)
+        return self.__dict__["_data"]
+
+    @data.setter
+    def data(self, value: Dict[str, Any]) -> None:
+        self.__dict__["_data"] = value
+
+    @property
+    def field_names(self) -> List[str]:
+        """Names of all fields of the message, without materializing them."""
+        return list(self.__dict__["_data"]) + list(self._raw)
+
+    @property
+    def materialized(self) -> List[str]:
+        """Names of the fields that have been decoded."""
+        return list(self.__dict__["_data"])
+
+    def _materialize(self, name: str) -> Any:
+        with self._lock:
+            data = self.__dict__["_data"]
+            if name in data:
+                return data[name]
+            value = data[name] = self._revive(self._raw[name])
+            del self._raw[name]
+            return value
+
+    def __getattr__(self, name: str) -> Any:
+        # Only called when normal attribute lookup fails
+        try:
+            return self.__dict__["_data"][name]
+        except KeyError:
+            pass
+        if name in self.__dict__.get("_raw", ()):
+            return self._materialize(name)
+        raise AttributeError(name)
+
+    def __setattr__(self, key: str, value: Any) -> None:
+        if key == "data" or key in self.__dict__:
+            object.__setattr__(self, key, value)
+        else:
+            self[key] = value
+
+    def __getitem__(self, key: str) -> Any:
+        try:
+            return self.__dict__["_data"][key]
+        except KeyError:
+            if key in self._raw:
+                return self._materialize(key)
+            raise
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        with self._lock:
+            self._raw.pop(key, None)
+            self.__dict__["_data"][key] = value
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.__dict__["_data"] or key in self._raw
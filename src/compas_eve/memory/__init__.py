@@ -1,12 +1,86 @@
+import copy
+from typing import Any
 from typing import Callable
+from typing import List
 from typing import Optional
+from typing import Union
+
 from compas_eve.codecs import MessageCodec
+from compas_eve.codecs import SharedPayload
+from compas_eve.codecs import _to_bytes
+from compas_eve.compact import CompactMessage
+from compas_eve.dispatch import ShardedDispatcher
 from compas_eve.event_emitter import EventEmitterMixin
+from compas_eve.memory.history import MessageHistory
+from compas_eve.structs import StructMessage
+from compas_eve.trie import TopicTrie
+from compas_eve.trie import is_wildcard
+from compas_eve.trie import topic_matches
 from compas_eve.core import Transport
 from compas_eve.core import Topic
 from compas_eve.core import Message
 
-__all__ = ["InMemoryTransport"]
+__all__ = ["InMemoryTransport", "ReferencePayload", "MessageHistory"]
+
+
+class ReferencePayload(object):
+    """Payload that carries a published object by reference instead of encoding it.
+
+    It exposes the same ``decode`` interface as [SharedPayload][compas_eve.codecs.SharedPayload],
+    but no codec is involved: the object is only converted to the requested message type.
+
+    Parameters
+    ----------
+    message
+        The published message object.
+    deepcopy
+        If True, every call to ``decode`` returns an independent deep copy of the message.
+        Otherwise, all callers requesting the same message type share one instance.
+    """
+
+    __slots__ = ("message", "deepcopy", "_decoded")
+
+    def __init__(self, message: Union[Message, dict, Any], deepcopy: bool = False) -> None:
+        self.message = copy.deepcopy(message) if deepcopy else message
+        self.deepcopy = deepcopy
+        self._decoded = {}
+
+    def for_codec(self, codec: MessageCodec) -> "ReferencePayload":
+        """Get the payload to decode with the codec of a topic, i.e. this payload, since it is not encoded."""
+        return self
+
+    def decode(self, message_type: type) -> Union[Message, dict, Any]:
+        """Convert the published object into the given message type.
+
+        Parameters
+        ----------
+        message_type
+            The message type class to use for parsing.
+
+        Returns
+        -------
+        Union[Message, dict, Any]
+            The message, as the same instance that was published whenever possible.
+        """
+        if self.deepcopy:
+            return _as_message_type(copy.deepcopy(self.message), message_type)
+
+        try:
+            return self._decoded[message_type]
+        except KeyError:
+            message = _as_message_type(self.message, message_type)
+            self._decoded[message_type] = message
+            return message
+
+
+def _as_message_type(message, message_type):
+    if isinstance(message, message_type):
+        return message
+    if isinstance(message, (Message, CompactMessage, StructMessage)):
+        return message_type.parse(message.data)
+    if hasattr(message, "__data__"):
+        return message
+    return message_type.parse(message)
 
 
 class InMemoryTransport(Transport, EventEmitterMixin):
@@ -14,17 +88,103 @@ class InMemoryTransport(Transport, EventEmitterMixin):
 
     It will only distribute messages within the same process, not across different processes.
 
+    Subscribers can use wildcards in topic names to receive messages from several topics, either
+    MQTT-style (``+`` for one level, ``#`` for any number of levels, e.g. ``robots/+/state``) or
+    Zenoh-style (``*`` and ``**``).
+
     Parameters
     ----------
     codec
         The codec to use for encoding and decoding messages.
         If not provided, defaults to [JsonMessageCodec][compas_eve.codecs.JsonMessageCodec].
+    passthrough
+        If True, messages are not serialized at all: subscribers receive the published
+        object by reference (converted to the message type of their topic if needed),
+        and the codec is not used. Publishers must not modify a message after publishing it,
+        and subscribers should treat received messages as read-only. Defaults to False.
+    deepcopy
+        Only used in passthrough mode. If True, each subscriber receives its own deep copy
+        of the published message, which isolates publishers and subscribers from each other's
+        modifications, at the cost of copying every message. Defaults to False.
+    workers
+        Number of worker threads used to deliver messages. If ``0`` (default), messages
+        are delivered synchronously on the publisher's thread. Otherwise, topics are
+        partitioned across a pool of worker threads: publishing returns as soon as
+        the message is queued, messages of one topic are still delivered in order,
+        and independent topics are delivered in parallel.
+    max_queue_size
+        Maximum number of pending messages per worker thread, only used if ``workers`` is
+        greater than zero. Publishing blocks while the queue is full. Use ``0`` for
+        unbounded queues. Defaults to 1024.
+    history_depth
+        Number of messages published with ``retain=True`` kept per topic and replayed,
+        from oldest to newest, to every new subscriber. Defaults to 1, i.e. only the last one.
+    history_topic_max_bytes
+        Maximum size in bytes of the encoded messages kept per topic. Unlimited by default.
+    history_max_bytes
+        Maximum size in bytes of the encoded messages kept across all topics. When exceeded,
+        the history of the least recently used topics is evicted. Unlimited by default.
+    **kwargs
+        Options of all transports, e.g. ``chunk_size`` to send large messages in chunks
+        (see [Transport][compas_eve.Transport]). Chunking is not used in passthrough mode.
     """
 
-    def __init__(self, codec: Optional[MessageCodec] = None, *args, **kwargs):
+    def __init__(
+        self,
+        codec: Optional[MessageCodec] = None,
+        passthrough: bool = False,
+        deepcopy: bool = False,
+        workers: int = 0,
+        max_queue_size: int = 1024,
+        history_depth: int = 1,
+        history_topic_max_bytes: Optional[int] = None,
+        history_max_bytes: Optional[int] = None,
+        *args,
+        **kwargs,
+    ):
         super(InMemoryTransport, self).__init__(codec=codec, *args, **kwargs)
+        self.passthrough = passthrough
+        self.deepcopy = deepcopy
         self._local_callbacks = {}
-        self._retained = {}
+        self.history = MessageHistory(history_depth, topic_max_bytes=history_topic_max_bytes, max_bytes=history_max_bytes)
+        self._subscriptions = TopicTrie()
+        self._dispatcher = ShardedDispatcher(workers, max_queue_size, name="compas_eve-memory") if workers else None
+
+    def close(self) -> None:
+        """Deliver pending messages and stop the worker threads, if any."""
+        if self._dispatcher:
+            self._dispatcher.close()
+
+    def flush(self) -> None:
+        """Wait until all messages published so far have been delivered to subscribers."""
+        if self._dispatcher:
+            self._dispatcher.join()
+
+    def _dispatch(self, topic_name: str, func: Callable, *args) -> None:
+        if self._dispatcher:
+            self._dispatcher.submit(topic_name, func, *args)
+        else:
+            func(*args)
+
+    def _replay(self, topic_name: str, callback: Callable) -> None:
+        for payload in self.history.get(topic_name):
+            self._dispatch(topic_name, callback, payload)
+
+    def _deliver(self, topic_name: str, payload: Any) -> None:
+        for pattern in self._subscriptions.match(topic_name):
+            self.emit("event:{}".format(pattern), payload)
+
+    def _receive(self, topic_name: str, data: bytes) -> None:
+        # Encoded payloads go through the same reassembly and unbatching as on networked transports
+        data = self._chunks.add(data, topic_name)
+        if data is None:
+            return
+        for encoded_message in self._unbatch(data):
+            self._deliver(topic_name, self._shared_payload(encoded_message))
+
+    def _deliver_all(self, topic_name: str, payloads: List[Any]) -> None:
+        for payload in payloads:
+            self._deliver(topic_name, payload)
 
     def on_ready(self, callback: Callable):
         """In-memory transport is always ready, it will immediately trigger the callback."""
@@ -40,20 +200,62 @@ class InMemoryTransport(Transport, EventEmitterMixin):
         message
             Instance of the message to publish.
         retain : bool, optional
-            If True, the last message on this topic is stored and delivered
+            If True, the message is stored in the history of the topic and delivered
             immediately to any new subscriber. Defaults to False.
         """
         retain = options.pop("retain", False)
         if options:
             raise TypeError("publish() got unexpected options for InMemoryTransport: {}".format(", ".join(options)))
-        event_key = "event:{}".format(topic.name)
 
         def _callback(**kwargs):
-            encoded_message = self.codec.encode(message)
-            encoded_message_bytes = encoded_message if isinstance(encoded_message, bytes) else encoded_message.encode("utf-8")
+            if self.passthrough:
+                payload = ReferencePayload(message, deepcopy=self.deepcopy)
+            else:
+                encoded_message = self._encode(topic, message)
+                payloads = self._split(encoded_message)
+                # Messages do not leave the process, so codecs decoding text get it as is, without a round trip through UTF-8
+                if not self.codec.decodes_str:
+                    encoded_message = _to_bytes(encoded_message)
+                if not isinstance(payloads, tuple):
+                    if retain:
+                        self.history.append(topic.name, self._shared_payload(encoded_message))
+                    for chunk in payloads:
+                        self._dispatch(topic.name, self._receive, topic.name, chunk)
+                    return
+                payload = self._shared_payload(encoded_message)
             if retain:
-                self._retained[topic.name] = encoded_message_bytes
-            self.emit(event_key, encoded_message_bytes)
+                # Keep only the encoded data in the history, not the messages decoded by subscribers
+                self.history.append(topic.name, payload if self.passthrough else SharedPayload(payload.payload, payload.codec))
+            self._dispatch(topic.name, self._deliver, topic.name, payload)
+
+        self.on_ready(_callback)
+
+    def publish_many(self, topic: Topic, messages: List[Message], **options):
+        """Publish several messages to a topic at once.
+
+        The messages are encoded as a single batch and delivered in order. In passthrough
+        mode, they are delivered together, without encoding.
+
+        Parameters
+        ----------
+        topic
+            Instance of the topic to publish to.
+        messages
+            Messages to publish, in order.
+        """
+        if options.pop("retain", False):
+            raise ValueError("Batches of messages cannot be retained, publish the message to retain on its own")
+        if options:
+            raise TypeError("publish_many() got unexpected options for InMemoryTransport: {}".format(", ".join(options)))
+        messages = list(messages)
+
+        def _callback(**kwargs):
+            if self.passthrough:
+                payloads = [ReferencePayload(message, deepcopy=self.deepcopy) for message in messages]
+                self._dispatch(topic.name, self._deliver_all, topic.name, payloads)
+            else:
+                for data in self._split(self._encode_batch(topic, messages)):
+                    self._dispatch(topic.name, self._receive, topic.name, data)
 
         self.on_ready(_callback)
 
@@ -65,7 +267,7 @@ class InMemoryTransport(Transport, EventEmitterMixin):
         Parameters
         ----------
         topic
-            Instance of the topic to subscribe to.
+            Instance of the topic to subscribe to. The topic name may contain wildcards.
         callback
             Callback to invoke whenever a new message arrives. The callback should
             receive only one `msg` argument, e.g. `lambda msg: print(msg)`.
@@ -78,14 +280,17 @@ class InMemoryTransport(Transport, EventEmitterMixin):
         event_key = "event:{}".format(topic.name)
         subscribe_id = "{}:{}".format(event_key, id(callback))
 
-        def _local_callback(msg):
-            message_obj = self.codec.decode(msg, topic.message_type)
-            callback(message_obj)
+        _local_callback = self._payload_handler(topic, callback)
 
         def _callback(**kwargs):
             self.on(event_key, _local_callback)
-            if topic.name in self._retained:
-                _local_callback(self._retained[topic.name])
+            self._subscriptions.add(topic.name)
+            if topic.name in self.history:
+                self._replay(topic.name, _local_callback)
+            elif is_wildcard(topic.name):
+                for topic_name in self.history.topics():
+                    if topic_matches(topic.name, topic_name):
+                        self._replay(topic_name, _local_callback)
 
         self._local_callbacks[subscribe_id] = _local_callback
 
@@ -100,6 +305,7 @@ class InMemoryTransport(Transport, EventEmitterMixin):
 
         callback = self._local_callbacks[subscribe_id]
         self.off(event_key, callback)
+        self._subscriptions.remove(topic_name)
         del self._local_callbacks[subscribe_id]
 
     def unsubscribe(self, topic: Topic):
@@ -113,6 +319,11 @@ class InMemoryTransport(Transport, EventEmitterMixin):
         """
         event_key = "event:{}".format(topic.name)
         self.remove_all_listeners(event_key)
+        self._subscriptions.remove(topic.name, all=True)
+
+        keys_to_remove = [k for k in self._local_callbacks.keys() if k.startswith(event_key + ":")]
+        for k in keys_to_remove:
+            del self._local_callbacks[k]
 
     def advertise(self, topic: Topic):
         """Announce this code will publish messages to the specified topic.
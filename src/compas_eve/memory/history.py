@@ -0,0 +1,142 @@
+import threading
+from collections import OrderedDict
+from collections import deque
+from typing import Any
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+__all__ = ["MessageHistory"]
+
+
+def payload_size(payload: Any) -> int:
+    """Size in bytes of the encoded data of a payload, or 0 if it is not encoded (e.g. passthrough)."""
+    data = getattr(payload, "payload", None)
+    if data is None:
+        return 0
+    if isinstance(data, str):
+        # Text of JSON codecs is kept as is, count the bytes it takes in UTF-8 like on the wire
+        return len(data) if data.isascii() else len(data.encode("utf-8"))
+    return memoryview(data).nbytes
+
+
+class MessageHistory(object):
+    """Bounded store of the last messages published on each topic.
+
+    Each topic keeps up to ``depth`` messages and, optionally, up to ``topic_max_bytes`` bytes,
+    dropping its oldest messages first. On top of that, ``max_bytes`` caps the memory used by
+    all topics together: when it is exceeded, whole topics are evicted, starting with the least
+    recently used one (i.e. the one that has not been written to or replayed for the longest time).
+
+    Sizes are measured on encoded payloads. Messages stored without encoding (passthrough mode)
+    count as zero bytes, so only the ``depth`` limit applies to them.
+
+    Parameters
+    ----------
+    depth
+        Maximum number of messages kept per topic. Defaults to 1.
+    topic_max_bytes
+        Maximum size in bytes of the messages kept per topic. The newest message of
+        a topic is always kept, even if it is larger. Unlimited by default.
+    max_bytes
+        Maximum size in bytes of the messages kept across all topics. Unlimited by default.
+    """
+
+    def __init__(self, depth: int = 1, topic_max_bytes: Optional[int] = None, max_bytes: Optional[int] = None) -> None:
+        if depth < 1:
+            raise ValueError("History depth must be at least 1, got {}".format(depth))
+        self.depth = depth
+        self.topic_max_bytes = topic_max_bytes
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self.evicted_topics = 0
+        self._topics = OrderedDict()
+        self._topic_bytes = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._topics)
+
+    def __contains__(self, topic_name: str) -> bool:
+        return topic_name in self._topics
+
+    def append(self, topic_name: str, payload: Any) -> None:
+        """Store a message of a topic, evicting older messages and topics as needed.
+
+        Parameters
+        ----------
+        topic_name
+            Name of the topic.
+        payload
+            Payload of the message.
+        """
+        size = payload_size(payload)
+        with self._lock:
+            messages = self._topics.get(topic_name)
+            if messages is None:
+                messages = self._topics[topic_name] = deque()
+                self._topic_bytes[topic_name] = 0
+            else:
+                self._topics.move_to_end(topic_name)
+
+            messages.append((payload, size))
+            self._topic_bytes[topic_name] += size
+            self.total_bytes += size
+
+            while len(messages) > self.depth or (self.topic_max_bytes is not None and len(messages) > 1 and self._topic_bytes[topic_name] > self.topic_max_bytes):
+                self._drop_oldest(topic_name)
+
+            if self.max_bytes is not None:
+                while self.total_bytes > self.max_bytes and self._topics:
+                    self._evict(next(iter(self._topics)))
+
+    def get(self, topic_name: str) -> List[Any]:
+        """Retrieve the stored messages of a topic, from oldest to newest, and mark it as recently used.
+
+        Parameters
+        ----------
+        topic_name
+            Name of the topic.
+
+        Returns
+        -------
+        list
+            Payloads of the stored messages.
+        """
+        with self._lock:
+            messages = self._topics.get(topic_name)
+            if messages is None:
+                return []
+            self._topics.move_to_end(topic_name)
+            return [payload for payload, _size in messages]
+
+    def topics(self) -> List[str]:
+        """Names of the topics with stored messages, from least to most recently used."""
+        with self._lock:
+            return list(self._topics)
+
+    def items(self) -> List[Tuple[str, List[Any]]]:
+        """Stored messages of all topics, from least to most recently used topic."""
+        with self._lock:
+            return [(topic_name, [payload for payload, _size in messages]) for topic_name, messages in self._topics.items()]
+
+    def clear(self, topic_name: Optional[str] = None) -> None:
+        """Remove the stored messages of one topic, or of all topics if no topic is given."""
+        with self._lock:
+            if topic_name is None:
+                self._topics.clear()
+                self._topic_bytes.clear()
+                self.total_bytes = 0
+            elif topic_name in self._topics:
+                self.total_bytes -= self._topic_bytes.pop(topic_name)
+                del self._topics[topic_name]
+
+    def _drop_oldest(self, topic_name: str) -> None:
+        _payload, size = self._topics[topic_name].popleft()
+        self._topic_bytes[topic_name] -= size
+        self.total_bytes -= size
+
+    def _evict(self, topic_name: str) -> None:
+        self.total_bytes -= self._topic_bytes.pop(topic_name)
+        del self._topics[topic_name]
+        self.evicted_topics += 1
@@ -2,6 +2,7 @@ import uuid
 from typing import Any
 from typing import Callable
 from typing import Dict
+from typing import List
 from typing import Optional
 
 import paho.mqtt.client as mqtt
@@ -11,6 +12,8 @@ from ..core import Message
 from ..core import Topic
 from ..core import Transport
 from ..event_emitter import EventEmitterMixin
+from ..trie import MQTT_WILDCARDS
+from ..trie import TopicTrie
 
 try:
     from paho.mqtt.enums import CallbackAPIVersion
@@ -23,6 +26,10 @@ except ImportError:
 class MqttTransport(Transport, EventEmitterMixin):
     """MQTT transport allows sending and receiving messages using an MQTT broker.
 
+    Subscribers can use MQTT wildcards in topic names to receive messages from several topics
+    (``+`` for one level, ``#`` for any number of levels, e.g. ``robots/+/state``). As in MQTT,
+    ``*`` and ``**`` are ordinary topic levels, not wildcards.
+
     Parameters
     ----------
     host
@@ -42,6 +49,9 @@ class MqttTransport(Transport, EventEmitterMixin):
     codec
         The codec to use for encoding and decoding messages.
         If not provided, defaults to [JsonMessageCodec][compas_eve.codecs.JsonMessageCodec].
+    **kwargs
+        Options of all transports, e.g. ``chunk_size`` to send large messages in chunks
+        that fit the limits of the broker (see [Transport][compas_eve.Transport]).
     """
 
     def __init__(
@@ -61,6 +71,9 @@ class MqttTransport(Transport, EventEmitterMixin):
         self.port = port
         self._is_connected = False
         self._local_callbacks = {}
+        self._subscriptions = TopicTrie(MQTT_WILDCARDS)
+        # Copies of the last message of each topic still expected from the broker
+        self._duplicates = {}
         # Generate client ID if not provided
         if client_id is None:
             client_id = "compas_eve_{}".format(uuid.uuid4().hex[:8])
@@ -112,9 +125,38 @@ class MqttTransport(Transport, EventEmitterMixin):
         if options:
             raise TypeError("publish() got unexpected options for MqttTransport: {}".format(", ".join(options)))
 
+        encoded_message = self._encode(topic, message)
+        payloads = self._split(encoded_message)
+        if retain and not isinstance(payloads, tuple):
+            # The broker would only retain the last chunk
+            raise ValueError("Messages larger than the chunk size cannot be retained")
+
+        def _callback(**kwargs):
+            for payload in payloads:
+                self.client.publish(topic.name, payload, retain=retain)
+
+        self.on_ready(_callback)
+
+    def publish_many(self, topic: Topic, messages: List[Message], **options):
+        """Publish several messages to a topic at once, as a single MQTT message.
+
+        Parameters
+        ----------
+        topic
+            Instance of the topic to publish to.
+        messages
+            Messages to publish, in order.
+        """
+        if options.pop("retain", False):
+            raise ValueError("Batches of messages cannot be retained, publish the message to retain on its own")
+        if options:
+            raise TypeError("publish_many() got unexpected options for MqttTransport: {}".format(", ".join(options)))
+
+        payloads = self._split(self._encode_batch(topic, list(messages)))
+
         def _callback(**kwargs):
-            encoded_message = self.codec.encode(message)
-            self.client.publish(topic.name, encoded_message, retain=retain)
+            for payload in payloads:
+                self.client.publish(topic.name, payload)
 
         self.on_ready(_callback)
 
@@ -126,7 +168,7 @@ class MqttTransport(Transport, EventEmitterMixin):
         Parameters
         ----------
         topic
-            Instance of the topic to subscribe to.
+            Instance of the topic to subscribe to. The topic name may contain wildcards.
         callback
             Callback to invoke whenever a new message arrives. The callback should
             receive only one `msg` argument, e.g. `lambda msg: print(msg)`.
@@ -139,9 +181,7 @@ class MqttTransport(Transport, EventEmitterMixin):
         event_key = "event:{}".format(topic.name)
         subscribe_id = "{}:{}".format(event_key, id(callback))
 
-        def _local_callback(msg):
-            message_obj = self.codec.decode(msg.payload, topic.message_type)
-            callback(message_obj)
+        _local_callback = self._payload_handler(topic, callback)
 
         def _subscribe_callback(**kwargs):
             self.client.subscribe(topic.name)
@@ -150,6 +190,7 @@ class MqttTransport(Transport, EventEmitterMixin):
             if not self.client.on_message:
                 self.client.on_message = self._on_message
 
+            self._subscriptions.add(topic.name)
             self.on(event_key, _local_callback)
 
         self._local_callbacks[subscribe_id] = _local_callback
@@ -159,8 +200,38 @@ class MqttTransport(Transport, EventEmitterMixin):
         return subscribe_id
 
     def _on_message(self, client, userdata, msg):
-        event_key = "event:{}".format(msg.topic)
-        self.emit(event_key, msg)
+        # Deliver to every local subscription matching the topic, including wildcard ones,
+        # all of them sharing the same payload so that it is decoded only once
+        patterns = self._subscriptions.match(msg.topic)
+        if not msg.retain and self._is_duplicate(msg, patterns):
+            return
+        data = self._chunks.add(msg.payload, msg.topic)
+        if data is None:
+            return
+        for encoded_message in self._unbatch(data):
+            payload = self._shared_payload(encoded_message)
+            for pattern in patterns:
+                self.emit("event:{}".format(pattern), payload)
+
+    def _is_duplicate(self, msg, patterns) -> bool:
+        # Brokers may send a copy of a message for each subscription of the client matching its topic,
+        # e.g. when subscribed to both "robots/r1/state" and "robots/+/state". The first copy is
+        # delivered to all matching local subscriptions, and the other copies are discarded.
+        # Retained messages are sent for one new subscription at a time, so they are never counted.
+        pending = self._duplicates.get(msg.topic)
+        if pending is not None and pending[0] == msg.payload:
+            if pending[1] > 1:
+                self._duplicates[msg.topic] = (msg.payload, pending[1] - 1)
+            else:
+                del self._duplicates[msg.topic]
+            return True
+
+        copies = len(patterns)
+        if copies > 1:
+            self._duplicates[msg.topic] = (msg.payload, copies - 1)
+        elif pending is not None:
+            del self._duplicates[msg.topic]
+        return False
 
     def advertise(self, topic: Topic) -> str:
         """Announce this code will publish messages to the specified topic.
@@ -207,7 +278,10 @@ class MqttTransport(Transport, EventEmitterMixin):
 
         callback = self._local_callbacks[subscribe_id]
         self.off(event_key, callback)
-        self.client.unsubscribe(topic_name)
+        self._subscriptions.remove(topic_name)
+        # Other local subscribers might still need the broker subscription
+        if topic_name not in self._subscriptions:
+            self.client.unsubscribe(topic_name)
 
         del self._local_callbacks[subscribe_id]
 
@@ -219,4 +293,5 @@ class MqttTransport(Transport, EventEmitterMixin):
         topic
             Instance of the topic to unsubscribe from.
         """
+        self._subscriptions.remove(topic.name, all=True)
         self.client.unsubscribe(topic.name)
@@ -0,0 +1,272 @@
+"""
+Offloading of CPU-heavy decoding to worker processes.
+
+Decoding a large COMPAS data structure (e.g. a ``Mesh`` with hundreds of thousands of vertices)
+takes hundreds of milliseconds, during which the decoding thread holds the GIL, and every other
+thread of the process (other subscribers, the network thread of the transport) is frozen.
+[OffloadCodec][compas_eve.offload.OffloadCodec] wraps another codec, and decodes large messages
+in a pool of worker processes instead, while the calling thread waits without holding the GIL.
+Small messages are still decoded in-process, where they are cheapest.
+
+Payloads are handed over to the workers through shared memory, and results travel back
+pickled with protocol 5, with their out-of-band buffers (e.g. NumPy arrays) in shared memory,
+so that they are not copied through the pipes of the process pool.
+
+A codec call waits for its worker, so messages are still delivered in order. To decode the messages
+of several topics in parallel, combine it with subscribers running on a thread pool (see
+[compas_eve.executors][]): each of them waits for its own worker, and keeps the messages of its topic in order.
+
+Examples
+--------
+>>> from compas_eve import InMemoryTransport, Subscriber
+>>> from compas_eve.codecs import FastJsonMessageCodec
+>>> codec = OffloadCodec(FastJsonMessageCodec(), threshold=1024 * 1024)
+>>> transport = InMemoryTransport(codec=codec)
+>>> subscriber = Subscriber("/geometry/scan/", print, transport=transport, executor="thread")
+"""
+
+import concurrent.futures
+import os
+import pickle
+import threading
+from multiprocessing import resource_tracker
+from multiprocessing import shared_memory
+from typing import Any
+from typing import List
+from typing import Optional
+from typing import Sequence
+from typing import Tuple
+from typing import Union
+
+from compas_eve.codecs import MessageCodec
+from compas_eve.codecs import _is_lazy
+from compas_eve.core import Message
+from compas_eve.executors import _process_context
+
+__all__ = ["OffloadCodec", "DEFAULT_THRESHOLD"]
+
+#: Default size in bytes from which payloads are decoded in worker processes.
+DEFAULT_THRESHOLD = 1024 * 1024
+
+# Shared memory blocks are only unlinked explicitly on POSIX, on other platforms
+# they disappear with their last handle, so buffers are sent through the pipes instead
+_USE_SHARED_MEMORY = os.name == "posix"
+
+_worker_codec = None
+
+
+def _send(buffers: Sequence[Any]) -> Tuple:
+    """Hand buffers over to another process, which must [receive][compas_eve.offload._receive] them exactly once."""
+    views = [memoryview(buffer).cast("B") for buffer in buffers]
+    if not _USE_SHARED_MEMORY:
+        return (None, [view.tobytes() for view in views])
+
+    sizes = [view.nbytes for view in views]
+    shm = shared_memory.SharedMemory(create=True, size=max(sum(sizes), 1))
+    try:
+        # The receiving process unlinks the block
+        resource_tracker.unregister(shm._name, "shared_memory")
+        offset = 0
+        for view, size in zip(views, sizes):
+            shm.buf[offset : offset + size] = view
+            offset += size
+    finally:
+        shm.close()
+    return (shm.name, sizes)
+
+
+def _receive(handle: Tuple) -> List[memoryview]:
+    name, sizes = handle
+    if name is None:
+        return [memoryview(buffer) for buffer in sizes]
+
+    # Copy the buffers out once, so that the block can be released right away
+    shm = shared_memory.SharedMemory(name=name)
+    try:
+        with shm.buf[: sum(sizes)] as view:
+            data = memoryview(bytearray(view))
+    finally:
+        shm.close()
+        shm.unlink()
+
+    buffers = []
+    offset = 0
+    for size in sizes:
+        buffers.append(data[offset : offset + size])
+        offset += size
+    return buffers
+
+
+def _release(handle: Tuple) -> None:
+    """Release buffers handed over with [_send][compas_eve.offload._send] that will not be received, e.g. after a worker failure."""
+    name, _sizes = handle
+    if name is None:
+        return
+    try:
+        shm = shared_memory.SharedMemory(name=name)
+    except FileNotFoundError:
+        # Already received
+        return
+    shm.close()
+    shm.unlink()
+
+
+def _send_object(obj: Any) -> Tuple:
+    buffers = []
+    data = pickle.dumps(obj, protocol=5, buffer_callback=buffers.append)
+    return _send([data] + [buffer.raw() for buffer in buffers])
+
+
+def _receive_object(handle: Tuple) -> Any:
+    buffers = _receive(handle)
+    return pickle.loads(buffers[0], buffers=buffers[1:])
+
+
+def _init_worker(codec: MessageCodec) -> None:
+    global _worker_codec
+    _worker_codec = codec
+
+
+def _decode_in_worker(handle: Tuple, message_type: type) -> Tuple:
+    (data,) = _receive(handle)
+    return _send_object(_worker_codec.decode(data, message_type))
+
+
+class OffloadCodec(MessageCodec):
+    """Codec extension that decodes large messages in worker processes.
+
+    Payloads of at least ``threshold`` bytes are decoded by the wrapped codec in a worker process,
+    smaller ones are decoded directly by the wrapped codec. Messages are always encoded in-process:
+    handing a message over to a worker process requires pickling it, which costs about as much as encoding it.
+
+    The wrapped codec is sent once to every worker process, so it must be picklable, as are all
+    codecs of compas_eve. Decoded messages must be picklable too, which is the case of messages,
+    COMPAS Data objects and NumPy arrays. Message types that cannot be pickled (e.g. classes defined
+    inside a function) and [LazyMessage][compas_eve.lazy.LazyMessage] are always decoded in-process.
+
+    The worker processes are started on the first offloaded message.
+
+    Parameters
+    ----------
+    codec
+        The codec used to encode and decode messages.
+        If not provided, defaults to [JsonMessageCodec][compas_eve.codecs.JsonMessageCodec].
+    threshold
+        Size in bytes from which payloads are decoded in worker processes. Defaults to 1 MiB.
+    workers
+        Number of worker processes. Defaults to the number of CPUs.
+    mp_context
+        Multiprocessing context used to start the workers, see `concurrent.futures.ProcessPoolExecutor`.
+        Defaults to the ``"forkserver"`` start method where available.
+    """
+
+    def __init__(self, codec: Optional[MessageCodec] = None, threshold: int = DEFAULT_THRESHOLD, workers: Optional[int] = None, mp_context: Any = None) -> None:
+        super(OffloadCodec, self).__init__()
+        from compas_eve.codecs import JsonMessageCodec
+
+        self.codec = codec or JsonMessageCodec()
+        self.threshold = threshold
+        self.workers = workers or os.cpu_count() or 1
+        self.mp_context = mp_context
+        self.offloaded_decodes = 0
+        self._pool = None
+        self._lock = threading.Lock()
+        self._picklable_types = {}
+
+    @property
+    def references_payload(self) -> bool:
+        return self.codec.references_payload
+
+    @property
+    def content_type(self) -> Optional[str]:
+        # Offloading does not change the encoding
+        return self.codec.content_type
+
+    def _get_pool(self) -> concurrent.futures.ProcessPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                self._pool = concurrent.futures.ProcessPoolExecutor(
+                    self.workers, mp_context=self.mp_context or _process_context(), initializer=_init_worker, initargs=(self.codec,)
+                )
+            return self._pool
+
+    def _can_offload(self, message_type: type) -> bool:
+        try:
+            return self._picklable_types[message_type]
+        except KeyError:
+            try:
+                pickle.dumps(message_type)
+                picklable = not _is_lazy(message_type)
+            except Exception:
+                picklable = False
+            self._picklable_types[message_type] = picklable
+            return picklable
+
+    def encode(self, message: Union[Message, dict, Any]) -> Union[bytes, str]:
+        """Encode a message with the wrapped codec.
+
+        Parameters
+        ----------
+        message
+            Message to encode.
+
+        Returns
+        -------
+        Union[bytes, str]
+            Encoded message, as returned by the wrapped codec.
+        """
+        return self.codec.encode(message)
+
+    def encode_buffers(self, message: Union[Message, dict, Any]) -> List[Union[bytes, memoryview]]:
+        """Encode a message to a sequence of buffers with the wrapped codec.
+
+        Parameters
+        ----------
+        message
+            Message to encode.
+
+        Returns
+        -------
+        list
+            Buffers of the encoded message, as returned by the wrapped codec.
+        """
+        return self.codec.encode_buffers(message)
+
+    def decode(self, encoded_data: bytes, message_type: type) -> Union[Message, dict, Any]:
+        """Decode a payload with the wrapped codec, in a worker process if it is large.
+
+        Parameters
+        ----------
+        encoded_data
+            Encoded message.
+        message_type
+            The message type class to use for parsing.
+
+        Returns
+        -------
+        Union[Message, dict, Any]
+            Decoded message.
+        """
+        if len(encoded_data) < self.threshold or not self._can_offload(message_type):
+            return self.codec.decode(encoded_data, message_type)
+
+        payload_handle = _send([encoded_data])
+        try:
+            handle = self._get_pool().submit(_decode_in_worker, payload_handle, message_type).result()
+        except BaseException:
+            # The worker may have failed (or never started) before receiving the payload
+            _release(payload_handle)
+            raise
+        with self._lock:
+            self.offloaded_decodes += 1
+        return _receive_object(handle)
+
+    def close(self) -> None:
+        """Stop the worker processes."""
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown()
+
+    def __reduce__(self) -> Tuple[type, tuple]:
+        return type(self), (self.codec, self.threshold, self.workers, self.mp_context)
@@ -0,0 +1,181 @@
+import threading
+import traceback
+from collections import deque
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import Optional
+
+__all__ = ["SubscriberQueue", "BLOCK", "DROP_OLDEST", "DROP_NEWEST", "KEEP_LATEST"]
+
+BLOCK = "block"
+DROP_OLDEST = "drop_oldest"
+DROP_NEWEST = "drop_newest"
+KEEP_LATEST = "keep_latest"
+
+POLICIES = (BLOCK, DROP_OLDEST, DROP_NEWEST, KEEP_LATEST)
+
+
+class SubscriberQueue(object):
+    """Bounded queue of messages between a transport and a subscriber.
+
+    Messages are put on the queue by the thread of the transport, and handed to the subscriber
+    by a dedicated worker thread, so that a slow subscriber never holds up the transport nor any
+    other subscriber. When the queue is full, the overflow policy decides what happens:
+
+    - ``"block"``: the transport waits until there is room in the queue.
+    - ``"drop_oldest"``: the oldest pending message is discarded to make room for the new one.
+    - ``"drop_newest"``: the new message is discarded.
+    - ``"keep_latest"``: only the most recent message is kept pending, regardless of ``max_size``.
+      This is ideal for displays and other consumers that only care about the current state.
+
+    Parameters
+    ----------
+    handler
+        Function invoked with each message, on the worker thread.
+    max_size
+        Maximum number of pending messages. Defaults to 100.
+    policy
+        Overflow policy, one of ``"block"``, ``"drop_oldest"``, ``"drop_newest"`` or ``"keep_latest"``.
+        Defaults to ``"block"``.
+    name
+        Name of the worker thread.
+    """
+
+    def __init__(self, handler: Callable, max_size: int = 100, policy: str = BLOCK, name: Optional[str] = None) -> None:
+        if policy not in POLICIES:
+            raise ValueError("Unknown overflow policy {!r}, expected one of: {}".format(policy, ", ".join(POLICIES)))
+        if max_size < 1:
+            raise ValueError("Queue size must be at least 1, got {}".format(max_size))
+        self.handler = handler
+        self.max_size = 1 if policy == KEEP_LATEST else max_size
+        self.policy = policy
+        self.received = 0
+        self.delivered = 0
+        self.failed = 0
+        self.dropped = 0
+        self.max_depth = 0
+
+        self._messages = deque()
+        self._closed = False
+        self._lock = threading.Lock()
+        self._not_empty = threading.Condition(self._lock)
+        self._not_full = threading.Condition(self._lock)
+        self._all_done = threading.Condition(self._lock)
+        self._in_progress = 0
+        self._thread = threading.Thread(target=self._run, name=name or "compas_eve-subscriber")
+        self._thread.daemon = True
+        self._thread.start()
+
+    @property
+    def depth(self) -> int:
+        """Number of pending messages."""
+        return len(self._messages)
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        """Metrics of the queue: number of received, delivered, failed and dropped messages, and current and maximum depth.
+
+        Messages whose handler raised an exception are counted as failed, not as delivered.
+        """
+        return dict(
+            received=self.received,
+            delivered=self.delivered,
+            failed=self.failed,
+            dropped=self.dropped,
+            depth=self.depth,
+            max_depth=self.max_depth,
+            max_size=self.max_size,
+            policy=self.policy,
+        )
+
+    def put(self, message: Any) -> bool:
+        """Queue a message, applying the overflow policy if the queue is full.
+
+        Parameters
+        ----------
+        message
+            Message to queue.
+
+        Returns
+        -------
+        bool
+            True if the message was queued, False if it was dropped.
+        """
+        with self._not_full:
+            if self._closed:
+                return False
+            self.received += 1
+
+            if len(self._messages) >= self.max_size:
+                if self.policy == BLOCK:
+                    # The worker thread must never wait on itself
+                    if threading.current_thread() is not self._thread:
+                        self._not_full.wait_for(lambda: len(self._messages) < self.max_size or self._closed)
+                    if self._closed:
+                        self.dropped += 1
+                        return False
+                elif self.policy == DROP_NEWEST:
+                    self.dropped += 1
+                    return False
+                else:
+                    # Both drop_oldest and keep_latest discard from the head
+                    while len(self._messages) >= self.max_size:
+                        self._messages.popleft()
+                        self.dropped += 1
+
+            self._messages.append(message)
+            self.max_depth = max(self.max_depth, len(self._messages))
+            self._not_empty.notify()
+            return True
+
+    def join(self, timeout: Optional[float] = None) -> bool:
+        """Wait until all pending messages have been handled.
+
+        Parameters
+        ----------
+        timeout
+            Maximum time to wait, in seconds.
+
+        Returns
+        -------
+        bool
+            True if the queue was drained, False if the timeout expired.
+        """
+        with self._all_done:
+            return self._all_done.wait_for(lambda: not self._messages and not self._in_progress, timeout)
+
+    def close(self) -> None:
+        """Stop the worker thread once the messages already queued have been handled.
+
+        New messages are rejected after closing.
+        """
+        with self._lock:
+            self._closed = True
+            self._not_empty.notify_all()
+            self._not_full.notify_all()
+
+    def _run(self) -> None:
+        while True:
+            with self._not_empty:
+                self._not_empty.wait_for(lambda: self._messages or self._closed)
+                if not self._messages:
+                    return
+                message = self._messages.popleft()
+                self._in_progress = 1
+                self._not_full.notify()
+
+            failed = False
+            try:
+                self.handler(message)
+            except Exception:
+                failed = True
+                traceback.print_exc()
+            finally:
+                with self._all_done:
+                    if failed:
+                        self.failed += 1
+                    else:
+                        self.delivered += 1
+                    self._in_progress = 0
+                    self._all_done.notify_all()
@@ -0,0 +1,3 @@
+from .shm_transport import SharedMemoryTransport
+
+__all__ = ["SharedMemoryTransport"]
@@ -0,0 +1,546 @@
+import hashlib
+import os
+import socket
+import struct
+import tempfile
+import threading
+import traceback
+from multiprocessing import resource_tracker
+from multiprocessing import shared_memory
+from typing import Any
+from typing import Callable
+from typing import List
+from typing import Optional
+
+from ..codecs import MessageCodec
+from ..codecs import SharedPayload
+from ..core import Message
+from ..core import Topic
+from ..core import Transport
+from ..event_emitter import EventEmitterMixin
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+try:
+    import msvcrt
+except ImportError:
+    msvcrt = None
+
+__all__ = ["SharedMemoryTransport"]
+
+MAGIC = b"CEVE"
+VERSION = 1
+
+# Segment header: magic, version, slot count, slot size, last written sequence, last retained sequence
+HEADER = struct.Struct("<4sIIIQQ")
+HEADER_SIZE = 64
+WRITE_SEQ_OFFSET = 16
+RETAINED_SEQ_OFFSET = 24
+
+# Slot header: sequence written before the payload, payload length, sequence written after the payload
+SLOT_HEADER = struct.Struct("<QQQ")
+SEQ = struct.Struct("<Q")
+LENGTH_AND_SEQ = struct.Struct("<QQ")
+
+LOCALHOST = "127.0.0.1"
+
+
+def _base_dir() -> str:
+    return os.path.join(tempfile.gettempdir(), "compas_eve_shm")
+
+
+class _FileLock(object):
+    """Lock shared by all threads and processes using the same file path."""
+
+    def __init__(self, path: str) -> None:
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o666)
+        self._thread_lock = threading.Lock()
+
+    def __enter__(self) -> "_FileLock":
+        self._thread_lock.acquire()
+        if fcntl:
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+        elif msvcrt:
+            os.lseek(self._fd, 0, os.SEEK_SET)
+            msvcrt.locking(self._fd, msvcrt.LK_LOCK, 1)
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        if fcntl:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+        elif msvcrt:
+            os.lseek(self._fd, 0, os.SEEK_SET)
+            msvcrt.locking(self._fd, msvcrt.LK_UNLCK, 1)
+        self._thread_lock.release()
+
+    def close(self) -> None:
+        os.close(self._fd)
+
+
+class _Segment(object):
+    """Ring buffer of fixed-size slots stored in a shared memory block, one per topic.
+
+    Each slot is guarded by a pair of sequence numbers (written before and after
+    the payload), which lets readers detect slots that were overwritten while
+    they were reading them, without taking any lock.
+    """
+
+    def __init__(self, name: str, slot_count: int, slot_size: int) -> None:
+        self.name = name
+        self.registry_dir = os.path.join(_base_dir(), name)
+        os.makedirs(self.registry_dir, exist_ok=True)
+        self.lock_path = os.path.join(_base_dir(), name + ".lock")
+        self.lock = _FileLock(self.lock_path)
+        self._registry_mtime = None
+        self._ports = []
+
+        with self.lock:
+            try:
+                stride = SLOT_HEADER.size + _align(slot_size)
+                self.shm = shared_memory.SharedMemory(name=name, create=True, size=HEADER_SIZE + slot_count * stride)
+                HEADER.pack_into(self.shm.buf, 0, MAGIC, VERSION, slot_count, slot_size, 0, 0)
+            except FileExistsError:
+                self.shm = shared_memory.SharedMemory(name=name)
+            _untrack(self.shm)
+
+            magic, version, self.slot_count, self.slot_size, _, _ = HEADER.unpack_from(self.shm.buf, 0)
+            if magic != MAGIC or version != VERSION:
+                raise ValueError("Shared memory block {} is not a compatible compas_eve segment".format(name))
+
+        self.buf = self.shm.buf
+        self.stride = SLOT_HEADER.size + _align(self.slot_size)
+
+    @property
+    def write_seq(self) -> int:
+        return SEQ.unpack_from(self.buf, WRITE_SEQ_OFFSET)[0]
+
+    @property
+    def retained_seq(self) -> int:
+        return SEQ.unpack_from(self.buf, RETAINED_SEQ_OFFSET)[0]
+
+    def _slot_offset(self, seq: int) -> int:
+        return HEADER_SIZE + ((seq - 1) % self.slot_count) * self.stride
+
+    def write(self, buffers: List[Any], retain: bool = False) -> int:
+        """Write the concatenation of ``buffers`` to the next slot, copying each of them directly into shared memory."""
+        views = [memoryview(buffer).cast("B") for buffer in buffers]
+        length = sum(view.nbytes for view in views)
+        if length > self.slot_size:
+            raise ValueError("Message of {} bytes exceeds the slot size of {} bytes of this topic".format(length, self.slot_size))
+
+        with self.lock:
+            seq = self.write_seq + 1
+            offset = self._slot_offset(seq)
+            data_offset = offset + SLOT_HEADER.size
+            SEQ.pack_into(self.buf, offset, seq)
+            for view in views:
+                self.buf[data_offset : data_offset + view.nbytes] = view
+                data_offset += view.nbytes
+            LENGTH_AND_SEQ.pack_into(self.buf, offset + SEQ.size, length, seq)
+            SEQ.pack_into(self.buf, WRITE_SEQ_OFFSET, seq)
+            if retain:
+                SEQ.pack_into(self.buf, RETAINED_SEQ_OFFSET, seq)
+        return seq
+
+    def view(self, seq: int) -> Optional[memoryview]:
+        """Zero-copy view on the payload of a slot, or None if the slot no longer holds ``seq``."""
+        offset = self._slot_offset(seq)
+        length, seq_end = LENGTH_AND_SEQ.unpack_from(self.buf, offset + SEQ.size)
+        if seq_end != seq:
+            return None
+        data_offset = offset + SLOT_HEADER.size
+        return self.buf[data_offset : data_offset + length]
+
+    def is_valid(self, seq: int) -> bool:
+        """Check that the slot of ``seq`` has not started to be overwritten."""
+        return SEQ.unpack_from(self.buf, self._slot_offset(seq))[0] == seq
+
+    def register(self, port: int) -> None:
+        open(os.path.join(self.registry_dir, str(port)), "w").close()
+
+    def unregister(self, port: int) -> None:
+        try:
+            os.remove(os.path.join(self.registry_dir, str(port)))
+        except OSError:
+            pass
+
+    def ports(self) -> List[int]:
+        """Doorbell ports of the readers of this segment, refreshed only when the registry changes."""
+        mtime = os.stat(self.registry_dir).st_mtime_ns
+        if mtime != self._registry_mtime:
+            self._registry_mtime = mtime
+            self._ports = [int(entry) for entry in os.listdir(self.registry_dir) if entry.isdigit()]
+        return self._ports
+
+    def close(self, unlink: bool = False) -> None:
+        self.buf = None
+        try:
+            self.shm.close()
+        except BufferError:
+            # A decoded message still references the shared memory, it will be released with it
+            pass
+        self.lock.close()
+        if unlink:
+            _track(self.shm)
+            for remove in (self.shm.unlink, lambda: os.rmdir(self.registry_dir), lambda: os.remove(self.lock_path)):
+                try:
+                    remove()
+                except OSError:
+                    pass
+
+
+class _SegmentReader(object):
+    """Reading position and local subscriptions of one topic."""
+
+    def __init__(self, topic_name: str, segment: _Segment) -> None:
+        self.topic_name = topic_name
+        self.segment = segment
+        self.next_seq = segment.write_seq + 1
+        self.message_types = {}
+        self.lock = threading.Lock()
+
+
+def _align(size: int) -> int:
+    return (size + 7) & ~7
+
+
+def _untrack(shm: shared_memory.SharedMemory) -> None:
+    # On POSIX, the resource tracker would unlink the block when this process exits,
+    # even if other processes are still using it. Segments are only unlinked explicitly.
+    if os.name == "posix":
+        resource_tracker.unregister(shm._name, "shared_memory")
+
+
+def _track(shm: shared_memory.SharedMemory) -> None:
+    # Balance the registration that `SharedMemory.unlink` removes
+    if os.name == "posix":
+        resource_tracker.register(shm._name, "shared_memory")
+
+
+class SharedMemoryTransport(Transport, EventEmitterMixin):
+    """Shared memory transport allows sending messages between processes running on the same machine.
+
+    Every topic is stored in a ring buffer in a shared memory block, so that messages are
+    written once by the publisher and read directly from memory by subscribers of any process,
+    without a broker or any socket copy. Subscribers are woken up by a tiny UDP datagram sent
+    over the loopback interface after each message is written, so they do not busy-wait.
+
+    Subscribers that fall behind by more than the capacity of the ring buffer miss messages.
+    These are detected by sequence number and counted in
+    [dropped_messages][compas_eve.shm.SharedMemoryTransport.dropped_messages], and an ``overrun``
+    event is emitted with the topic name and the number of missed messages.
+
+    Note
+    ----
+    Shared memory blocks outlive the processes that use them, so that late joiners can
+    find existing topics. Call [close][compas_eve.shm.SharedMemoryTransport.close] with
+    ``unlink=True`` on the last process to release them.
+
+    Parameters
+    ----------
+    slot_count
+        Number of messages each topic can hold before the oldest one is overwritten. Defaults to 32.
+    slot_size
+        Maximum size in bytes of an encoded message. Defaults to 256 KiB.
+        Both values are only used by the process creating the shared memory block of a topic,
+        all other processes use the layout of the existing block.
+    namespace
+        Name used to isolate the topics of different applications running on the same machine.
+    poll_interval
+        Maximum time in seconds between checks for new messages, as a fallback in case a
+        notification is lost. Defaults to 0.5.
+    codec
+        The codec to use for encoding and decoding messages.
+        If not provided, defaults to [JsonMessageCodec][compas_eve.codecs.JsonMessageCodec].
+    """
+
+    def __init__(
+        self,
+        slot_count: int = 32,
+        slot_size: int = 256 * 1024,
+        namespace: str = "compas_eve",
+        poll_interval: float = 0.5,
+        codec: Optional[MessageCodec] = None,
+        *args: Any,
+        **kwargs: Any,
+    ) -> None:
+        super(SharedMemoryTransport, self).__init__(codec=codec, *args, **kwargs)
+        os.makedirs(_base_dir(), exist_ok=True)
+        self.slot_count = slot_count
+        self.slot_size = slot_size
+        self.namespace = namespace
+        self.poll_interval = poll_interval
+        self.dropped_messages = {}
+
+        self._local_callbacks = {}
+        self._segments = {}
+        self._readers = {}
+        self._lock = threading.RLock()
+        self._closed = False
+        self._reader_thread = None
+
+        self._socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._socket.bind((LOCALHOST, 0))
+        self._socket.settimeout(poll_interval)
+        self._port = self._socket.getsockname()[1]
+
+    def close(self, unlink: bool = False) -> None:
+        """Stop receiving messages and detach from all shared memory blocks.
+
+        Parameters
+        ----------
+        unlink
+            If True, also destroy the shared memory blocks of all topics used by this transport.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        self._socket.sendto(b"", (LOCALHOST, self._port))
+        if self._reader_thread:
+            self._reader_thread.join()
+        self._socket.close()
+
+        with self._lock:
+            for reader in self._readers.values():
+                reader.segment.unregister(self._port)
+            self._readers.clear()
+            for segment in self._segments.values():
+                segment.close(unlink=unlink)
+            self._segments.clear()
+
+    def on_ready(self, callback: Callable) -> None:
+        """Shared memory transport is always ready, it will immediately trigger the callback."""
+        callback()
+
+    def _get_segment(self, topic_name: str) -> _Segment:
+        with self._lock:
+            segment = self._segments.get(topic_name)
+            if segment is None:
+                key = "{}:{}".format(self.namespace, topic_name).encode("utf-8")
+                name = "ce_" + hashlib.sha1(key).hexdigest()[:20]
+                segment = _Segment(name, self.slot_count, self.slot_size)
+                self._segments[topic_name] = segment
+            return segment
+
+    def publish(self, topic: Topic, message: Message, **options: Any) -> None:
+        """Publish a message to a topic.
+
+        Parameters
+        ----------
+        topic
+            Instance of the topic to publish to.
+        message
+            Instance of the message to publish.
+        retain : bool, optional
+            If True, the message is delivered immediately to any new subscriber,
+            as long as it has not been overwritten in the ring buffer. Defaults to False.
+        """
+        retain = options.pop("retain", False)
+        if options:
+            raise TypeError("publish() got unexpected options for SharedMemoryTransport: {}".format(", ".join(options)))
+
+        def _callback(**kwargs: Any) -> None:
+            segment = self._get_segment(topic.name)
+            segment.write(self._encode_buffers(topic, message), retain=retain)
+
+            doorbell = segment.name.encode("ascii")
+            for port in segment.ports():
+                self._socket.sendto(doorbell, (LOCALHOST, port))
+
+        self.on_ready(_callback)
+
+    def subscribe(self, topic: Topic, callback: Callable) -> str:
+        """Subscribe to a topic.
+
+        Every time a new message is received on the topic, the callback will be invoked.
+
+        Parameters
+        ----------
+        topic
+            Instance of the topic to subscribe to.
+        callback
+            Callback to invoke whenever a new message arrives. The callback should
+            receive only one `msg` argument, e.g. `lambda msg: print(msg)`.
+
+        Returns
+        -------
+        str
+            Returns an identifier of the subscription.
+        """
+        event_key = "event:{}".format(topic.name)
+        subscribe_id = "{}:{}".format(event_key, id(callback))
+
+        _local_callback = self._payload_handler(topic, callback)
+
+        def _callback(**kwargs: Any) -> None:
+            segment = self._get_segment(topic.name)
+            with self._lock:
+                reader = self._readers.get(topic.name)
+                if reader is None:
+                    reader = _SegmentReader(topic.name, segment)
+                    self._readers[topic.name] = reader
+                    segment.register(self._port)
+                reader.message_types[subscribe_id] = topic.message_type
+                self.on(event_key, _local_callback)
+
+                if self._reader_thread is None:
+                    self._reader_thread = threading.Thread(target=self._read_loop, name="compas_eve-shm")
+                    self._reader_thread.daemon = True
+                    self._reader_thread.start()
+
+            retained_seq = segment.retained_seq
+            if retained_seq and retained_seq < reader.next_seq:
+                payload = self._read_payload(reader, retained_seq, [topic.message_type])
+                if payload:
+                    _local_callback(payload)
+
+        self._local_callbacks[subscribe_id] = _local_callback
+
+        self.on_ready(_callback)
+
+        return subscribe_id
+
+    def _read_loop(self) -> None:
+        while not self._closed:
+            try:
+                doorbell = self._socket.recv(64)
+            except socket.timeout:
+                doorbell = None
+            except OSError:
+                break
+            if self._closed:
+                break
+
+            with self._lock:
+                readers = list(self._readers.values())
+            for reader in readers:
+                if doorbell is None or doorbell == reader.segment.name.encode("ascii"):
+                    self._read_new_messages(reader)
+
+    def _read_new_messages(self, reader: _SegmentReader) -> None:
+        with reader.lock:
+            if self._closed or reader.segment.buf is None:
+                return
+            write_seq = reader.segment.write_seq
+            oldest_seq = write_seq - reader.segment.slot_count + 1
+            if reader.next_seq < oldest_seq:
+                self._on_overrun(reader, oldest_seq - reader.next_seq)
+                reader.next_seq = oldest_seq
+
+            event_key = "event:{}".format(reader.topic_name)
+            message_types = set(reader.message_types.values())
+            while reader.next_seq <= write_seq:
+                seq = reader.next_seq
+                reader.next_seq += 1
+                payload = self._read_payload(reader, seq, message_types)
+                if payload is None:
+                    self._on_overrun(reader, 1)
+                    continue
+                self.emit(event_key, payload)
+
+    def _read_payload(self, reader: _SegmentReader, seq: int, message_types: Any) -> Optional[SharedPayload]:
+        view = reader.segment.view(seq)
+        if view is None:
+            return None
+
+        # Decode straight from shared memory for every local message type before checking
+        # that the slot was not overwritten in the meantime, so subscribers never see torn data.
+        # Messages that would keep referencing the slot (e.g. NumPy arrays) are decoded from a copy instead
+        payload = self._shared_payload(view)
+        if payload.codec.references_payload:
+            payload = SharedPayload(bytes(payload.payload), payload.codec)
+        try:
+            for message_type in message_types:
+                payload.decode(message_type)
+        except Exception:
+            if reader.segment.is_valid(seq):
+                traceback.print_exc()
+            return None
+
+        if not reader.segment.is_valid(seq):
+            return None
+        return payload
+
+    def _on_overrun(self, reader: _SegmentReader, count: int) -> None:
+        self.dropped_messages[reader.topic_name] = self.dropped_messages.get(reader.topic_name, 0) + count
+        self.emit("overrun", reader.topic_name, count)
+
+    def unsubscribe_by_id(self, subscribe_id: str) -> None:
+        """Unsubscribe from the specified topic based on the subscription id.
+
+        Parameters
+        ----------
+        subscribe_id
+            Identifier of the subscription.
+        """
+        ev_type, topic_name, _callback_id = subscribe_id.split(":")
+        event_key = "{}:{}".format(ev_type, topic_name)
+
+        callback = self._local_callbacks[subscribe_id]
+        self.off(event_key, callback)
+        del self._local_callbacks[subscribe_id]
+
+        with self._lock:
+            reader = self._readers.get(topic_name)
+            if reader:
+                reader.message_types.pop(subscribe_id, None)
+                if not reader.message_types:
+                    self._remove_reader(reader)
+
+    def unsubscribe(self, topic: Topic) -> None:
+        """Unsubscribe from the specified topic.
+
+        Parameters
+        ----------
+        topic
+            Instance of the topic to unsubscribe from.
+        """
+        event_key = "event:{}".format(topic.name)
+        self.remove_all_listeners(event_key)
+
+        keys_to_remove = [k for k in self._local_callbacks.keys() if k.startswith(event_key + ":")]
+        for k in keys_to_remove:
+            del self._local_callbacks[k]
+
+        with self._lock:
+            reader = self._readers.get(topic.name)
+            if reader:
+                self._remove_reader(reader)
+
+    def _remove_reader(self, reader: _SegmentReader) -> None:
+        reader.segment.unregister(self._port)
+        del self._readers[reader.topic_name]
+
+    def advertise(self, topic: Topic) -> str:
+        """Announce this code will publish messages to the specified topic.
+
+        This creates the shared memory block of the topic if it does not exist yet.
+
+        Parameters
+        ----------
+        topic
+            Instance of the topic to advertise.
+
+        Returns
+        -------
+        str
+            Advertising identifier.
+        """
+        self._get_segment(topic.name)
+        advertise_id = "advertise:{}:{}".format(topic.name, self.id_counter)
+        return advertise_id
+
+    def unadvertise(self, topic: Topic) -> None:
+        """Announce that this code will stop publishing messages to the specified topic.
+
+        This call has no effect on this transport implementation.
+
+        Parameters
+        ----------
+        topic
+            Instance of the topic to stop publishing messages to.
+        """
+        pass
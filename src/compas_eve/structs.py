@@ -0,0 +1,259 @@
+"""
+Messages with a fixed binary layout, for high-rate topics such as joint states or sensor readings.
+
+A [StructMessage][compas_eve.structs.StructMessage] subclass declares its fields and their
+types with [struct format characters](https://docs.python.org/3/library/struct.html#format-characters).
+From that declaration, a binary encoder and decoder are compiled once, when the class is
+created. Encoded messages contain only the values of the fields, without any key names, and
+decoding creates a compact object with ``__slots__`` instead of a dictionary.
+
+Use [StructMessageCodec][compas_eve.codecs.StructMessageCodec] to send them over any transport.
+
+Examples
+--------
+>>> class JointState(StructMessage):
+...     __fields__ = [("sequence", "I"), ("timestamp", "d"), ("positions", "6d")]
+>>> state = JointState(sequence=1, timestamp=0.5, positions=(0.0, 0.1, 0.2, 0.3, 0.4, 0.5))
+>>> len(state.pack())
+60
+>>> JointState.unpack(state.pack()).positions
+(0.0, 0.1, 0.2, 0.3, 0.4, 0.5)
+"""
+
+import re
+import struct
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Tuple
+
+__all__ = ["StructMessage"]
+
+_FORMAT = re.compile(r"^(\d*)([bB?hHiIlLqQefds])$")
+
+_DEFAULTS = {"s": "", "?": False, "e": 0.0, "f": 0.0, "d": 0.0}
+
+# Kinds of fields
+_SINGLE = 0
+_REPEATED = 1
+_STRING = 2
+
+
+def _parse_field(name: str, fmt: str) -> Tuple[str, int, int, Any]:
+    if not name.isidentifier() or name.startswith("_"):
+        raise ValueError("Invalid field name {!r}, must be a valid identifier not starting with an underscore".format(name))
+    match = _FORMAT.match(fmt)
+    if not match:
+        raise ValueError("Invalid format {!r} of field {!r}".format(fmt, name))
+    count, code = match.groups()
+    count = int(count) if count else 1
+    default = _DEFAULTS.get(code, 0)
+    if code == "s":
+        # The count of a string is its maximum length in bytes, e.g. "16s"
+        return fmt, _STRING, count, default
+    if count == 1:
+        return fmt, _SINGLE, count, default
+    return fmt, _REPEATED, count, (default,) * count
+
+
+class _StructMessageType(type):
+    """Metaclass compiling the fields declared on struct messages into slots, and a binary encoder and decoder."""
+
+    def __new__(mcs, name, bases, namespace):
+        fields = namespace.get("__fields__")
+        if fields is None:
+            namespace.setdefault("__slots__", ())
+            return super(_StructMessageType, mcs).__new__(mcs, name, bases, namespace)
+
+        # Fields of base struct messages come first
+        inherited = []
+        for base in bases:
+            inherited.extend(getattr(base, "__fields__", ()))
+        fields = inherited + list(fields)
+        namespace["__fields__"] = fields
+        names = [field_name for field_name, _ in fields]
+        if len(set(names)) != len(names):
+            raise ValueError("Duplicate field names in {}: {}".format(name, names))
+
+        inherited_names = {field_name for field_name, _ in inherited}
+        namespace["__slots__"] = tuple(field_name for field_name in names if field_name not in inherited_names)
+
+        formats, kinds, counts, defaults = [], [], [], []
+        for field_name, fmt in fields:
+            fmt, kind, count, default = _parse_field(field_name, fmt)
+            formats.append(fmt)
+            kinds.append(kind)
+            counts.append(count)
+            defaults.append(default)
+
+        # Little-endian, without padding, so that the layout is the same on every platform
+        layout = struct.Struct("<" + "".join(formats))
+        namespace["_layout"] = layout
+        namespace["_defaults"] = dict(zip(names, defaults))
+        namespace["_pack"], namespace["_unpack"] = _compile(names, kinds, counts, layout)
+        return super(_StructMessageType, mcs).__new__(mcs, name, bases, namespace)
+
+
+def _compile(names: List[str], kinds: List[int], counts: List[int], layout: struct.Struct) -> Tuple[Any, Any]:
+    # Generate straight-line code for each layout, which is several times
+    # faster than looping over the fields on every message
+    pack_args = []
+    unpack_lines = []
+    index = 0
+    for field_name, kind, count in zip(names, kinds, counts):
+        if kind == _REPEATED:
+            pack_args.append("*self.{}".format(field_name))
+            unpack_lines.append("    self.{} = values[{}:{}]".format(field_name, index, index + count))
+            index += count
+        elif kind == _STRING:
+            # Strings are padded with null bytes up to their maximum length
+            pack_args.append("self.{}.encode('utf-8')".format(field_name))
+            unpack_lines.append("    self.{} = values[{}].rstrip(b'\\0').decode('utf-8')".format(field_name, index))
+            index += 1
+        else:
+            pack_args.append("self.{}".format(field_name))
+            unpack_lines.append("    self.{} = values[{}]".format(field_name, index))
+            index += 1
+
+    source = "\n".join(
+        [
+            "def _pack(self):",
+            "    return _struct_pack({})".format(", ".join(pack_args)),
+            "def _unpack(cls, data):",
+            "    values = _struct_unpack(data)",
+            "    self = _new(cls)",
+        ]
+        + unpack_lines
+        + ["    return self"]
+    )
+    scope = dict(_struct_pack=layout.pack, _struct_unpack=layout.unpack, _new=object.__new__)
+    exec(source, scope)
+    return scope["_pack"], classmethod(scope["_unpack"])
+
+
+class StructMessage(object, metaclass=_StructMessageType):
+    """Base class for messages with a fixed binary layout.
+
+    Subclasses declare their fields in ``__fields__``, as a list of ``(name, format)`` pairs,
+    where ``format`` is a [struct format character](https://docs.python.org/3/library/struct.html#format-characters),
+    optionally preceded by a number of values, e.g. ``"d"`` for a float, ``"6d"`` for a tuple of
+    six floats, ``"I"`` for an unsigned 32-bit integer, ``"?"`` for a boolean or ``"16s"`` for
+    a string of up to 16 bytes (encoded as UTF-8). Subclasses of struct messages inherit the fields
+    of their parents.
+
+    Struct messages behave like [Message][compas_eve.Message] (fields are accessible as attributes
+    and as items, and they can be encoded by any codec), but they only accept the declared fields,
+    and they store them in ``__slots__``, which makes them smaller and faster to access.
+
+    Fields not given on init take a default value of zero (or an empty string).
+
+    Note
+    ----
+    Struct messages are not instances of [Message][compas_eve.Message], since a ``Message`` keeps
+    its fields in a dictionary, so checks like ``isinstance(message, Message)`` do not apply to them.
+    Code converting messages between types should use their ``data`` and the ``parse`` method of the
+    target type instead, as [ReferencePayload][compas_eve.memory.ReferencePayload] does.
+
+    Parameters
+    ----------
+    *args
+        Values of the fields, in the declared order.
+    **kwargs
+        Values of the fields, by name.
+    """
+
+    __fields__ = ()
+    __slots__ = ()
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        names = self.field_names()
+        if len(args) > len(names):
+            raise TypeError("{} takes at most {} values, got {}".format(type(self).__name__, len(names), len(args)))
+        values = dict(self._defaults)
+        values.update(zip(names, args))
+        for key, value in kwargs.items():
+            if key not in values:
+                raise TypeError("{} has no field {!r}".format(type(self).__name__, key))
+            values[key] = value
+        for key, value in values.items():
+            setattr(self, key, value)
+
+    @classmethod
+    def field_names(cls) -> List[str]:
+        """Names of the fields of the message, in the order of the binary layout."""
+        return [name for name, _ in cls.__fields__]
+
+    @classmethod
+    def size(cls) -> int:
+        """Size in bytes of an encoded message."""
+        return cls._layout.size
+
+    def pack(self) -> bytes:
+        """Encode the message to its binary layout.
+
+        Returns
+        -------
+        bytes
+            The values of the fields, without any key names.
+        """
+        try:
+            return self._pack()
+        except struct.error as error:
+            raise ValueError("Cannot encode {}: {}".format(type(self).__name__, error))
+
+    @classmethod
+    def unpack(cls, data: bytes) -> "StructMessage":
+        """Decode a message from its binary layout.
+
+        Parameters
+        ----------
+        data
+            Encoded message, as bytes or any other buffer.
+
+        Returns
+        -------
+        StructMessage
+            Decoded message.
+        """
+        try:
+            return cls._unpack(data)
+        except struct.error as error:
+            raise ValueError("Cannot decode {} ({} bytes expected): {}".format(cls.__name__, cls._layout.size, error))
+
+    @property
+    def data(self) -> Dict[str, Any]:
+        """Fields of the message as a dictionary."""
+        return {name: getattr(self, name) for name in self.field_names()}
+
+    @classmethod
+    def parse(cls, value: Dict[str, Any]) -> "StructMessage":
+        return cls(**value)
+
+    def ToString(self) -> str:
+        return str(self)
+
+    def __str__(self) -> str:
+        return str(self.data)
+
+    def __repr__(self) -> str:
+        return "{}({})".format(type(self).__name__, ", ".join("{}={!r}".format(key, value) for key, value in self.data.items()))
+
+    def __eq__(self, other: Any) -> bool:
+        return type(self) is type(other) and self.data == other.data
+
+    def __ne__(self, other: Any) -> bool:
+        return not self == other
+
+    __hash__ = None
+
+    def __getitem__(self, key: str) -> Any:
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key)
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        setattr(self, key, value)
+
+    def __jsondump__(self, minimal: bool = False) -> Dict[str, Any]:
+        return self.data
@@ -0,0 +1,242 @@
+import threading
+from typing import Dict
+from typing import List
+from typing import Mapping
+from typing import Optional
+
+__all__ = ["TopicTrie", "is_wildcard", "topic_matches", "to_mqtt_pattern", "to_zenoh_pattern", "MQTT_WILDCARDS", "ZENOH_WILDCARDS", "WILDCARDS"]
+
+SEPARATOR = "/"
+SINGLE_LEVEL = "+"
+MULTI_LEVEL = "#"
+
+# Wildcards of each syntax, by their equivalent MQTT wildcard
+MQTT_WILDCARDS = {"+": SINGLE_LEVEL, "#": MULTI_LEVEL}
+ZENOH_WILDCARDS = {"*": SINGLE_LEVEL, "**": MULTI_LEVEL}
+
+# Both syntaxes, for transports that accept either of them
+WILDCARDS = {**MQTT_WILDCARDS, **ZENOH_WILDCARDS}
+
+
+def _split(pattern: str, wildcards: Mapping[str, str] = WILDCARDS) -> List[str]:
+    return [wildcards.get(segment, segment) for segment in pattern.split(SEPARATOR)]
+
+
+def is_wildcard(pattern: str, wildcards: Mapping[str, str] = WILDCARDS) -> bool:
+    """Check if a topic name contains wildcards.
+
+    By default, both MQTT-style wildcards (``+`` for one level, ``#`` for any number of levels)
+    and Zenoh-style wildcards (``*`` for one level, ``**`` for any number of levels) are supported.
+
+    Parameters
+    ----------
+    pattern
+        Topic name or pattern.
+    wildcards
+        Wildcards of the transport, e.g. [MQTT_WILDCARDS][compas_eve.trie.MQTT_WILDCARDS] on MQTT,
+        where ``*`` and ``**`` are ordinary topic levels.
+
+    Returns
+    -------
+    bool
+        True if the topic name contains at least one wildcard level.
+    """
+    return any(segment in wildcards for segment in pattern.split(SEPARATOR))
+
+
+def topic_matches(pattern: str, topic_name: str, wildcards: Mapping[str, str] = WILDCARDS) -> bool:
+    """Check if a topic name matches a topic pattern.
+
+    Parameters
+    ----------
+    pattern
+        Topic pattern, optionally containing wildcards.
+    topic_name
+        Concrete topic name.
+    wildcards
+        Wildcards of the transport, as for [is_wildcard][compas_eve.trie.is_wildcard].
+
+    Returns
+    -------
+    bool
+        True if the pattern matches the topic name.
+    """
+    trie = TopicTrie(wildcards)
+    trie.add(pattern)
+    return bool(trie.match(topic_name))
+
+
+class _Node(object):
+    __slots__ = ("children", "patterns")
+
+    def __init__(self, children: Optional[Dict[str, "_Node"]] = None, patterns: tuple = ()) -> None:
+        self.children = children or {}
+        # Equivalent patterns (e.g. `a/#` and `a/**`) share a node
+        self.patterns = patterns
+
+
+class TopicTrie(object):
+    """Index of topic patterns organized by topic levels.
+
+    Patterns are split on ``/`` into levels and stored in a tree with one node per level,
+    so that finding all patterns that match a topic name only walks the levels of that
+    name, and does not depend on the total number of patterns stored.
+
+    By default, both MQTT-style wildcards (``+`` for one level, ``#`` for any number of levels)
+    and Zenoh-style wildcards (``*`` for one level, ``**`` for any number of levels) are supported,
+    and are considered equivalent.
+
+    Nodes are never changed once they are part of the tree: adding or removing a pattern copies
+    the nodes on its path and replaces the root as a whole (copy-on-write), so ``match`` never
+    takes a lock, and can run on any thread while patterns are added or removed on others.
+
+    Parameters
+    ----------
+    wildcards
+        Wildcards of the transport, e.g. [MQTT_WILDCARDS][compas_eve.trie.MQTT_WILDCARDS] to read
+        ``*`` and ``**`` as ordinary topic levels.
+
+    Examples
+    --------
+    >>> trie = TopicTrie()
+    >>> trie.add("robots/+/state")
+    >>> trie.add("robots/#")
+    >>> sorted(trie.match("robots/r1/state"))
+    ['robots/#', 'robots/+/state']
+    """
+
+    def __init__(self, wildcards: Mapping[str, str] = WILDCARDS) -> None:
+        self.wildcards = wildcards
+        self._root = _Node()
+        # Number of times each pattern was added
+        self._patterns = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._patterns)
+
+    def __contains__(self, pattern: str) -> bool:
+        return pattern in self._patterns
+
+    def add(self, pattern: str) -> None:
+        """Add a topic pattern to the index.
+
+        Patterns are reference-counted: adding the same pattern twice requires removing it twice.
+
+        Parameters
+        ----------
+        pattern
+            Topic name or pattern.
+        """
+        with self._lock:
+            count = self._patterns.get(pattern, 0)
+            if not count:
+                self._root = self._update(self._root, _split(pattern, self.wildcards), pattern, add=True)
+            self._patterns[pattern] = count + 1
+
+    def remove(self, pattern: str, all: bool = False) -> None:
+        """Remove a topic pattern from the index.
+
+        Parameters
+        ----------
+        pattern
+            Topic name or pattern.
+        all
+            If True, remove the pattern regardless of how many times it was added.
+        """
+        with self._lock:
+            count = self._patterns.get(pattern)
+            if count is None:
+                return
+            if count > 1 and not all:
+                self._patterns[pattern] = count - 1
+                return
+
+            del self._patterns[pattern]
+            self._root = self._update(self._root, _split(pattern, self.wildcards), pattern, add=False) or _Node()
+
+    def _update(self, node: _Node, segments: List[str], pattern: str, add: bool) -> Optional[_Node]:
+        # Copy of the node with the pattern added to or removed from its branch,
+        # or None if the copy is left without patterns (so that empty branches are pruned)
+        if not segments:
+            patterns = node.patterns + (pattern,) if add else tuple(p for p in node.patterns if p != pattern)
+            children = node.children
+        else:
+            segment = segments[0]
+            child = node.children.get(segment)
+            if child is None:
+                child = _Node()
+            child = self._update(child, segments[1:], pattern, add)
+            children = dict(node.children)
+            if child is None:
+                del children[segment]
+            else:
+                children[segment] = child
+            patterns = node.patterns
+        if not children and not patterns:
+            return None
+        return _Node(children, patterns)
+
+    def match(self, topic_name: str) -> List[str]:
+        """Find all patterns that match a topic name.
+
+        Parameters
+        ----------
+        topic_name
+            Concrete topic name, without wildcards.
+
+        Returns
+        -------
+        list
+            Matching patterns, including the topic name itself if it was added.
+        """
+        segments = topic_name.split(SEPARATOR)
+        length = len(segments)
+        matches = []
+        seen = set()
+        # Following MQTT, wildcards at the root do not match topics starting with `$`
+        system_topic = topic_name.startswith("$")
+        # The root is read once: patterns added or removed meanwhile only affect the next match
+        stack = [(self._root, 0)]
+
+        while stack:
+            node, index = stack.pop()
+            children = node.children
+            wildcards_allowed = not (system_topic and index == 0)
+
+            multi = children.get(MULTI_LEVEL) if wildcards_allowed else None
+            if multi is not None:
+                # A multi-level wildcard consumes any number of levels, including none
+                for end in range(index, length + 1):
+                    stack.append((multi, end))
+
+            if index == length:
+                if node.patterns and id(node) not in seen:
+                    seen.add(id(node))
+                    matches.extend(node.patterns)
+                continue
+
+            child = children.get(segments[index])
+            if child is not None:
+                stack.append((child, index + 1))
+            single = children.get(SINGLE_LEVEL) if wildcards_allowed else None
+            if single is not None:
+                stack.append((single, index + 1))
+
+        return matches
+
+    def patterns(self) -> Dict[str, int]:
+        """Patterns stored in the index, with the number of times each was added."""
+        with self._lock:
+            return dict(self._patterns)
+
+
+def to_mqtt_pattern(pattern: str) -> str:
+    """Convert a topic pattern to MQTT wildcard syntax (``+`` and ``#``)."""
+    return SEPARATOR.join(_split(pattern))
+
+
+def to_zenoh_pattern(pattern: str) -> str:
+    """Convert a topic pattern to Zenoh key expression syntax (``*`` and ``**``)."""
+    zenoh_wildcards = {SINGLE_LEVEL: "*", MULTI_LEVEL: "**"}
+    return SEPARATOR.join(zenoh_wildcards.get(segment, segment) for segment in _split(pattern))
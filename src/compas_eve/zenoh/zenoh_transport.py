@@ -1,6 +1,7 @@
 import threading
 from typing import Any
 from typing import Callable
+from typing import List
 from typing import Optional
 
 import zenoh
@@ -10,11 +11,16 @@ from ..core import Message
 from ..core import Topic
 from ..core import Transport
 from ..event_emitter import EventEmitterMixin
+from ..trie import to_zenoh_pattern
 
 
 class ZenohTransport(Transport, EventEmitterMixin):
     """Zenoh transport allows sending and receiving messages using an Apache Zenoh router.
 
+    Subscribers can use Zenoh key expression wildcards in topic names to receive messages from
+    several topics (``*`` for one level, ``**`` for any number of levels, e.g. ``robots/*/state``).
+    MQTT-style wildcards (``+`` and ``#``) are accepted as well.
+
     Parameters
     ----------
     config
@@ -22,6 +28,9 @@ class ZenohTransport(Transport, EventEmitterMixin):
     codec
         The codec to use for encoding and decoding messages.
         If not provided, defaults to [JsonMessageCodec][compas_eve.codecs.JsonMessageCodec].
+    **kwargs
+        Options of all transports, e.g. ``chunk_size`` to send large messages in chunks
+        (see [Transport][compas_eve.Transport]).
     """
 
     def __init__(self, config: Optional[zenoh.Config] = None, codec: Optional[MessageCodec] = None, *args: Any, **kwargs: Any) -> None:
@@ -49,7 +58,7 @@ class ZenohTransport(Transport, EventEmitterMixin):
         self.session.close()
 
     def _get_topic_name(self, topic: Topic) -> str:
-        return topic.name.strip("/")
+        return to_zenoh_pattern(topic.name.strip("/"))
 
     def on_ready(self, callback: Callable) -> None:
         """Allows to hook-up to the event triggered when the connection is established.
@@ -82,8 +91,33 @@ class ZenohTransport(Transport, EventEmitterMixin):
             if topic_name not in self._publishers:
                 self._publishers[topic_name] = self.session.declare_publisher(topic_name)
 
-            encoded_message = self.codec.encode(message)
-            self._publishers[topic_name].put(encoded_message)
+            encoded_message = self._encode(topic, message)
+            for payload in self._split(encoded_message):
+                self._publishers[topic_name].put(payload)
+
+        self.on_ready(_callback)
+
+    def publish_many(self, topic: Topic, messages: List[Message], **options: Any) -> None:
+        """Publish several messages to a topic at once, as a single Zenoh sample.
+
+        Parameters
+        ----------
+        topic
+            Instance of the topic to publish to.
+        messages
+            Messages to publish, in order.
+        """
+        if options:
+            raise TypeError("publish_many() got unexpected options for ZenohTransport: {}".format(", ".join(options)))
+        messages = list(messages)
+
+        def _callback(**kwargs: Any) -> None:
+            topic_name = self._get_topic_name(topic)
+            if topic_name not in self._publishers:
+                self._publishers[topic_name] = self.session.declare_publisher(topic_name)
+
+            for payload in self._split(self._encode_batch(topic, messages)):
+                self._publishers[topic_name].put(payload)
 
         self.on_ready(_callback)
 
@@ -105,17 +139,22 @@ class ZenohTransport(Transport, EventEmitterMixin):
         event_key = "event:{}".format(self._get_topic_name(topic))
         subscribe_id = "{}:{}".format(event_key, id(callback))
 
-        def _local_callback(msg: Any) -> None:
-            callback(msg)
-
-        def _zenoh_handler(sample: Any) -> None:
-            payload = sample.payload.to_bytes() if hasattr(sample.payload, "to_bytes") else bytes(sample.payload)
-            message_obj = self.codec.decode(payload, topic.message_type)
-            self.emit(event_key, message_obj)
+        _local_callback = self._payload_handler(topic, callback)
 
         def _subscribe_callback(**kwargs: Any) -> None:
             topic_name = self._get_topic_name(topic)
             if topic_name not in self._subscribers:
+                # Each Zenoh subscriber receives its own copy of every chunk, so it needs its own assembler
+                chunks = self._chunk_assembler()
+
+                def _zenoh_handler(sample: Any) -> None:
+                    payload = sample.payload.to_bytes() if hasattr(sample.payload, "to_bytes") else bytes(sample.payload)
+                    payload = chunks.add(payload, str(sample.key_expr))
+                    if payload is None:
+                        return
+                    for encoded_message in self._unbatch(payload):
+                        self.emit(event_key, self._shared_payload(encoded_message))
+
                 self._subscribers[topic_name] = self.session.declare_subscriber(topic_name, _zenoh_handler)
 
             self.on(event_key, _local_callback)
@@ -171,14 +210,18 @@ class ZenohTransport(Transport, EventEmitterMixin):
         """
         # subscribe_id format: "event:topic_name:id(callback)"
         parts = subscribe_id.split(":", 2)
-        if len(parts) >= 2:
-            topic_name = parts[1]
-            if topic_name in self._subscribers:
-                self._subscribers[topic_name].undeclare()
-                del self._subscribers[topic_name]
+        if len(parts) < 2:
+            return
+        topic_name = parts[1]
+        event_key = "{}:{}".format(parts[0], parts[1])
 
         if subscribe_id in self._local_callbacks:
-            # We don't have event_key directly but it is parts[0]:parts[1]
-            event_key = "{}:{}".format(parts[0], parts[1])
             self.remove_listener(event_key, self._local_callbacks[subscribe_id])
             del self._local_callbacks[subscribe_id]
+
+        # The Zenoh subscriber of a topic is shared by all its local callbacks, keep it until the last one is gone
+        if any(key.startswith(event_key + ":") for key in self._local_callbacks):
+            return
+        if topic_name in self._subscribers:
+            self._subscribers[topic_name].undeclare()
+            del self._subscribers[topic_name]
@@ -1,15 +1,22 @@
 import time
 from threading import Event
+from threading import current_thread
 
+import numpy
 import pytest
 from compas.datastructures import Graph
+from compas.datastructures import Mesh
 from compas.geometry import Frame
 
 from compas_eve import Message
 from compas_eve import Publisher
 from compas_eve import Subscriber
 from compas_eve import Topic
+from compas_eve import codecs
 from compas_eve import set_default_transport
+from compas_eve.codecs import MsgPackMessageCodec
+from compas_eve.codecs import NumpyMessageCodec
+from compas_eve.executors import ThreadExecutor
 from compas_eve.mqtt import MqttTransport
 
 try:
@@ -167,6 +174,163 @@ def test_compas_data_as_message(tx):
     assert isinstance(result["value"]["graph"], Graph)
 
 
+@pytest.mark.skipif(not codecs.MSGPACK_AVAILABLE, reason="msgpack is not installed")
+def test_msgpack_codec(tx):
+    tx.codec = MsgPackMessageCodec()
+    result = dict(value=None, event=Event())
+
+    def callback(msg):
+        result["value"] = msg
+        result["event"].set()
+
+    topic = Topic("/messages_compas_eve_test/test_msgpack_codec/")
+
+    Subscriber(topic, callback, transport=tx).subscribe()
+    time.sleep(0.1)
+    Publisher(topic, transport=tx).publish(Message(frame=Frame.worldXY(), values=[1.5, 2.5]))
+
+    received = result["event"].wait(timeout=3)
+    assert received, "Message not received"
+    assert result["value"].frame == Frame.worldXY()
+    assert result["value"].values == [1.5, 2.5]
+
+
+def test_numpy_codec(tx):
+    tx.codec = NumpyMessageCodec()
+    result = dict(value=None, event=Event())
+
+    def callback(msg):
+        result["value"] = msg
+        result["event"].set()
+
+    topic = Topic("/messages_compas_eve_test/test_numpy_codec/")
+    points = numpy.random.rand(1000, 3)
+
+    Subscriber(topic, callback, transport=tx).subscribe()
+    time.sleep(0.1)
+    Publisher(topic, transport=tx).publish(Message(points=points, frame=Frame.worldXY()))
+
+    received = result["event"].wait(timeout=3)
+    assert received, "Message not received"
+    numpy.testing.assert_array_equal(result["value"].points, points)
+    assert result["value"].frame == Frame.worldXY()
+
+
+def test_chunked_message(tx):
+    tx.chunk_size = 16 * 1024
+    chunks = []
+    tx.chunk_callback = chunks.append
+    result = dict(value=None, event=Event())
+
+    def callback(msg):
+        result["value"] = msg
+        result["event"].set()
+
+    topic = Topic("/messages_compas_eve_test/test_chunked_message/")
+    mesh = Mesh.from_meshgrid(dx=10, nx=50)
+
+    Subscriber(topic, callback, transport=tx).subscribe()
+    time.sleep(0.1)
+    Publisher(topic, transport=tx).publish(Message(mesh=mesh))
+
+    received = result["event"].wait(timeout=5)
+    assert received, "Message not received"
+    assert result["value"].mesh.number_of_vertices() == mesh.number_of_vertices()
+    assert len(chunks) > 1
+    assert all(chunk.count == len(chunks) for chunk in chunks)
+
+
+def test_publish_many(tx):
+    result = dict(values=[], event=Event())
+
+    def callback(msg):
+        result["values"].append(msg.i)
+        if len(result["values"]) == 20:
+            result["event"].set()
+
+    topic = Topic("/messages_compas_eve_test/test_publish_many/")
+
+    Subscriber(topic, callback, transport=tx).subscribe()
+    time.sleep(0.1)
+    Publisher(topic, transport=tx).publish_many([Message(i=i) for i in range(20)])
+
+    received = result["event"].wait(timeout=5)
+    assert received, "Messages not received"
+    assert result["values"] == list(range(20))
+
+
+@pytest.mark.skipif(not codecs.MSGPACK_AVAILABLE, reason="msgpack is not installed")
+def test_topic_codec(tx):
+    result = dict(messages=[], event=Event())
+
+    def callback(msg):
+        result["messages"].append(msg)
+        if len(result["messages"]) == 2:
+            result["event"].set()
+
+    status = Topic("/messages_compas_eve_test/test_topic_codec/status")
+    points = Topic("/messages_compas_eve_test/test_topic_codec/points", codec=NumpyMessageCodec(MsgPackMessageCodec()))
+
+    Subscriber(Topic("/messages_compas_eve_test/test_topic_codec/#"), callback, transport=tx).subscribe()
+    time.sleep(0.1)
+    Publisher(status, transport=tx).publish(Message(state="scanning"))
+    time.sleep(0.1)
+    Publisher(points, transport=tx).publish(Message(points=numpy.ones((100, 3))))
+
+    received = result["event"].wait(timeout=5)
+    assert received, "Messages not received"
+    assert result["messages"][0].state == "scanning"
+    numpy.testing.assert_array_equal(result["messages"][1].points, numpy.ones((100, 3)))
+
+
+def test_delta_topic(tx):
+    result = dict(messages=[], event=Event())
+
+    def callback(msg):
+        result["messages"].append(msg)
+        if len(result["messages"]) == 10:
+            result["event"].set()
+
+    topic = Topic("/messages_compas_eve_test/test_delta_topic/", delta=True, keyframe_interval=4)
+
+    Subscriber(topic, callback, transport=tx).subscribe()
+    time.sleep(0.1)
+    publisher = Publisher(topic, transport=tx)
+    for i in range(10):
+        publisher.publish(Message(robot="r1", joints=[i, 0.0], frame=Frame.worldXY()))
+
+    received = result["event"].wait(timeout=5)
+    assert received, "Messages not received"
+    assert [msg.joints[0] for msg in result["messages"]] == list(range(10))
+    assert all(msg.robot == "r1" and msg.frame == Frame.worldXY() for msg in result["messages"])
+
+
+def test_subscriber_executor(tx):
+    result = dict(values=[], threads=set(), event=Event())
+
+    def callback(msg):
+        result["values"].append(msg.i)
+        result["threads"].add(current_thread().name)
+        if len(result["values"]) == 10:
+            result["event"].set()
+
+    topic = Topic("/messages_compas_eve_test/test_subscriber_executor/")
+    executor = ThreadExecutor(workers=2, name="test-executor")
+
+    Subscriber(topic, callback, transport=tx, executor=executor).subscribe()
+    time.sleep(0.1)
+    publisher = Publisher(topic, transport=tx)
+    for i in range(10):
+        publisher.publish(Message(i=i))
+
+    received = result["event"].wait(timeout=5)
+    executor.close()
+    assert received, "Messages not received"
+    assert result["values"] == list(range(10))
+    assert len(result["threads"]) == 1
+    assert result["threads"].pop().startswith("test-executor")
+
+
 def test_nested_message_types(tx):
     class Header(Message):
         def __init__(self, sequence_id=None):
@@ -239,17 +403,103 @@ def test_mqtt_retain_delivers_to_late_subscriber(mqtt_tx):
         result["value"] = msg.value
         result["event"].set()
 
-    Subscriber(topic, callback, transport=mqtt_tx).subscribe()
+    subscriber = Subscriber(topic, callback, transport=mqtt_tx)
+    subscriber.subscribe()
 
     received = result["event"].wait(timeout=3)
     assert received, "Retained message not delivered to late subscriber"
     assert result["value"] == 42
 
-    # Clean up: publish empty retained message to clear broker state
-    pub.publish(Message(), retain=True)
+    # Clean up: an empty payload clears the retained message on the broker, and is not
+    # delivered to the subscriber, since messages without value raise AttributeError
+    subscriber.unsubscribe()
+    mqtt_tx.client.publish(topic.name, b"", retain=True)
 
 
 def test_mqtt_unknown_option_raises(mqtt_tx):
     topic = Topic("/messages_compas_eve_test/test_bad_option/", Message)
     with pytest.raises(TypeError):
         Publisher(topic, transport=mqtt_tx).publish(Message(value=1), unknown_flag=True)
+
+
+def test_wildcard_subscription(tx):
+    result = dict(values=[], event=Event())
+
+    def callback(msg):
+        result["values"].append(msg.value)
+        if len(result["values"]) == 2:
+            result["event"].set()
+
+    Subscriber(Topic("messages_compas_eve_test/test_wildcard/+/state"), callback, transport=tx).subscribe()
+    time.sleep(0.1)
+    Publisher(Topic("messages_compas_eve_test/test_wildcard/r1/state"), transport=tx).publish(Message(value=1))
+    Publisher(Topic("messages_compas_eve_test/test_wildcard/r1/pose"), transport=tx).publish(Message(value=0))
+    Publisher(Topic("messages_compas_eve_test/test_wildcard/r2/state"), transport=tx).publish(Message(value=2))
+
+    received = result["event"].wait(timeout=3)
+    assert received, "Messages not received"
+    assert sorted(result["values"]) == [1, 2]
+
+
+def test_wildcard_unsubscribe_keeps_other_subscribers(tx):
+    result = dict(values=[], event=Event())
+
+    def callback(msg):
+        result["values"].append(msg.value)
+        result["event"].set()
+
+    pattern = Topic("messages_compas_eve_test/test_wildcard_unsub/+/state")
+    first = Subscriber(pattern, lambda msg: None, transport=tx)
+    first.subscribe()
+    Subscriber(pattern, callback, transport=tx).subscribe()
+    time.sleep(0.1)
+    first.unsubscribe()
+    time.sleep(0.1)
+    Publisher(Topic("messages_compas_eve_test/test_wildcard_unsub/r1/state"), transport=tx).publish(Message(value=1))
+
+    received = result["event"].wait(timeout=3)
+    assert received, "Message not received by the remaining subscriber"
+    assert result["values"] == [1]
+
+
+def test_overlapping_subscriptions_receive_messages_once(tx):
+    result = dict(exact=[], wildcard=[], event=Event())
+
+    def callback(name):
+        def _callback(msg):
+            result[name].append(msg.value)
+            if len(result["exact"]) + len(result["wildcard"]) == 6:
+                result["event"].set()
+
+        return _callback
+
+    Subscriber(Topic("messages_compas_eve_test/test_overlap/r1/state"), callback("exact"), transport=tx).subscribe()
+    Subscriber(Topic("messages_compas_eve_test/test_overlap/+/state"), callback("wildcard"), transport=tx).subscribe()
+    time.sleep(0.1)
+    publisher = Publisher(Topic("messages_compas_eve_test/test_overlap/r1/state"), transport=tx)
+    for value in [1, 2, 2]:
+        publisher.publish(Message(value=value))
+
+    received = result["event"].wait(timeout=3)
+    assert received, "Messages not received"
+    time.sleep(0.2)
+    assert result["exact"] == [1, 2, 2]
+    assert result["wildcard"] == [1, 2, 2]
+
+
+def test_mqtt_asterisk_is_not_a_wildcard(mqtt_tx):
+    result = dict(values=[], event=Event())
+
+    def callback(msg):
+        result["values"].append(msg.value)
+        result["event"].set()
+
+    Subscriber(Topic("messages_compas_eve_test/test_asterisk/*/state"), callback, transport=mqtt_tx).subscribe()
+    time.sleep(0.1)
+    Publisher(Topic("messages_compas_eve_test/test_asterisk/r1/state"), transport=mqtt_tx).publish(Message(value=1))
+    Publisher(Topic("messages_compas_eve_test/test_asterisk/*/state"), transport=mqtt_tx).publish(Message(value=2))
+
+    received = result["event"].wait(timeout=3)
+    assert received, "Message not received"
+    time.sleep(0.2)
+    assert result["values"] == [2]
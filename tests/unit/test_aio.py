@@ -0,0 +1,185 @@
+import asyncio
+import threading
+
+from compas_eve import InMemoryTransport
+from compas_eve import Message
+from compas_eve import Publisher
+from compas_eve import Topic
+from compas_eve.aio import AsyncPublisher
+from compas_eve.aio import AsyncSubscriber
+
+
+def test_async_iteration():
+    async def main():
+        tx = InMemoryTransport()
+        topic = Topic("/messages_compas_eve_test/aio/iter/", Message)
+        publisher = AsyncPublisher(topic, transport=tx)
+        received = []
+
+        async with AsyncSubscriber(topic, transport=tx) as subscriber:
+            for i in range(5):
+                await publisher.publish(Message(value=i))
+            async for message in subscriber:
+                received.append(message.value)
+                if len(received) == 5:
+                    break
+
+        return received
+
+    assert asyncio.run(main()) == [0, 1, 2, 3, 4]
+
+
+def test_messages_from_other_threads_are_batched():
+    async def main():
+        tx = InMemoryTransport()
+        topic = Topic("/messages_compas_eve_test/aio/threads/", Message)
+        subscriber = AsyncSubscriber(topic, transport=tx, queue_size=10000)
+        subscriber.subscribe()
+
+        wakeups = []
+        wakeup = subscriber._wakeup
+
+        def counting_wakeup():
+            wakeups.append(1)
+            wakeup()
+
+        subscriber._wakeup = counting_wakeup
+
+        def publish():
+            for i in range(1000):
+                tx.publish(topic, Message(value=i))
+
+        threads = [threading.Thread(target=publish) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+
+        received = []
+        while len(received) < 4000:
+            received.append((await subscriber.get()).value)
+
+        for thread in threads:
+            thread.join()
+        subscriber.unsubscribe()
+        return received, len(wakeups)
+
+    received, wakeups = asyncio.run(main())
+    assert sorted(received) == sorted(list(range(1000)) * 4)
+    assert wakeups < 4000
+
+
+def test_iteration_stops_after_unsubscribe():
+    async def main():
+        tx = InMemoryTransport()
+        topic = Topic("/messages_compas_eve_test/aio/stop/", Message)
+        subscriber = AsyncSubscriber(topic, transport=tx)
+        subscriber.subscribe()
+        tx.publish(topic, Message(value=1))
+        tx.publish(topic, Message(value=2))
+        subscriber.unsubscribe()
+        return [message.value async for message in subscriber]
+
+    assert asyncio.run(main()) == [1, 2]
+
+
+def test_concurrent_consumers():
+    async def main():
+        tx = InMemoryTransport()
+        topic = Topic("/messages_compas_eve_test/aio/concurrent/", Message)
+        subscriber = AsyncSubscriber(topic, transport=tx)
+        subscriber.subscribe()
+
+        consumers = [asyncio.ensure_future(subscriber.get()) for _ in range(3)]
+        await asyncio.sleep(0)
+        for i in range(3):
+            tx.publish(topic, Message(value=i))
+        messages = await asyncio.wait_for(asyncio.gather(*consumers), 3)
+        subscriber.unsubscribe()
+        return [message.value for message in messages]
+
+    assert sorted(asyncio.run(main())) == [0, 1, 2]
+
+
+def test_delta_topic():
+    async def main():
+        tx = InMemoryTransport()
+        topic = Topic("/messages_compas_eve_test/aio/delta/", Message, delta=True, keyframe_interval=3)
+        publisher = Publisher(topic, transport=tx)
+        async_publisher = AsyncPublisher(topic, transport=tx)
+        received = []
+
+        async with AsyncSubscriber(topic, transport=tx) as subscriber:
+            for i in range(3):
+                publisher.publish(Message(value=i, name="state"))
+            for i in range(3, 5):
+                await async_publisher.publish(Message(value=i, name="state"))
+            assert async_publisher._delta.deltas == 1
+            async for message in subscriber:
+                received.append((message.value, message.name))
+                if len(received) == 5:
+                    break
+
+        return received
+
+    assert asyncio.run(main()) == [(i, "state") for i in range(5)]
+
+
+def test_coroutine_callback():
+    async def main():
+        tx = InMemoryTransport()
+        topic = Topic("/messages_compas_eve_test/aio/callback/", Message)
+        done = asyncio.Event()
+        received = []
+
+        async def callback(message):
+            await asyncio.sleep(0)
+            received.append(message.value)
+            if len(received) == 3:
+                done.set()
+
+        AsyncSubscriber(topic, callback, transport=tx).subscribe()
+        publisher = AsyncPublisher(topic, transport=tx)
+        for i in range(3):
+            await publisher.publish(Message(value=i))
+
+        await asyncio.wait_for(done.wait(), 3)
+        return received
+
+    assert asyncio.run(main()) == [0, 1, 2]
+
+
+def test_keep_latest_overflow():
+    async def main():
+        tx = InMemoryTransport()
+        topic = Topic("/messages_compas_eve_test/aio/latest/", Message)
+        subscriber = AsyncSubscriber(topic, transport=tx, overflow="keep_latest")
+        subscriber.subscribe()
+        for i in range(10):
+            tx.publish(topic, Message(value=i))
+
+        message = await subscriber.get()
+        subscriber.unsubscribe()
+        return message.value, subscriber.stats
+
+    value, stats = asyncio.run(main())
+    assert value == 9
+    assert stats["dropped"] == 9
+    assert stats["delivered"] == 1
+
+
+def test_publish_on_executor():
+    from concurrent.futures import ThreadPoolExecutor
+
+    async def main():
+        tx = InMemoryTransport()
+        topic = Topic("/messages_compas_eve_test/aio/executor/", Message)
+        threads = []
+        tx.subscribe(topic, lambda message: threads.append(threading.current_thread()))
+
+        with ThreadPoolExecutor(1) as executor:
+            await AsyncPublisher(topic, transport=tx, executor=executor).publish(Message(value=1))
+
+        return threads
+
+    threads = asyncio.run(main())
+    assert len(threads) == 1
+    assert threads[0] is not threading.main_thread()
@@ -0,0 +1,184 @@
+import threading
+import time
+
+import pytest
+
+from compas_eve import InMemoryTransport
+from compas_eve import Message
+from compas_eve import Publisher
+from compas_eve import Subscriber
+from compas_eve import Topic
+from compas_eve.batching import MAGIC
+from compas_eve.batching import Batcher
+from compas_eve.batching import is_batch
+from compas_eve.batching import pack_batch
+from compas_eve.batching import unpack_batch
+from compas_eve.codecs import StructMessageCodec
+from compas_eve.structs import StructMessage
+
+
+class Sample(StructMessage):
+    __fields__ = [("tag", "I"), ("count", "I"), ("values", "16d")]
+
+
+def test_pack_and_unpack():
+    payloads = [b'{"a": 1}', b"", b"\x00" * 100]
+    batch = pack_batch(payloads)
+
+    assert is_batch(batch)
+    assert not is_batch(payloads[0])
+    assert [bytes(payload) for payload in unpack_batch(batch)] == payloads
+
+
+def test_unpack_invalid_batch():
+    with pytest.raises(ValueError):
+        unpack_batch(pack_batch([b"abc", b"def"])[:-1])
+
+
+def test_unpack_truncated_header():
+    with pytest.raises(ValueError):
+        unpack_batch(MAGIC + b"\xff\xff\x00\x00")
+
+
+def test_message_starting_like_a_batch():
+    # Chunked messages are reassembled and unbatched, like on networked transports
+    tx = InMemoryTransport(codec=StructMessageCodec(), chunk_size=64)
+    topic = Topic("/messages_compas_eve_test/batch_magic/", Sample)
+    received = []
+    sample = Sample(tag=int.from_bytes(MAGIC, "little"), count=2, values=(1.5,) * 16)
+    assert is_batch(sample.pack())
+
+    Subscriber(topic, received.append, transport=tx).subscribe()
+    Publisher(topic, transport=tx).publish(sample)
+
+    assert received == [sample]
+
+
+def test_batcher_batch_size():
+    batches = []
+    batcher = Batcher(batches.append, batch_size=3)
+
+    for i in range(7):
+        batcher.add(i)
+
+    assert batches == [[0, 1, 2], [3, 4, 5]]
+    batcher.close()
+    assert batches == [[0, 1, 2], [3, 4, 5], [6]]
+    with pytest.raises(RuntimeError):
+        batcher.add(7)
+
+
+def test_batcher_linger():
+    batches = []
+    flushed = threading.Event()
+    batcher = Batcher(lambda items: (batches.append(items), flushed.set()), linger=0.05)
+
+    batcher.add(1)
+    batcher.add(2)
+    assert batches == []
+
+    assert flushed.wait(timeout=5)
+    assert batches == [[1, 2]]
+    batcher.close()
+
+
+def test_batcher_requires_size_or_linger():
+    with pytest.raises(ValueError):
+        Batcher(print)
+    with pytest.raises(ValueError):
+        Batcher(print, batch_size=0)
+
+
+@pytest.mark.parametrize("passthrough", [False, True])
+@pytest.mark.parametrize("workers", [0, 2])
+def test_in_memory_publish_many(passthrough, workers):
+    tx = InMemoryTransport(passthrough=passthrough, workers=workers)
+    topic = Topic("/messages_compas_eve_test/batch/", Message)
+    received = []
+
+    Subscriber(topic, received.append, transport=tx).subscribe()
+    Publisher(topic, transport=tx).publish_many([Message(i=i) for i in range(10)])
+    tx.close()
+
+    assert [message.i for message in received] == list(range(10))
+
+
+def test_in_memory_publish_many_chunked():
+    tx = InMemoryTransport(chunk_size=64)
+    topic = Topic("/messages_compas_eve_test/batch_chunked/", Message)
+    received = []
+
+    Subscriber(topic, received.append, transport=tx).subscribe()
+    Publisher(topic, transport=tx).publish_many([Message(text="x" * 50, i=i) for i in range(5)])
+
+    assert [message.i for message in received] == list(range(5))
+
+
+def test_publish_many_rejects_retain():
+    tx = InMemoryTransport()
+    with pytest.raises(ValueError):
+        tx.publish_many(Topic("/messages_compas_eve_test/batch_retain/"), [Message(i=1)], retain=True)
+
+
+def test_publisher_batch_size():
+    tx = InMemoryTransport()
+    topic = Topic("/messages_compas_eve_test/batch_size/", Message)
+    received = []
+
+    Subscriber(topic, received.append, transport=tx).subscribe()
+    publisher = Publisher(topic, transport=tx, batch_size=4)
+    for i in range(6):
+        publisher.publish(Message(i=i))
+
+    assert [message.i for message in received] == [0, 1, 2, 3]
+    publisher.flush()
+    assert [message.i for message in received] == list(range(6))
+
+
+def test_publisher_linger_keeps_order():
+    tx = InMemoryTransport()
+    topic = Topic("/messages_compas_eve_test/batch_linger/", Message)
+    received = []
+
+    Subscriber(topic, received.append, transport=tx).subscribe()
+    publisher = Publisher(topic, transport=tx, linger=0.02)
+    for i in range(50):
+        publisher.publish(Message(i=i))
+        if i == 25:
+            publisher.publish(Message(i="direct"), retain=True)
+        time.sleep(0.001)
+
+    deadline = time.time() + 5
+    while len(received) < 51 and time.time() < deadline:
+        time.sleep(0.01)
+    publisher.unadvertise()
+
+    values = [message.i for message in received]
+    # The message published with options is sent after all messages published before it
+    assert values[: values.index("direct")] == list(range(26))
+    assert [value for value in values if isinstance(value, int)] == list(range(50))
+
+
+def test_publisher_unadvertise_stops_linger_thread():
+    tx = InMemoryTransport()
+    topic = Topic("/messages_compas_eve_test/batch_unadvertise/", Message)
+    received = []
+    threads = threading.active_count()
+
+    Subscriber(topic, received.append, transport=tx).subscribe()
+    publishers = [Publisher(topic, transport=tx, batch_size=100, linger=10) for _ in range(5)]
+    for i, publisher in enumerate(publishers):
+        publisher.publish(Message(i=i))
+    assert threading.active_count() == threads + 5
+
+    for publisher in publishers:
+        publisher.unadvertise()
+
+    # Lingering messages are sent on teardown
+    assert sorted(message.i for message in received) == list(range(5))
+    assert threading.active_count() == threads
+
+    # Publishing again advertises the publisher with a new batcher
+    publishers[0].publish(Message(i=5))
+    publishers[0].unadvertise()
+    assert received[-1].i == 5
@@ -0,0 +1,152 @@
+import random
+import time
+
+import pytest
+from compas.datastructures import Mesh
+
+from compas_eve import InMemoryTransport
+from compas_eve import Message
+from compas_eve import Publisher
+from compas_eve import Subscriber
+from compas_eve import Topic
+from compas_eve.chunking import HEADER
+from compas_eve.chunking import ChunkAssembler
+from compas_eve.chunking import is_chunk
+from compas_eve.chunking import split_payload
+
+
+def test_split_and_reassemble():
+    data = bytes(range(256)) * 100
+    chunks = list(split_payload(data, 1000))
+    assembler = ChunkAssembler()
+
+    assert len(chunks) == 26
+    assert all(is_chunk(chunk) for chunk in chunks)
+    assert all(len(chunk) <= HEADER.size + 1000 for chunk in chunks)
+
+    results = [assembler.add(chunk) for chunk in chunks]
+
+    assert results[:-1] == [None] * 25
+    assert bytes(results[-1]) == data
+    assert assembler.stats == dict(completed=1, discarded=0, pending=0, pending_bytes=0)
+
+
+def test_reassemble_out_of_order_with_duplicates():
+    data = b"compas_eve" * 1000
+    chunks = list(split_payload(data, 64))
+    shuffled = chunks + chunks[:10]
+    random.Random(0).shuffle(shuffled)
+    assembler = ChunkAssembler()
+
+    results = [result for result in (assembler.add(chunk) for chunk in shuffled) if result is not None]
+
+    assert len(results) == 1
+    assert bytes(results[0]) == data
+
+
+def test_interleaved_messages():
+    first = list(split_payload(b"a" * 1000, 100))
+    second = list(split_payload(b"b" * 500, 100))
+    assembler = ChunkAssembler()
+
+    results = []
+    for index in range(len(first)):
+        results.append(assembler.add(first[index]))
+        if index < len(second):
+            results.append(assembler.add(second[index]))
+
+    completed = [bytes(result) for result in results if result is not None]
+    assert completed == [b"b" * 500, b"a" * 1000]
+
+
+def test_regular_payloads_pass_through():
+    assembler = ChunkAssembler()
+
+    assert assembler.add(b'{"a": 1}') == b'{"a": 1}'
+    assert not is_chunk(b"\xceCHK")
+
+
+def test_timeout_discards_incomplete_messages():
+    chunks = list(split_payload(b"x" * 1000, 100))
+    assembler = ChunkAssembler(timeout=0.05)
+
+    assembler.add(chunks[0])
+    time.sleep(0.1)
+    assert assembler.add(b"{}") == b"{}"
+    assert assembler.add(list(split_payload(b"y" * 200, 100))[0]) is None
+
+    # The late chunks of the expired message are ignored
+    assert all(assembler.add(chunk) is None for chunk in chunks[1:])
+    assert assembler.stats["discarded"] == 1
+    assert assembler.stats["pending"] == 1
+
+
+def test_max_pending_bytes_evicts_oldest():
+    assembler = ChunkAssembler(max_pending_bytes=1500)
+    first = list(split_payload(b"a" * 1000, 100))
+    second = list(split_payload(b"b" * 1000, 100))
+
+    assembler.add(first[0])
+    assembler.add(second[0])
+
+    assert assembler.stats == dict(completed=0, discarded=1, pending=1, pending_bytes=1000)
+    assert [assembler.add(chunk) for chunk in second[1:]][-1] == b"b" * 1000
+
+
+def test_message_larger_than_max_pending_bytes_is_discarded():
+    assembler = ChunkAssembler(max_pending_bytes=500)
+
+    results = [assembler.add(chunk) for chunk in split_payload(b"a" * 1000, 100)]
+
+    assert results == [None] * 10
+    assert assembler.stats["discarded"] == 1
+
+
+def test_chunk_callback():
+    chunks = []
+    assembler = ChunkAssembler(on_chunk=lambda chunk: chunks.append((chunk.topic_name, chunk.index, chunk.offset, bytes(chunk.data))))
+
+    for chunk in split_payload(b"0123456789", 4):
+        assembler.add(chunk, "/topic")
+
+    assert chunks == [("/topic", 0, 0, b"0123"), ("/topic", 1, 4, b"4567"), ("/topic", 2, 8, b"89")]
+
+
+def test_split_invalid_chunk_size():
+    with pytest.raises(ValueError):
+        list(split_payload(b"abc", 0))
+    with pytest.raises(ValueError):
+        InMemoryTransport(chunk_size=0)
+
+
+@pytest.mark.parametrize("workers", [0, 2])
+def test_in_memory_transport_chunked_message(workers):
+    chunks = []
+    tx = InMemoryTransport(chunk_size=4096, chunk_callback=chunks.append, workers=workers)
+    topic = Topic("/messages_compas_eve_test/chunked/", Message)
+    received = []
+    mesh = Mesh.from_meshgrid(dx=10, nx=20)
+
+    Subscriber(topic, received.append, transport=tx).subscribe()
+    Subscriber(topic, received.append, transport=tx).subscribe()
+    Publisher(topic, transport=tx).publish(Message(mesh=mesh))
+    Publisher(topic, transport=tx).publish(Message(small=True))
+    tx.close()
+
+    assert len(chunks) > 1
+    assert len(received) == 4
+    assert received[0] is received[1]
+    assert received[0].mesh.number_of_faces() == mesh.number_of_faces()
+    assert received[2].small is True
+
+
+def test_in_memory_transport_retains_chunked_message():
+    tx = InMemoryTransport(chunk_size=1024)
+    topic = Topic("/messages_compas_eve_test/chunked_retain/", Message)
+    mesh = Mesh.from_meshgrid(dx=10, nx=10)
+    received = []
+
+    Publisher(topic, transport=tx).publish(Message(mesh=mesh), retain=True)
+    Subscriber(topic, received.append, transport=tx).subscribe()
+
+    assert received[0].mesh.number_of_faces() == mesh.number_of_faces()
@@ -1,7 +1,20 @@
+import json
+import math
+import os
+
+import numpy
+import pytest
+from compas.datastructures import Graph
+from compas.datastructures import Mesh
 from compas.geometry import Frame
 
 from compas_eve import Message
+from compas_eve import codecs
+from compas_eve.codecs import CompressedMessageCodec
+from compas_eve.codecs import FastJsonMessageCodec
 from compas_eve.codecs import JsonMessageCodec
+from compas_eve.codecs import MsgPackMessageCodec
+from compas_eve.codecs import NumpyMessageCodec
 from compas_eve.codecs import ProtobufMessageCodec
 
 
@@ -67,6 +80,244 @@ def test_json_codec_roundtrip():
     assert current.dict_val == {"key": "value"}
 
 
+@pytest.fixture(params=[True, False], ids=["orjson", "fallback"])
+def fast_json_codec(request, monkeypatch):
+    if request.param and not codecs.ORJSON_AVAILABLE:
+        pytest.skip("orjson is not installed")
+    monkeypatch.setattr(codecs, "ORJSON_AVAILABLE", request.param)
+    return FastJsonMessageCodec()
+
+
+def test_fast_json_codec_encode_decode(fast_json_codec):
+    original_message = Message(name="test", value=42, active=True, frame=Frame.worldXY())
+    encoded = fast_json_codec.encode(original_message)
+    decoded = fast_json_codec.decode(encoded, Message)
+
+    assert isinstance(encoded, bytes)
+    assert isinstance(decoded, Message)
+    assert decoded.name == "test"
+    assert decoded.value == 42
+    assert decoded.active is True
+    assert isinstance(decoded.frame, Frame)
+    assert decoded.frame.point == [0.0, 0.0, 0.0]
+
+
+def test_fast_json_codec_is_wire_compatible(fast_json_codec):
+    json_codec = JsonMessageCodec()
+    original_message = Message(frames=[Frame.worldXY()], mesh=Mesh.from_polyhedron(6), graph=Graph.from_edges([(0, 1), (1, 2)]), tags={"a": [1, 2.5, None]})
+
+    fast_encoded = fast_json_codec.encode(original_message)
+    json_encoded = json_codec.encode(original_message).encode("utf-8")
+    assert json.loads(fast_encoded) == json.loads(json_encoded)
+
+    decoded = json_codec.decode(fast_encoded, Message)
+    assert decoded.mesh.number_of_faces() == 6
+    assert decoded.graph.number_of_edges() == 2
+
+    decoded = fast_json_codec.decode(memoryview(json_encoded), Message)
+    assert isinstance(decoded.frames[0], Frame)
+    assert decoded.mesh.number_of_faces() == 6
+    assert decoded.tags == {"a": [1, 2.5, None]}
+
+
+def test_fast_json_codec_data_object(fast_json_codec):
+    encoded = fast_json_codec.encode(Frame.worldXY())
+    decoded = fast_json_codec.decode(encoded, Message)
+
+    assert isinstance(decoded, Frame)
+    assert decoded.xaxis == [1.0, 0.0, 0.0]
+
+
+@pytest.mark.skipif(not codecs.MSGPACK_AVAILABLE, reason="msgpack is not installed")
+def test_msgpack_codec_encode_decode():
+    codec = MsgPackMessageCodec()
+
+    original_message = Message(name="test", value=42, active=True, null_val=None, coordinates=[1.0, 2.5, 3.0], metadata={"version": 1})
+    encoded = codec.encode(original_message)
+    decoded = codec.decode(encoded, Message)
+
+    assert isinstance(encoded, bytes)
+    assert isinstance(decoded, Message)
+    assert decoded.name == "test"
+    assert decoded.value == 42
+    assert decoded.active is True
+    assert decoded.null_val is None
+    assert decoded.coordinates == [1.0, 2.5, 3.0]
+    assert decoded.metadata == {"version": 1}
+
+
+@pytest.mark.skipif(not codecs.MSGPACK_AVAILABLE, reason="msgpack is not installed")
+def test_msgpack_codec_compas_data():
+    codec = MsgPackMessageCodec()
+    mesh = Mesh.from_polyhedron(6)
+
+    original_message = Message(frames=[Frame.worldXY(), Frame([1, 2, 3], [0, 1, 0], [0, 0, 1])], mesh=mesh, dtype="not a compas object")
+    decoded = codec.decode(memoryview(codec.encode(original_message)), Message)
+
+    assert isinstance(decoded.frames[1], Frame)
+    assert decoded.frames[1].point == [1.0, 2.0, 3.0]
+    assert decoded.mesh.number_of_faces() == 6
+    assert decoded.mesh.guid == mesh.guid
+    assert decoded.dtype == "not a compas object"
+
+    frame = codec.decode(codec.encode(Frame.worldXY()), Message)
+    assert isinstance(frame, Frame)
+
+
+@pytest.mark.skipif(not codecs.MSGPACK_AVAILABLE, reason="msgpack is not installed")
+def test_msgpack_codec_is_smaller_than_json():
+    original_message = Message(points=[[math.sin(i), math.cos(i), i / 7.0] for i in range(1000)])
+
+    msgpack_size = len(MsgPackMessageCodec().encode(original_message))
+    json_size = len(JsonMessageCodec().encode(original_message))
+
+    assert msgpack_size * 2 < json_size
+
+
+def msgpack_param(value, id=None):
+    return pytest.param(value, id=id, marks=pytest.mark.skipif(not codecs.MSGPACK_AVAILABLE, reason="msgpack is not installed"))
+
+
+@pytest.mark.parametrize("inner_codec", [JsonMessageCodec, FastJsonMessageCodec, msgpack_param(MsgPackMessageCodec)])
+def test_numpy_codec_roundtrip(inner_codec):
+    codec = NumpyMessageCodec(inner_codec())
+    points = numpy.arange(300, dtype=numpy.float64).reshape(100, 3)
+    fortran = numpy.asfortranarray(numpy.arange(12, dtype=numpy.int32).reshape(3, 4))
+    strided = points[::2, 1]
+
+    original_message = Message(points=points, name="cloud", nested={"values": [1, fortran]}, strided=strided)
+    encoded = codec.encode(original_message)
+    decoded = codec.decode(encoded, Message)
+
+    assert isinstance(encoded, bytes)
+    assert decoded.name == "cloud"
+    assert decoded.nested["values"][0] == 1
+    numpy.testing.assert_array_equal(decoded.points, points)
+    numpy.testing.assert_array_equal(decoded.nested["values"][1], fortran)
+    numpy.testing.assert_array_equal(decoded.strided, strided)
+    assert decoded.points.dtype == numpy.float64
+    assert decoded.nested["values"][1].dtype == numpy.int32
+    assert decoded.nested["values"][1].flags.f_contiguous
+
+    # The original message is not modified
+    assert original_message.points is points
+
+
+def test_numpy_codec_decodes_without_copy():
+    codec = NumpyMessageCodec()
+    encoded = codec.encode(Message(points=numpy.ones((1000, 3))))
+
+    decoded = codec.decode(memoryview(encoded), Message)
+
+    assert numpy.shares_memory(decoded.points, numpy.frombuffer(encoded, dtype=numpy.uint8))
+    assert not decoded.points.flags.writeable
+
+
+def test_numpy_codec_without_arrays_uses_inner_codec():
+    codec = NumpyMessageCodec()
+    original_message = Message(name="test", frame=Frame.worldXY())
+    encoded = codec.encode(original_message)
+
+    assert encoded == JsonMessageCodec().encode(original_message)
+    decoded = codec.decode(encoded.encode("utf-8"), Message)
+    assert decoded.name == "test"
+    assert decoded.frame == Frame.worldXY()
+
+
+def test_numpy_codec_structured_dtype():
+    codec = NumpyMessageCodec()
+    joints = numpy.zeros(4, dtype=[("position", "<f8"), ("velocity", "<f4"), ("id", "<i2")])
+    joints["position"] = [0.1, 0.2, 0.3, 0.4]
+
+    decoded = codec.decode(codec.encode(dict(joints=joints)), Message)
+
+    assert decoded.joints.dtype == joints.dtype
+    numpy.testing.assert_array_equal(decoded.joints, joints)
+
+
+def test_numpy_codec_encode_buffers_references_arrays():
+    codec = NumpyMessageCodec()
+    points = numpy.ones((1000, 3))
+
+    buffers = codec.encode_buffers(Message(points=points))
+
+    assert b"".join(buffers) == codec.encode(Message(points=points))
+    assert any(numpy.shares_memory(points, numpy.frombuffer(buffer, dtype=numpy.uint8)) for buffer in buffers)
+
+
+def compression_algorithm(name):
+    available = dict(zlib=True, lz4=codecs.LZ4_AVAILABLE, zstd=codecs.ZSTD_AVAILABLE)
+    return pytest.param(name, marks=pytest.mark.skipif(not available[name], reason="{} is not installed".format(name)))
+
+
+@pytest.mark.parametrize("algorithm", [compression_algorithm("zlib"), compression_algorithm("lz4"), compression_algorithm("zstd")])
+def test_compressed_codec_roundtrip(algorithm):
+    codec = CompressedMessageCodec(algorithm=algorithm)
+    original_message = Message(mesh=Mesh.from_meshgrid(dx=10, nx=20), name="grid")
+
+    encoded = codec.encode(original_message)
+    decoded = codec.decode(encoded, Message)
+
+    assert encoded[0] == CompressedMessageCodec.ALGORITHMS[algorithm]
+    assert len(encoded) < len(JsonMessageCodec().encode(original_message)) / 2
+    assert decoded.name == "grid"
+    assert decoded.mesh.number_of_faces() == 400
+
+    stats = codec.stats
+    assert stats["messages"] == stats["compressed_messages"] == 1
+    assert stats["compressed_bytes"] == len(encoded) - 1
+    assert stats["ratio"] < 0.5
+    assert stats["compress_time"] > 0
+    assert stats["decompress_time"] > 0
+
+
+def test_compressed_codec_skips_small_messages():
+    codec = CompressedMessageCodec(algorithm="zlib", min_size=1024)
+    original_message = Message(name="test")
+
+    encoded = codec.encode(original_message)
+
+    assert encoded[0] == CompressedMessageCodec.RAW
+    assert encoded[1:] == JsonMessageCodec().encode(original_message).encode("utf-8")
+    assert codec.decode(encoded, Message).name == "test"
+    assert codec.stats["compressed_messages"] == 0
+
+
+@pytest.mark.skipif(not codecs.MSGPACK_AVAILABLE, reason="msgpack is not installed")
+def test_compressed_codec_skips_incompressible_messages():
+    codec = CompressedMessageCodec(MsgPackMessageCodec(), algorithm="zlib", min_size=0)
+    original_message = Message(noise=os.urandom(4096))
+
+    encoded = codec.encode(original_message)
+
+    assert encoded[0] == CompressedMessageCodec.RAW
+    assert codec.decode(encoded, Message).noise == original_message.noise
+
+
+def test_compressed_codec_decodes_any_algorithm():
+    encoded = CompressedMessageCodec(algorithm="zlib", min_size=0).encode(Message(name="test"))
+
+    assert CompressedMessageCodec(min_size=0).decode(encoded, Message).name == "test"
+
+
+@pytest.mark.skipif(not codecs.ZSTD_AVAILABLE, reason="zstandard is not installed")
+def test_compressed_codec_with_dictionary():
+    samples = [Message(robot="r{}".format(i % 3), joints=[i / 10.0, 0.2, 0.3, 0.4, 0.5, 0.6], state="moving") for i in range(500)]
+    dictionary = CompressedMessageCodec.train_dictionary(samples, size=4096)
+    codec = CompressedMessageCodec(algorithm="zstd", min_size=0, dictionary=dictionary)
+    without_dictionary = CompressedMessageCodec(algorithm="zstd", min_size=0)
+
+    encoded = codec.encode(samples[7])
+
+    assert len(encoded) < len(without_dictionary.encode(samples[7]))
+    assert codec.decode(encoded, Message).joints == samples[7].joints
+
+
+def test_compressed_codec_invalid_algorithm():
+    with pytest.raises(ValueError):
+        CompressedMessageCodec(algorithm="rar")
+
+
 def test_protobuf_codec_encode_decode():
     codec = ProtobufMessageCodec()
 
@@ -122,6 +373,25 @@ def test_protobuf_codec_roundtrip():
     assert current["dict_val"] == {"key": "value"}
 
 
+def test_protobuf_codec_typed_struct_message():
+    from compas_eve.codecs.schemas import protobuf_schema
+    from compas_eve.structs import StructMessage
+
+    class JointState(StructMessage):
+        __fields__ = [("sequence", "I"), ("timestamp", "d"), ("positions", "6d"), ("robot", "8s"), ("error", "i")]
+
+    codec = ProtobufMessageCodec()
+    state = JointState(3, 1.5, (0.1, -0.2, 0.3, 0.4, 0.5, 0.6), "r1", -5)
+
+    encoded = codec.encode(state)
+    decoded = codec.decode(encoded, JointState)
+
+    assert decoded == state
+    assert isinstance(decoded.positions, tuple)
+    assert len(encoded) < len(codec.encode(Message(**state.data))) / 2
+    assert "repeated double positions = 3;" in protobuf_schema(JointState)
+
+
 def test_codec_compatibility():
     """Test that both codecs produce equivalent results for the same message."""
     json_codec = JsonMessageCodec()
@@ -142,3 +412,55 @@ def test_codec_compatibility():
     assert json_decoded["count"] == protobuf_decoded["count"] == 100
     assert json_decoded["enabled"] == protobuf_decoded["enabled"] is False
     assert json_decoded["data"] == protobuf_decoded["data"] == [1, 2, 3, 4, 5]
+
+
+ALL_CODECS = [
+    JsonMessageCodec,
+    FastJsonMessageCodec,
+    msgpack_param(MsgPackMessageCodec),
+    NumpyMessageCodec,
+    pytest.param(lambda: CompressedMessageCodec(algorithm="zlib", min_size=0), id="compressed"),
+    pytest.param(lambda: CompressedMessageCodec(algorithm="zlib"), id="compressed-raw"),
+]
+
+
+@pytest.mark.parametrize("codec_factory", ALL_CODECS)
+def test_codecs_encode_buffers_matches_encode(codec_factory):
+    codec = codec_factory()
+    message = Message(name="test", values=[1.0, 2.0, 3.0], frame=Frame.worldXY())
+
+    encoded = codec.encode(message)
+
+    assert b"".join(codec.encode_buffers(message)) == (encoded.encode("utf-8") if isinstance(encoded, str) else encoded)
+
+
+@pytest.mark.parametrize("codec_factory", ALL_CODECS)
+@pytest.mark.parametrize("buffer_type", [bytearray, memoryview])
+def test_codecs_decode_any_buffer(codec_factory, buffer_type):
+    codec = codec_factory()
+    message = Message(name="test", frame=Frame.worldXY())
+
+    data = b"".join(codec.encode_buffers(message))
+    decoded = codec.decode(buffer_type(data), Message)
+
+    assert decoded.name == "test"
+    assert decoded.frame == Frame.worldXY()
+
+
+@pytest.mark.parametrize("codec", [JsonMessageCodec(), FastJsonMessageCodec(), NumpyMessageCodec(FastJsonMessageCodec())])
+def test_text_codecs_decode_str(codec):
+    assert codec.decodes_str
+    assert codec.decode(JsonMessageCodec().encode(Message(name="test")), Message).name == "test"
+
+
+@pytest.mark.skipif(not codecs.MSGPACK_AVAILABLE, reason="msgpack is not installed")
+def test_binary_codecs_do_not_decode_str():
+    assert not MsgPackMessageCodec().decodes_str
+    assert not CompressedMessageCodec().decodes_str
+    assert not NumpyMessageCodec(MsgPackMessageCodec()).decodes_str
+
+
+def test_codecs_referencing_payload():
+    assert NumpyMessageCodec().references_payload
+    assert CompressedMessageCodec(NumpyMessageCodec()).references_payload
+    assert not FastJsonMessageCodec().references_payload
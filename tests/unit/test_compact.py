@@ -0,0 +1,164 @@
+import copy
+import pickle
+import sys
+
+import pytest
+from compas.geometry import Frame
+
+from compas_eve import InMemoryTransport
+from compas_eve import Message
+from compas_eve import Publisher
+from compas_eve import Subscriber
+from compas_eve import Topic
+from compas_eve import codecs
+from compas_eve.codecs import FastJsonMessageCodec
+from compas_eve.codecs import JsonMessageCodec
+from compas_eve.codecs import MsgPackMessageCodec
+from compas_eve.compact import CompactMessage
+from compas_eve.compact import FrozenMessage
+
+
+class Target(CompactMessage):
+    __fields__ = ["name", "frame", ("tolerance", 0.01)]
+
+
+class TimedTarget(Target):
+    __fields__ = ["timestamp"]
+
+
+class Pose(FrozenMessage):
+    __fields__ = ["x", "y", ("theta", 0.0)]
+
+
+def test_fields_and_defaults():
+    target = Target("t1", frame=Frame.worldXY())
+
+    assert target.name == "t1"
+    assert target.frame == Frame.worldXY()
+    assert target.tolerance == 0.01
+    assert Target().name is None
+    assert Target.field_names() == ["name", "frame", "tolerance"]
+
+
+def test_slots_only():
+    target = Target("t1")
+
+    assert not hasattr(target, "__dict__")
+    with pytest.raises(AttributeError):
+        target.other = 1
+    with pytest.raises(TypeError):
+        Target(other=1)
+    with pytest.raises(TypeError):
+        Target(1, 2, 3, 4)
+
+
+def test_smaller_than_message():
+    target = Target("t1", None, 0.1)
+    message = Message(name="t1", frame=None, tolerance=0.1)
+
+    assert sys.getsizeof(target) < sys.getsizeof(message) + sys.getsizeof(message.__dict__) + sys.getsizeof(message.data)
+
+
+def test_inherited_fields():
+    target = TimedTarget("t1", timestamp=1.5)
+
+    assert TimedTarget.field_names() == ["name", "frame", "tolerance", "timestamp"]
+    assert target.data == {"name": "t1", "frame": None, "tolerance": 0.01, "timestamp": 1.5}
+
+
+def test_invalid_fields():
+    with pytest.raises(ValueError):
+
+        class Invalid(CompactMessage):
+            __fields__ = ["_private"]
+
+    with pytest.raises(ValueError):
+
+        class Duplicate(Target):
+            __fields__ = ["name"]
+
+
+def test_dict_compatible():
+    target = Target("t1")
+
+    target["tolerance"] = 0.5
+
+    assert target["tolerance"] == 0.5
+    assert target.tolerance == 0.5
+    assert "name" in target
+    assert "data" not in target
+    with pytest.raises(KeyError):
+        target["data"]
+    with pytest.raises(KeyError):
+        target["other"] = 1
+    assert target.__jsondump__() == target.data
+
+
+def test_parse_ignores_unknown_fields():
+    target = Target.parse({"name": "t1", "color": "red"})
+
+    assert target == Target("t1")
+    assert target != Target("t2")
+
+
+def test_frozen_message():
+    pose = Pose(1.0, 2.0)
+
+    with pytest.raises(AttributeError):
+        pose.x = 3.0
+    with pytest.raises(AttributeError):
+        del pose.x
+    with pytest.raises(TypeError):
+        pose["x"] = 3.0
+
+    moved = pose.replace(x=3.0)
+    assert moved.x == 3.0
+    assert pose.x == 1.0
+
+
+def test_frozen_message_is_hashable():
+    assert hash(Pose(1.0, 2.0)) == hash(Pose(1.0, 2.0))
+    assert len({Pose(1.0, 2.0), Pose(1.0, 2.0), Pose(0.0, 2.0)}) == 2
+    with pytest.raises(TypeError):
+        hash(Target("t1"))
+
+
+@pytest.mark.parametrize("message", [Target("t1", Frame.worldXY()), Pose(1.0, 2.0)])
+def test_pickle_and_copy(message):
+    assert pickle.loads(pickle.dumps(message)) == message
+    assert copy.deepcopy(message) == message
+    assert copy.copy(message) == message
+
+
+@pytest.fixture(params=["json", "fast_json", "msgpack"])
+def codec(request):
+    if request.param == "json":
+        return JsonMessageCodec()
+    if request.param == "fast_json":
+        return FastJsonMessageCodec()
+    if not codecs.MSGPACK_AVAILABLE:
+        pytest.skip("msgpack is not installed")
+    return MsgPackMessageCodec()
+
+
+def test_codecs_roundtrip(codec):
+    target = Target("t1", Frame.worldXY(), 0.1)
+
+    encoded = codec.encode(target)
+    encoded = encoded.encode("utf-8") if isinstance(encoded, str) else encoded
+
+    assert codec.decode(encoded, Target) == target
+    assert codec.decode(encoded, Message).frame == Frame.worldXY()
+
+
+@pytest.mark.parametrize("passthrough", [False, True])
+def test_pubsub(passthrough):
+    tx = InMemoryTransport(passthrough=passthrough)
+    received = []
+
+    Subscriber(Topic("/messages_compas_eve_test/compact/", Pose), received.append, transport=tx).subscribe()
+    Subscriber(Topic("/messages_compas_eve_test/compact/", Message), received.append, transport=tx).subscribe()
+    Publisher(Topic("/messages_compas_eve_test/compact/", Pose), transport=tx).publish(Pose(1.0, 2.0))
+
+    assert received[0] == Pose(1.0, 2.0)
+    assert received[1].data == {"x": 1.0, "y": 2.0, "theta": 0.0}
@@ -1,13 +1,17 @@
 from threading import Event
 
 import pytest
+from compas.geometry import Frame
 
 from compas_eve import InMemoryTransport
 from compas_eve import Message
 from compas_eve import Publisher
 from compas_eve import Subscriber
 from compas_eve import Topic
+from compas_eve import codecs
 from compas_eve import set_default_transport
+from compas_eve.codecs import JsonMessageCodec
+from compas_eve.codecs import MsgPackMessageCodec
 
 
 def test_default_transport_publishing():
@@ -167,3 +171,248 @@ def test_unknown_option_raises():
 
     with pytest.raises(TypeError):
         Publisher(topic, transport=tx).publish(Message(value=1), unknown_flag=True)
+
+
+@pytest.mark.skipif(not codecs.MSGPACK_AVAILABLE, reason="msgpack is not installed")
+def test_custom_codec():
+    tx = InMemoryTransport(codec=MsgPackMessageCodec())
+    result = {}
+    topic = Topic("/messages_compas_eve_test/custom_codec/", Message)
+
+    Subscriber(topic, lambda m: result.update(message=m), transport=tx).subscribe()
+    Publisher(topic, transport=tx).publish(Message(frame=Frame.worldXY(), count=3))
+
+    assert result["message"].frame == Frame.worldXY()
+    assert result["message"].count == 3
+
+
+def test_numpy_codec():
+    import numpy
+
+    from compas_eve.codecs import NumpyMessageCodec
+
+    tx = InMemoryTransport(codec=NumpyMessageCodec())
+    result = {}
+    topic = Topic("/messages_compas_eve_test/numpy_codec/", Message)
+    trajectory = numpy.linspace(0, 1, 600).reshape(100, 6)
+
+    Subscriber(topic, lambda m: result.update(message=m), transport=tx).subscribe()
+    Publisher(topic, transport=tx).publish(Message(trajectory=trajectory, robot="r1"))
+
+    numpy.testing.assert_array_equal(result["message"].trajectory, trajectory)
+    assert result["message"].robot == "r1"
+
+
+def test_payload_decoded_once_for_all_subscribers():
+    class CountingCodec(JsonMessageCodec):
+        decode_count = 0
+
+        def decode(self, encoded_data, message_type):
+            CountingCodec.decode_count += 1
+            return super(CountingCodec, self).decode(encoded_data, message_type)
+
+    tx = InMemoryTransport(codec=CountingCodec())
+    topic = Topic("/messages_compas_eve_test/decode_once/", Message)
+    received = []
+
+    for _ in range(20):
+        Subscriber(topic, received.append, transport=tx).subscribe()
+    Publisher(topic, transport=tx).publish(Message(value=1))
+
+    assert len(received) == 20
+    assert CountingCodec.decode_count == 1
+    assert all(msg is received[0] for msg in received), "Subscribers should share the decoded message"
+
+
+def test_passthrough_delivers_by_reference():
+    tx = InMemoryTransport(passthrough=True)
+    topic = Topic("/messages_compas_eve_test/passthrough/", Message)
+    received = []
+
+    Subscriber(topic, received.append, transport=tx).subscribe()
+    Subscriber(topic, received.append, transport=tx).subscribe()
+    message = Message(frame=Frame.worldXY())
+    Publisher(topic, transport=tx).publish(message)
+
+    assert len(received) == 2
+    assert received[0] is message
+    assert received[1] is message
+
+
+def test_passthrough_parses_message_type():
+    class TestMessage(Message):
+        @property
+        def hello_name(self):
+            return "Hello {}".format(self.name)
+
+    tx = InMemoryTransport(passthrough=True)
+    topic = Topic("/messages_compas_eve_test/passthrough_type/", TestMessage)
+    received = []
+
+    Subscriber(topic, received.append, transport=tx).subscribe()
+    Publisher(topic, transport=tx).publish(dict(name="Jazz"))
+
+    assert isinstance(received[0], TestMessage)
+    assert received[0].hello_name == "Hello Jazz"
+
+
+def test_passthrough_deepcopy_isolates_subscribers():
+    tx = InMemoryTransport(passthrough=True, deepcopy=True)
+    topic = Topic("/messages_compas_eve_test/passthrough_deepcopy/", Message)
+    received = []
+
+    Subscriber(topic, received.append, transport=tx).subscribe()
+    Subscriber(topic, received.append, transport=tx).subscribe()
+    message = Message(values=[1, 2, 3])
+    Publisher(topic, transport=tx).publish(message)
+    received[0].values.append(4)
+
+    assert received[0] is not message
+    assert received[1].values == [1, 2, 3]
+    assert message.values == [1, 2, 3]
+
+
+def test_passthrough_retain_delivers_to_late_subscriber():
+    tx = InMemoryTransport(passthrough=True)
+    topic = Topic("/messages_compas_eve_test/passthrough_retain/", Message)
+    message = Message(value=42)
+
+    Publisher(topic, transport=tx).publish(message, retain=True)
+
+    received = []
+    Subscriber(topic, received.append, transport=tx).subscribe()
+
+    assert received == [message]
+
+
+def test_workers_preserve_order_within_topic():
+    tx = InMemoryTransport(workers=4)
+    topic = Topic("/messages_compas_eve_test/workers_order/", Message)
+    received = []
+
+    Subscriber(topic, lambda m: received.append(m.value), transport=tx).subscribe()
+    publisher = Publisher(topic, transport=tx)
+    for i in range(200):
+        publisher.publish(Message(value=i))
+
+    tx.flush()
+    tx.close()
+    assert received == list(range(200))
+
+
+def test_workers_slow_subscriber_does_not_block_other_topics():
+    tx = InMemoryTransport(workers=2)
+    slow_topic = Topic("/messages_compas_eve_test/workers_slow/", Message)
+    release = Event()
+    fast_received = Event()
+
+    # Make sure both topics are assigned to different workers
+    names = ("/messages_compas_eve_test/workers_fast/{}/".format(i) for i in range(100))
+    fast_topic = Topic(next(name for name in names if hash(name) % 2 != hash(slow_topic.name) % 2), Message)
+
+    Subscriber(slow_topic, lambda m: release.wait(timeout=3), transport=tx).subscribe()
+    Subscriber(fast_topic, lambda m: fast_received.set(), transport=tx).subscribe()
+
+    Publisher(slow_topic, transport=tx).publish(Message(value=1))
+    Publisher(fast_topic, transport=tx).publish(Message(value=2))
+
+    received = fast_received.wait(timeout=1)
+    release.set()
+    tx.close()
+    assert received, "Slow subscriber on another topic blocked delivery"
+
+
+def test_wildcard_subscriptions():
+    tx = InMemoryTransport()
+    single = []
+    multi = []
+    exact = []
+
+    Subscriber(Topic("robots/+/state"), lambda m: single.append(m.value), transport=tx).subscribe()
+    Subscriber(Topic("robots/#"), lambda m: multi.append(m.value), transport=tx).subscribe()
+    Subscriber(Topic("robots/r1/state"), lambda m: exact.append(m.value), transport=tx).subscribe()
+
+    Publisher(Topic("robots/r1/state"), transport=tx).publish(Message(value=1))
+    Publisher(Topic("robots/r2/state"), transport=tx).publish(Message(value=2))
+    Publisher(Topic("robots/r2/arm/state"), transport=tx).publish(Message(value=3))
+
+    assert single == [1, 2]
+    assert multi == [1, 2, 3]
+    assert exact == [1]
+
+
+def test_wildcard_subscription_receives_retained_messages():
+    tx = InMemoryTransport()
+    Publisher(Topic("robots/r1/state"), transport=tx).publish(Message(value=1), retain=True)
+    Publisher(Topic("robots/r2/state"), transport=tx).publish(Message(value=2), retain=True)
+    Publisher(Topic("robots/r2/pose"), transport=tx).publish(Message(value=3), retain=True)
+
+    received = []
+    Subscriber(Topic("robots/*/state"), lambda m: received.append(m.value), transport=tx).subscribe()
+
+    assert sorted(received) == [1, 2]
+
+
+def test_wildcard_unsubscribe():
+    tx = InMemoryTransport()
+    received = []
+
+    sub = Subscriber(Topic("robots/+/state"), lambda m: received.append(m.value), transport=tx)
+    sub.subscribe()
+    sub.unsubscribe()
+    Publisher(Topic("robots/r1/state"), transport=tx).publish(Message(value=1))
+
+    assert received == []
+
+
+def test_history_replays_last_messages_to_late_subscriber():
+    tx = InMemoryTransport(history_depth=3)
+    topic = Topic("/messages_compas_eve_test/history/", Message)
+    publisher = Publisher(topic, transport=tx)
+
+    for i in range(5):
+        publisher.publish(Message(value=i), retain=True)
+    publisher.publish(Message(value=5))
+
+    received = []
+    Subscriber(topic, lambda m: received.append(m.value), transport=tx).subscribe()
+
+    assert received == [2, 3, 4]
+
+
+def test_history_max_bytes_evicts_topics():
+    # Each encoded message `{"value": i}` takes 12 bytes
+    tx = InMemoryTransport(history_max_bytes=36)
+
+    for i in range(10):
+        Publisher(Topic("/messages_compas_eve_test/history/{}/".format(i)), transport=tx).publish(Message(value=i), retain=True)
+
+    assert tx.history.total_bytes == 36
+    assert tx.history.topics() == ["/messages_compas_eve_test/history/{}/".format(i) for i in range(7, 10)]
+
+
+def test_subscriber_queue_decouples_slow_subscriber():
+    tx = InMemoryTransport()
+    topic = Topic("/messages_compas_eve_test/subscriber_queue/", Message)
+    release = Event()
+    fast = []
+    slow = []
+
+    def slow_callback(msg):
+        release.wait(timeout=3)
+        slow.append(msg.value)
+
+    slow_sub = Subscriber(topic, slow_callback, transport=tx, queue_size=2, overflow="keep_latest")
+    slow_sub.subscribe()
+    Subscriber(topic, lambda m: fast.append(m.value), transport=tx).subscribe()
+
+    publisher = Publisher(topic, transport=tx)
+    for i in range(10):
+        publisher.publish(Message(value=i))
+
+    assert fast == list(range(10))
+    release.set()
+    assert slow_sub.queue.join(timeout=3)
+    assert slow[-1] == 9
+    assert slow_sub.stats["dropped"] + len(slow) == 10
+    slow_sub.unsubscribe()
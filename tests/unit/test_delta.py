@@ -0,0 +1,213 @@
+import numpy
+import pytest
+from compas.datastructures import Mesh
+from compas.geometry import Frame
+
+from compas_eve import InMemoryTransport
+from compas_eve import Message
+from compas_eve import Publisher
+from compas_eve import Subscriber
+from compas_eve import Topic
+from compas_eve.delta import DeltaDecoder
+from compas_eve.delta import DeltaEncoder
+from compas_eve.delta import _apply_patch
+from compas_eve.delta import _diff
+from compas_eve.delta import _snapshot
+from compas_eve.delta import resync_topic_name
+
+
+def test_diff_roundtrip():
+    old = dict(a=1, b=dict(c=[1, 2], d="x", e=dict(f=1.0)), g=numpy.zeros(3), h="removed")
+    new = dict(a=1, b=dict(c=[1, 3], d="x", e=dict(f=1.0)), g=numpy.ones(3), i=None)
+
+    patch, snapshot = _diff(_snapshot(old), new)
+
+    assert patch["s"] == dict(g=new["g"], i=None)
+    assert patch["d"] == ["h"]
+    assert patch["p"] == dict(b=dict(s=dict(c=[1, 3])))
+    result = _apply_patch(old, patch)
+    assert result.keys() == new.keys()
+    assert result["b"] == new["b"]
+    numpy.testing.assert_array_equal(result["g"], new["g"])
+    assert _diff(snapshot, new)[0] == {}
+
+
+def test_diff_compas_data():
+    mesh = Mesh.from_meshgrid(dx=1, nx=10)
+    snapshot = _snapshot(dict(mesh=mesh, frame=Frame.worldXY()))
+    mesh.vertex_attribute(3, "z", 1.0)
+
+    patch, _ = _diff(snapshot, dict(mesh=mesh, frame=Frame.worldXY()))
+
+    assert patch == dict(p=dict(mesh=dict(p=dict(vertex=dict(p={"3": dict(s=dict(z=1.0))})))))
+    rebuilt = _apply_patch(dict(mesh=Mesh.from_meshgrid(dx=1, nx=10)), patch)["mesh"]
+    assert rebuilt.vertex_attribute(3, "z") == 1.0
+
+
+def test_diff_detects_changes_in_place():
+    joints = [0.0, 0.0]
+    snapshot = _snapshot(dict(joints=joints))
+    joints[0] = 1.0
+
+    patch, _ = _diff(snapshot, dict(joints=joints))
+
+    assert patch == dict(s=dict(joints=[1.0, 0.0]))
+
+
+def test_encoder_keyframes():
+    encoder = DeltaEncoder(keyframe_interval=3)
+
+    frames = [encoder.encode(Message(i=i)) for i in range(7)]
+
+    assert ["k" in frame for frame in frames] == [True, False, False, True, False, False, True]
+    assert [frame["__delta__"][1] for frame in frames] == list(range(1, 8))
+    assert frames[1]["p"] == dict(s=dict(i=1))
+    assert encoder.keyframes == 3 and encoder.deltas == 4
+
+    encoder.request_keyframe()
+    assert "k" in encoder.encode(Message(i=7))
+
+
+def test_encoder_invalid_keyframe_interval():
+    with pytest.raises(ValueError):
+        DeltaEncoder(keyframe_interval=0)
+
+
+def test_decoder_skips_deltas_until_keyframe():
+    encoder = DeltaEncoder()
+    requests = []
+    decoder = DeltaDecoder(Message, requests.append)
+    frames = [encoder.encode(Message(i=i)) for i in range(4)]
+    encoder.request_keyframe()
+    frames.append(encoder.encode(Message(i=4)))
+
+    messages = [decoder.decode(frame) for frame in frames[2:]]
+
+    assert messages[:2] == [None, None]
+    assert messages[2].i == 4
+    assert requests == [encoder.id]
+    assert decoder.gaps == 2
+
+
+def test_subscribers_rebuild_messages():
+    tx = InMemoryTransport()
+    topic = Topic("/compas_eve/test_delta/rebuild/", delta=True, keyframe_interval=5)
+    received = []
+    Subscriber(topic, received.append, transport=tx).subscribe()
+    publisher = Publisher(topic, transport=tx)
+
+    for i in range(12):
+        publisher.publish(Message(robot="r1", joints=[i, 0.0], io=dict(do0=i > 6, do1=False)))
+
+    assert [msg.joints[0] for msg in received] == list(range(12))
+    assert [msg.io["do0"] for msg in received] == [i > 6 for i in range(12)]
+    assert all(msg.robot == "r1" for msg in received)
+    # Messages already delivered are not modified by later deltas
+    assert received[6].io == dict(do0=False, do1=False)
+
+
+def test_late_subscriber_requests_keyframe():
+    tx = InMemoryTransport()
+    topic = Topic("/compas_eve/test_delta/late/", delta=True)
+    publisher = Publisher(topic, transport=tx)
+    publisher.publish(Message(i=0, name="state"))
+    received = []
+    subscriber = Subscriber(topic, received.append, transport=tx)
+    subscriber.subscribe()
+
+    for i in range(1, 4):
+        publisher.publish(Message(i=i, name="state"))
+
+    assert [msg.i for msg in received] == [2, 3]
+    assert received[0].name == "state"
+    assert subscriber._delta.gaps == 1
+
+
+def test_resync_requests_only_reach_publishers_of_the_topic():
+    tx = InMemoryTransport()
+    topic = Topic("/compas_eve/test_delta/resync/", delta=True)
+    other = Publisher(Topic("/compas_eve/test_delta/resync_other/", delta=True), transport=tx)
+    other.publish(Message(i=0))
+    publisher = Publisher(topic, transport=tx)
+    publisher.publish(Message(i=0))
+    requests = []
+    Subscriber(Topic(resync_topic_name(topic.name)), requests.append, transport=tx).subscribe()
+    Subscriber(Topic(resync_topic_name(other.topic.name)), requests.append, transport=tx).subscribe()
+    subscriber = Subscriber(topic, transport=tx)
+    subscriber.subscribe()
+
+    for i in range(1, 4):
+        publisher.publish(Message(i=i))
+    # The resync publisher is released and created again, and the missed message is a gap
+    subscriber.unsubscribe()
+    publisher.publish(Message(i=4))
+    subscriber.subscribe()
+    publisher.publish(Message(i=5))
+
+    assert resync_topic_name(topic.name) == "/compas_eve/delta/resync/compas_eve/test_delta/resync/"
+    assert [msg.publisher for msg in requests] == [publisher._delta.id, publisher._delta.id]
+    assert publisher._delta.keyframes == 2
+    assert other._delta.keyframes == 1
+
+
+def test_unsubscribe_releases_resync_publisher():
+    tx = InMemoryTransport()
+    topic = Topic("/compas_eve/test_delta/release/", delta=True)
+    publisher = Publisher(topic, transport=tx)
+    publisher.publish(Message(i=0))
+    subscriber = Subscriber(topic, transport=tx)
+    subscriber.subscribe()
+    publisher.publish(Message(i=1))
+    resync_publisher = subscriber._resync_publisher
+
+    assert resync_publisher.is_advertised
+    subscriber.unsubscribe()
+    assert not resync_publisher.is_advertised
+    assert subscriber._resync_publisher is None
+
+
+def test_wildcard_subscribers_wait_for_keyframes():
+    tx = InMemoryTransport()
+    topic = Topic("/compas_eve/test_delta/wildcard/state/", delta=True, keyframe_interval=3)
+    publisher = Publisher(topic, transport=tx)
+    publisher.publish(Message(i=0))
+    received = []
+    subscriber = Subscriber(Topic("/compas_eve/test_delta/wildcard/#", delta=True), received.append, transport=tx)
+    subscriber.subscribe()
+
+    for i in range(1, 5):
+        publisher.publish(Message(i=i))
+
+    assert [msg.i for msg in received] == [3, 4]
+    assert subscriber._resync_publisher is None
+
+
+def test_retained_messages_are_keyframes():
+    tx = InMemoryTransport()
+    topic = Topic("/compas_eve/test_delta/retain/", delta=True)
+    publisher = Publisher(topic, transport=tx)
+    publisher.publish(Message(i=0, name="state"))
+    publisher.publish(Message(i=1, name="state"), retain=True)
+    received = []
+
+    Subscriber(topic, received.append, transport=tx).subscribe()
+    publisher.publish(Message(i=2, name="state"))
+
+    assert [(msg.i, msg.name) for msg in received] == [(1, "state"), (2, "state")]
+
+
+def test_delta_with_batches_and_executor():
+    tx = InMemoryTransport()
+    topic = Topic("/compas_eve/test_delta/batches/", delta=True)
+    received = []
+    subscriber = Subscriber(topic, received.append, transport=tx, executor="thread")
+    subscriber.subscribe()
+    publisher = Publisher(topic, transport=tx, batch_size=4)
+
+    publisher.publish_many([Message(i=i, name="state") for i in range(3)])
+    for i in range(3, 10):
+        publisher.publish(Message(i=i, name="state"))
+    publisher.flush()
+    subscriber.executor.join()
+
+    assert [msg.i for msg in received] == list(range(10))
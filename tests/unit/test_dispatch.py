@@ -0,0 +1,63 @@
+import functools
+from threading import Event
+
+import pytest
+
+from compas_eve.dispatch import ShardedDispatcher
+
+
+def test_tasks_with_same_key_run_in_order():
+    dispatcher = ShardedDispatcher(workers=3)
+    results = []
+
+    for i in range(100):
+        dispatcher.submit("key", results.append, i)
+
+    dispatcher.join()
+    dispatcher.close()
+    assert results == list(range(100))
+
+
+def test_full_queue_rejects_non_blocking_submit():
+    dispatcher = ShardedDispatcher(workers=1, max_queue_size=2)
+    release = Event()
+
+    dispatcher.submit("key", release.wait, 3)
+    # Give the worker time to pick up the blocking task
+    while dispatcher.queue_sizes()[0]:
+        pass
+
+    assert dispatcher.submit("key", lambda: None, block=False)
+    assert dispatcher.submit("key", lambda: None, block=False)
+    assert not dispatcher.submit("key", lambda: None, block=False)
+    assert not dispatcher.submit("key", lambda: None, timeout=0.05)
+
+    release.set()
+    dispatcher.close()
+
+
+def test_submit_options_are_not_passed_to_func():
+    dispatcher = ShardedDispatcher(workers=1)
+    calls = []
+
+    def func(*args, **kwargs):
+        calls.append((args, kwargs))
+
+    dispatcher.submit("key", func, 1, block=True, timeout=1.0)
+    dispatcher.submit("key", functools.partial(func, 2, timeout=5))
+    dispatcher.close()
+
+    assert calls == [((1,), {}), ((2,), {"timeout": 5})]
+
+
+def test_submit_after_close_raises():
+    dispatcher = ShardedDispatcher(workers=1)
+    dispatcher.close()
+
+    with pytest.raises(RuntimeError):
+        dispatcher.submit("key", lambda: None)
+
+
+def test_invalid_worker_count_raises():
+    with pytest.raises(ValueError):
+        ShardedDispatcher(workers=0)
@@ -0,0 +1,154 @@
+from threading import Thread
+
+from compas_eve.event_emitter import EventEmitterMixin
+
+
+class Emitter(EventEmitterMixin):
+    pass
+
+
+def test_emit_without_listeners_does_not_register_event():
+    ee = Emitter()
+
+    assert not ee.emit("data", 1)
+    assert ee.listeners("data") == []
+    assert "data" not in ee._events
+
+
+def test_listener_added_during_emit_is_called_on_next_emit():
+    ee = Emitter()
+    calls = []
+
+    def late(value):
+        calls.append(("late", value))
+
+    def first(value):
+        calls.append(("first", value))
+        ee.on("data", late)
+
+    ee.on("data", first)
+    ee.emit("data", 1)
+    assert calls == [("first", 1)]
+
+    ee.off("data", first)
+    ee.emit("data", 2)
+    assert calls == [("first", 1), ("late", 2)]
+
+
+def test_remove_listener_during_emit_keeps_current_snapshot():
+    ee = Emitter()
+    calls = []
+
+    def first(value):
+        calls.append("first")
+        ee.off("data", second)
+
+    def second(value):
+        calls.append("second")
+
+    ee.on("data", first)
+    ee.on("data", second)
+    ee.emit("data", 1)
+    ee.emit("data", 2)
+
+    assert calls == ["first", "second", "first"]
+    assert ee.listeners("data") == [first]
+
+
+def test_once_is_called_once_across_threads():
+    ee = Emitter()
+    calls = []
+    ee.once("ready", lambda: calls.append(1))
+
+    threads = [Thread(target=lambda: [ee.emit("ready") for _ in range(100)]) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert calls == [1]
+    assert ee.listeners("ready") == []
+
+
+def test_concurrent_on_and_off_keep_listeners_consistent():
+    ee = Emitter()
+    callbacks = [lambda i=i: i for i in range(200)]
+
+    def register(chunk):
+        for f in chunk:
+            ee.on("data", f)
+            ee.emit("data")
+
+    threads = [Thread(target=register, args=(callbacks[i::4],)) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(ee.listeners("data")) == 200
+
+    for f in callbacks:
+        ee.off("data", f)
+    assert ee.listeners("data") == []
+    assert not ee.emit("data")
+
+
+def test_remove_all_listeners():
+    ee = Emitter()
+    ee.on("a", lambda: None)
+    ee.on("b", lambda: None)
+
+    ee.remove_all_listeners("a")
+    assert ee.listeners("a") == []
+    assert len(ee.listeners("b")) == 1
+
+    ee.remove_all_listeners()
+    assert ee.listeners("b") == []
+
+
+def test_event_locks_are_dropped_with_last_listener():
+    ee = Emitter()
+    callbacks = [lambda: None, lambda: None]
+
+    for i in range(100):
+        for f in callbacks:
+            ee.on("topic/{}".format(i), f)
+    for i in range(100):
+        for f in callbacks:
+            ee.off("topic/{}".format(i), f)
+    ee.on("a", callbacks[0])
+    ee.remove_all_listeners()
+
+    assert ee._event_locks == {}
+
+
+def test_concurrent_on_and_off_of_last_listener():
+    ee = Emitter()
+    calls = []
+
+    def toggle():
+        for _ in range(500):
+            f = lambda: None  # noqa: E731
+            ee.on("data", f)
+            ee.off("data", f)
+
+    threads = [Thread(target=toggle) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert ee.listeners("data") == []
+    assert ee._event_locks == {}
+    ee.on("data", lambda: calls.append(1))
+    assert ee.emit("data") and calls == [1]
+
+
+def test_remove_unknown_listener_returns_none():
+    ee = Emitter()
+    f = lambda: None  # noqa: E731
+    ee.on("data", f)
+
+    assert ee.remove_listener("data", lambda: None) is None
+    assert ee.remove_listener("other", f) is None
+    assert ee.listeners("data") == [f]
+    assert set(ee._event_locks) == {"data"}
@@ -0,0 +1,202 @@
+import asyncio
+import os
+import threading
+import time
+
+import pytest
+
+from compas_eve import InMemoryTransport
+from compas_eve import Message
+from compas_eve import Publisher
+from compas_eve import Subscriber
+from compas_eve import Topic
+from compas_eve.codecs import JsonMessageCodec
+from compas_eve.executors import InlineExecutor
+from compas_eve.executors import LoopExecutor
+from compas_eve.executors import ProcessExecutor
+from compas_eve.executors import ThreadExecutor
+from compas_eve.executors import get_executor
+
+
+def append_to_file(message):
+    with open(message.path, "a") as f:
+        f.write("{} {}\n".format(message.i, os.getpid()))
+
+
+def test_get_executor():
+    loop = asyncio.new_event_loop()
+
+    assert isinstance(get_executor(None), InlineExecutor)
+    assert get_executor("thread") is get_executor("thread")
+    assert isinstance(get_executor(loop), LoopExecutor)
+    with pytest.raises(ValueError):
+        get_executor("fiber")
+    loop.close()
+
+
+def test_queue_and_executor_are_exclusive():
+    with pytest.raises(ValueError):
+        Subscriber("/messages_compas_eve_test/executors/", queue_size=10, executor="thread")
+
+
+def test_thread_executor_does_not_block_publisher():
+    tx = InMemoryTransport()
+    topic = Topic("/messages_compas_eve_test/executors/thread/", Message)
+    release = threading.Event()
+    received = []
+
+    def slow(msg):
+        release.wait(timeout=5)
+        received.append(msg.i)
+
+    executor = ThreadExecutor(workers=2)
+    subscriber = Subscriber(topic, slow, transport=tx, executor=executor)
+    subscriber.subscribe()
+    for i in range(10):
+        Publisher(topic, transport=tx).publish(Message(i=i))
+
+    assert received == []
+    assert subscriber.stats["pending"] == 10
+    release.set()
+    executor.join()
+    executor.close()
+
+    assert received == list(range(10))
+    assert subscriber.stats["delivered"] == 10
+    assert subscriber.stats["max_queue_wait"] > 0
+
+
+def test_payloads_are_decoded_by_executor():
+    decoding_threads = []
+
+    class RecordingCodec(JsonMessageCodec):
+        def decode(self, encoded_data, message_type):
+            decoding_threads.append(threading.current_thread().name)
+            return super(RecordingCodec, self).decode(encoded_data, message_type)
+
+    tx = InMemoryTransport(codec=RecordingCodec())
+    topic = Topic("/messages_compas_eve_test/executors/decode/", Message)
+    received = []
+
+    executor = ThreadExecutor(workers=1, name="test-decode")
+    Subscriber(topic, received.append, transport=tx, executor=executor).subscribe()
+    Publisher(topic, transport=tx).publish(Message(i=1))
+    executor.close()
+
+    assert received[0].i == 1
+    assert decoding_threads == ["test-decode-0"]
+
+
+def test_thread_executor_unordered():
+    tx = InMemoryTransport()
+    topic = Topic("/messages_compas_eve_test/executors/unordered/", Message)
+    threads = set()
+
+    def callback(msg):
+        threads.add(threading.current_thread().name)
+        time.sleep(0.01)
+
+    executor = ThreadExecutor(workers=4)
+    Subscriber(topic, callback, transport=tx, executor=executor, ordered=False).subscribe()
+    for i in range(20):
+        Publisher(topic, transport=tx).publish(Message(i=i))
+    executor.close()
+
+    assert len(threads) == 4
+
+
+def test_failed_callbacks_are_counted(capsys):
+    tx = InMemoryTransport()
+    topic = Topic("/messages_compas_eve_test/executors/failed/", Message)
+
+    def callback(msg):
+        if msg.i % 2:
+            raise RuntimeError("failed")
+
+    executor = ThreadExecutor(workers=1)
+    subscriber = Subscriber(topic, callback, transport=tx, executor=executor)
+    subscriber.subscribe()
+    for i in range(4):
+        Publisher(topic, transport=tx).publish(Message(i=i))
+    executor.join()
+
+    assert subscriber.stats["delivered"] == 4
+    assert subscriber.stats["failed"] == 2
+    assert "RuntimeError" in capsys.readouterr().err
+    executor.close()
+
+
+def test_process_executor(tmp_path):
+    tx = InMemoryTransport()
+    topic = Topic("/messages_compas_eve_test/executors/process/", Message)
+    path = str(tmp_path / "received.txt")
+
+    executor = ProcessExecutor(workers=2)
+    subscriber = Subscriber(topic, append_to_file, transport=tx, executor=executor)
+    subscriber.subscribe()
+    for i in range(10):
+        Publisher(topic, transport=tx).publish(Message(i=i, path=path))
+    executor.join()
+    executor.close()
+
+    with open(path) as f:
+        lines = [line.split() for line in f]
+    assert [int(i) for i, _ in lines] == list(range(10))
+    assert all(int(pid) != os.getpid() for _, pid in lines)
+    assert subscriber.stats["delivered"] == 10
+
+
+def test_loop_executor_keeps_order_of_coroutines():
+    async def main():
+        tx = InMemoryTransport()
+        topic = Topic("/messages_compas_eve_test/executors/loop/", Message)
+        loop = asyncio.get_running_loop()
+        received = []
+        done = asyncio.Event()
+
+        async def callback(msg):
+            assert asyncio.get_running_loop() is loop
+            # Earlier messages take longer, but are still handled first
+            await asyncio.sleep(0.01 * (5 - msg.i))
+            received.append(msg.i)
+            if len(received) == 5:
+                done.set()
+
+        subscriber = Subscriber(topic, callback, transport=tx, executor=loop)
+        subscriber.subscribe()
+
+        def publish():
+            for i in range(5):
+                Publisher(topic, transport=tx).publish(Message(i=i))
+
+        await loop.run_in_executor(None, publish)
+        await asyncio.wait_for(done.wait(), timeout=5)
+        return received, subscriber.stats
+
+    received, stats = asyncio.run(main())
+
+    assert received == [0, 1, 2, 3, 4]
+    assert stats["delivered"] == 5
+    assert stats["pending"] == 0
+
+
+def test_loop_executor_unordered_coroutines_run_concurrently():
+    async def main():
+        tx = InMemoryTransport()
+        topic = Topic("/messages_compas_eve_test/executors/loop_unordered/", Message)
+        received = []
+        done = asyncio.Event()
+
+        async def callback(msg):
+            await asyncio.sleep(0.01 * (5 - msg.i))
+            received.append(msg.i)
+            if len(received) == 5:
+                done.set()
+
+        Subscriber(topic, callback, transport=tx, executor=asyncio.get_running_loop(), ordered=False).subscribe()
+        for i in range(5):
+            Publisher(topic, transport=tx).publish(Message(i=i))
+        await asyncio.wait_for(done.wait(), timeout=5)
+        return received
+
+    assert asyncio.run(main()) == [4, 3, 2, 1, 0]
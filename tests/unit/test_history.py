@@ -0,0 +1,78 @@
+import pytest
+
+from compas_eve.codecs import SharedPayload
+from compas_eve.memory import MessageHistory
+
+
+def payload(size):
+    return SharedPayload(b"x" * size, None)
+
+
+def test_depth_keeps_last_messages():
+    history = MessageHistory(depth=3)
+    payloads = [payload(1) for _ in range(5)]
+    for p in payloads:
+        history.append("a", p)
+
+    assert history.get("a") == payloads[-3:]
+    assert history.total_bytes == 3
+
+
+def test_topic_max_bytes_drops_oldest_messages():
+    history = MessageHistory(depth=10, topic_max_bytes=25)
+    payloads = [payload(10) for _ in range(4)]
+    for p in payloads:
+        history.append("a", p)
+
+    assert history.get("a") == payloads[-2:]
+
+
+def test_topic_max_bytes_keeps_newest_message():
+    history = MessageHistory(depth=10, topic_max_bytes=5)
+    history.append("a", payload(10))
+    large = payload(10)
+    history.append("a", large)
+
+    assert history.get("a") == [large]
+
+
+def test_max_bytes_evicts_least_recently_used_topics():
+    history = MessageHistory(depth=1, max_bytes=30)
+    history.append("a", payload(10))
+    history.append("b", payload(10))
+    history.append("c", payload(10))
+
+    # Reading `a` makes `b` the least recently used topic
+    history.get("a")
+    history.append("d", payload(10))
+
+    assert history.topics() == ["c", "a", "d"]
+    assert history.total_bytes == 30
+    assert history.evicted_topics == 1
+
+
+def test_sizes_are_measured_in_bytes():
+    history = MessageHistory(depth=10)
+    history.append("a", SharedPayload('{"name": "Zürich"}', None))
+    history.append("a", SharedPayload(memoryview(bytearray(8)).cast("d"), None))
+
+    assert history.total_bytes == 19 + 8
+
+
+def test_clear():
+    history = MessageHistory()
+    history.append("a", payload(10))
+    history.append("b", payload(10))
+
+    history.clear("a")
+    assert history.topics() == ["b"]
+    assert history.total_bytes == 10
+
+    history.clear()
+    assert len(history) == 0
+    assert history.total_bytes == 0
+
+
+def test_invalid_depth_raises():
+    with pytest.raises(ValueError):
+        MessageHistory(depth=0)
@@ -0,0 +1,219 @@
+import threading
+
+import pytest
+from compas.datastructures import Mesh
+from compas.geometry import Frame
+
+from compas_eve import InMemoryTransport
+from compas_eve import Message
+from compas_eve import Publisher
+from compas_eve import Subscriber
+from compas_eve import Topic
+from compas_eve import codecs
+from compas_eve.codecs import CompressedMessageCodec
+from compas_eve.codecs import FastJsonMessageCodec
+from compas_eve.codecs import JsonMessageCodec
+from compas_eve.codecs import MsgPackMessageCodec
+from compas_eve.lazy import LazyMessage
+
+
+@pytest.fixture(params=["json", "fast_json", "msgpack", "compressed"])
+def codec(request):
+    if request.param == "json":
+        return JsonMessageCodec()
+    if request.param == "fast_json":
+        return FastJsonMessageCodec()
+    if request.param == "msgpack":
+        if not codecs.MSGPACK_AVAILABLE:
+            pytest.skip("msgpack is not installed")
+        return MsgPackMessageCodec()
+    return CompressedMessageCodec(FastJsonMessageCodec(), algorithm="zlib", min_size=0)
+
+
+def counting_revive(codec):
+    # Wrappers delegate decoding to the codec they wrap
+    inner = getattr(codec, "codec", codec)
+    revived = []
+    revive = inner._revive
+
+    def wrapper(value):
+        revived.append(value)
+        return revive(value)
+
+    inner._revive = wrapper
+    return revived
+
+
+def roundtrip(codec, message, message_type):
+    encoded = codec.encode(message)
+    return codec.decode(encoded.encode("utf-8") if isinstance(encoded, str) else encoded, message_type)
+
+
+def sample_message():
+    return Message(timestamp=1.5, status="ok", mesh=Mesh.from_polyhedron(12), frame=Frame.worldXY(), tags=["a", "b"])
+
+
+def test_lazy_decode_only_revives_accessed_fields(codec):
+    revived = counting_revive(codec)
+
+    message = roundtrip(codec, sample_message(), LazyMessage)
+
+    assert isinstance(message, LazyMessage)
+    assert message.materialized == []
+    assert message.timestamp == 1.5
+    assert isinstance(message.frame, Frame)
+    assert message.frame == Frame.worldXY()
+    assert len(revived) == 2
+    assert "mesh" not in message.materialized
+    assert sorted(message.field_names) == ["frame", "mesh", "status", "tags", "timestamp"]
+
+
+def test_lazy_decode_materializes_field_once(codec):
+    revived = counting_revive(codec)
+    message = roundtrip(codec, sample_message(), LazyMessage)
+
+    assert message.mesh is message["mesh"]
+    assert isinstance(message.mesh, Mesh)
+    assert message.mesh.number_of_faces() == 12
+    assert len(revived) == 1
+
+
+def test_lazy_message_data_materializes_all_fields(codec):
+    message = roundtrip(codec, sample_message(), LazyMessage)
+
+    data = message.data
+
+    assert sorted(message.materialized) == ["frame", "mesh", "status", "tags", "timestamp"]
+    assert isinstance(data["mesh"], Mesh)
+    assert data["tags"] == ["a", "b"]
+
+
+def test_lazy_message_reencodes_like_original(codec):
+    original = Message(timestamp=1.5, frame=Frame.worldXY())
+    message = roundtrip(codec, original, LazyMessage)
+
+    assert roundtrip(codec, message, Message).frame == Frame.worldXY()
+
+
+def test_lazy_message_missing_field(codec):
+    message = roundtrip(codec, Message(a=1), LazyMessage)
+
+    assert "a" in message
+    assert "b" not in message
+    with pytest.raises(AttributeError):
+        message.b
+    with pytest.raises(KeyError):
+        message["b"]
+
+
+def test_lazy_message_set_field(codec):
+    message = roundtrip(codec, sample_message(), LazyMessage)
+
+    message.mesh = None
+    message["status"] = "error"
+
+    assert message.mesh is None
+    assert message.status == "error"
+    assert message.data["mesh"] is None
+
+
+def test_lazy_message_concurrent_access(codec):
+    revived = counting_revive(codec)
+    message = roundtrip(codec, sample_message(), LazyMessage)
+    meshes = []
+
+    threads = [threading.Thread(target=lambda: meshes.append(message.mesh)) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(revived) == 1
+    assert all(mesh is meshes[0] for mesh in meshes)
+
+
+def test_projection_drops_other_fields(codec):
+    revived = counting_revive(codec)
+    message_type = LazyMessage.project(["timestamp", "frame"])
+
+    message = roundtrip(codec, sample_message(), message_type)
+
+    assert sorted(message.field_names) == ["frame", "timestamp"]
+    assert message.data == {"timestamp": 1.5, "frame": Frame.worldXY()}
+    assert "mesh" not in message
+    assert len(revived) == 2
+
+
+def test_projection_types_are_cached():
+    assert LazyMessage.project(["a", "b"]) is LazyMessage.project(("b", "a"))
+    assert LazyMessage.project(["a"]) is not LazyMessage.project(["b"])
+    assert issubclass(LazyMessage.project(["a"]), LazyMessage)
+
+
+def test_projection_with_eager_codec():
+    message_type = LazyMessage.project(["a"])
+
+    message = message_type.parse({"a": 1, "b": 2})
+
+    assert message.data == {"a": 1}
+
+
+def test_lazy_decode_of_data_object(codec):
+    message = roundtrip(codec, Frame.worldXY(), LazyMessage)
+
+    assert message == Frame.worldXY()
+
+
+def test_subscriber_fields():
+    tx = InMemoryTransport(codec=JsonMessageCodec())
+    topic = Topic("/messages_compas_eve_test/lazy_fields/", Message)
+    received = []
+
+    subscriber = Subscriber(topic, received.append, transport=tx, fields=["status", "frame"])
+    subscriber.subscribe()
+    Publisher(topic, transport=tx).publish(sample_message())
+
+    assert len(received) == 1
+    assert received[0].status == "ok"
+    assert received[0].frame == Frame.worldXY()
+    assert sorted(received[0].field_names) == ["frame", "status"]
+    assert subscriber.topic.name == topic.name
+
+
+def test_subscriber_fields_with_passthrough():
+    tx = InMemoryTransport(passthrough=True)
+    topic = Topic("/messages_compas_eve_test/lazy_fields_passthrough/", Message)
+    received = []
+
+    Subscriber(topic, received.append, transport=tx, fields=["status"]).subscribe()
+    Publisher(topic, transport=tx).publish(sample_message())
+
+    assert received[0].data == {"status": "ok"}
+
+
+class Pose(LazyMessage):
+    def position(self):
+        return (self.x, self.y)
+
+
+def test_subscriber_fields_with_lazy_message_type():
+    tx = InMemoryTransport(codec=JsonMessageCodec())
+    topic = Topic("/messages_compas_eve_test/lazy_fields_pose/", Pose)
+    received = []
+
+    Subscriber(topic, received.append, transport=tx, fields=["x", "y"]).subscribe()
+    Publisher(topic, transport=tx).publish(Pose(x=1, y=2, theta=0.5))
+
+    assert isinstance(received[0], Pose)
+    assert received[0].position() == (1, 2)
+    assert sorted(received[0].field_names) == ["x", "y"]
+
+
+def test_subscriber_fields_with_eager_message_type():
+    class EagerPose(Message):
+        pass
+
+    topic = Topic("/messages_compas_eve_test/lazy_fields_eager/", EagerPose)
+
+    with pytest.raises(TypeError):
+        Subscriber(topic, transport=InMemoryTransport(), fields=["x"])
@@ -0,0 +1,148 @@
+import concurrent.futures
+import os
+import pickle
+import threading
+
+import numpy
+import pytest
+from compas.datastructures import Mesh
+
+from compas_eve import InMemoryTransport
+from compas_eve import Message
+from compas_eve import Publisher
+from compas_eve import Subscriber
+from compas_eve import Topic
+from compas_eve import codecs
+from compas_eve.codecs import CompressedMessageCodec
+from compas_eve.codecs import FastJsonMessageCodec
+from compas_eve.codecs import JsonMessageCodec
+from compas_eve.codecs import NumpyMessageCodec
+from compas_eve.executors import ThreadExecutor
+from compas_eve.lazy import LazyMessage
+from compas_eve.offload import OffloadCodec
+
+
+def shared_memory_blocks():
+    # Blocks created by SharedMemory, leaving out the semaphores of the process pools
+    return {name for name in os.listdir("/dev/shm") if name.startswith("psm_")} if os.path.isdir("/dev/shm") else set()
+
+
+@pytest.fixture
+def codec():
+    codec = OffloadCodec(FastJsonMessageCodec(), threshold=10000, workers=2)
+    yield codec
+    codec.close()
+
+
+def test_codecs_are_picklable():
+    for codec in [JsonMessageCodec(), FastJsonMessageCodec(), NumpyMessageCodec(), CompressedMessageCodec(level=3)]:
+        restored = pickle.loads(pickle.dumps(codec))
+        assert type(restored) is type(codec)
+        assert restored.decode(codecs._to_bytes(restored.encode(Message(a=1))), Message).a == 1
+
+
+def test_decode_large_payloads_in_worker(codec):
+    mesh = Mesh.from_meshgrid(dx=10, nx=40)
+    blocks = shared_memory_blocks()
+    large = codec.encode(Message(mesh=mesh))
+    small = codec.encode(Message(text="hello"))
+
+    decoded = codec.decode(large, Message)
+
+    assert codec.offloaded_decodes == 1
+    assert decoded.mesh.number_of_vertices() == mesh.number_of_vertices()
+    assert codec.decode(small, Message).text == "hello"
+    assert codec.offloaded_decodes == 1
+    assert shared_memory_blocks() == blocks
+
+
+def test_encode_in_process(codec):
+    message = Message(mesh=Mesh.from_meshgrid(dx=10, nx=40))
+
+    assert codec.encode(message) == FastJsonMessageCodec().encode(message)
+    assert codec.offloaded_decodes == 0
+
+
+def test_decode_errors_are_raised(codec):
+    blocks = shared_memory_blocks()
+    with pytest.raises(Exception):
+        codec.decode(b"[" * 20000, Message)
+    assert shared_memory_blocks() == blocks
+
+
+def test_decode_errors_release_shared_memory(codec):
+    class BrokenPool(object):
+        def submit(self, *args):
+            future = concurrent.futures.Future()
+            future.set_exception(concurrent.futures.process.BrokenProcessPool("worker died"))
+            return future
+
+    codec._get_pool = BrokenPool
+    blocks = shared_memory_blocks()
+
+    with pytest.raises(concurrent.futures.process.BrokenProcessPool):
+        codec.decode(codec.encode(Message(text="x" * 20000)), Message)
+    assert shared_memory_blocks() == blocks
+    assert codec.offloaded_decodes == 0
+
+
+def test_offloaded_decodes_are_counted_across_threads(codec):
+    encoded = codec.encode(Message(text="x" * 20000))
+
+    threads = [threading.Thread(target=lambda: [codec.decode(encoded, Message) for _ in range(5)]) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert codec.offloaded_decodes == 20
+
+
+def test_out_of_band_buffers():
+    codec = OffloadCodec(NumpyMessageCodec(FastJsonMessageCodec()), threshold=1000, workers=1)
+    points = numpy.random.rand(10000, 3)
+
+    decoded = codec.decode(codec.encode(Message(points=points)), Message)
+    codec.close()
+
+    assert codec.offloaded_decodes == 1
+    assert numpy.array_equal(decoded.points, points)
+
+
+def test_unpicklable_types_are_decoded_in_process(codec):
+    class LocalMessage(Message):
+        pass
+
+    encoded = codec.encode(Message(text="x" * 20000))
+
+    assert isinstance(codec.decode(encoded, LocalMessage), LocalMessage)
+    assert isinstance(codec.decode(encoded, LazyMessage), LazyMessage)
+    assert codec.offloaded_decodes == 0
+
+
+def test_messages_keep_their_order_per_topic(codec):
+    tx = InMemoryTransport(codec=codec)
+    executor = ThreadExecutor(workers=2)
+    received = {0: [], 1: []}
+    threads = set()
+
+    def callback(topic_index):
+        def _callback(msg):
+            threads.add(threading.current_thread().name)
+            received[topic_index].append(msg.i)
+
+        return _callback
+
+    for index in received:
+        Subscriber(Topic("/messages_compas_eve_test/offload/{}/".format(index)), callback(index), transport=tx, executor=executor).subscribe()
+    for i in range(6):
+        # Alternate large and small messages
+        for index in received:
+            text = "x" * 20000 if i % 2 else ""
+            Publisher(Topic("/messages_compas_eve_test/offload/{}/".format(index)), transport=tx).publish(Message(i=i, text=text))
+    executor.join()
+    executor.close()
+
+    assert received == {0: list(range(6)), 1: list(range(6))}
+    assert codec.offloaded_decodes == 6
+    assert threading.current_thread().name not in threads
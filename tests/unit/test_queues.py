@@ -0,0 +1,120 @@
+from threading import Event
+from threading import Thread
+
+import pytest
+
+from compas_eve.queues import SubscriberQueue
+
+
+def blocked_queue(policy, max_size=2):
+    """Create a queue whose worker is stuck handling a first message."""
+    release = Event()
+    started = Event()
+    handled = []
+
+    def handler(message):
+        if message == "first":
+            started.set()
+            release.wait(timeout=3)
+        handled.append(message)
+
+    queue = SubscriberQueue(handler, max_size=max_size, policy=policy)
+    queue.put("first")
+    assert started.wait(timeout=3)
+    return queue, release, handled
+
+
+def test_messages_are_handled_in_order():
+    handled = []
+    queue = SubscriberQueue(handled.append, max_size=10)
+
+    for i in range(100):
+        queue.put(i)
+
+    assert queue.join(timeout=3)
+    assert handled == list(range(100))
+    assert queue.stats["delivered"] == 100
+    assert queue.stats["dropped"] == 0
+
+
+def test_failed_messages_are_not_counted_as_delivered():
+    def handler(message):
+        if message % 2:
+            raise ValueError(message)
+
+    queue = SubscriberQueue(handler, max_size=10)
+    for i in range(10):
+        queue.put(i)
+
+    assert queue.join(timeout=3)
+    assert queue.stats["received"] == 10
+    assert queue.stats["delivered"] == 5
+    assert queue.stats["failed"] == 5
+
+
+def test_drop_oldest():
+    queue, release, handled = blocked_queue("drop_oldest")
+    for i in range(5):
+        queue.put(i)
+    assert queue.depth == 2
+
+    release.set()
+    assert queue.join(timeout=3)
+    assert handled == ["first", 3, 4]
+    assert queue.dropped == 3
+    assert queue.max_depth == 2
+
+
+def test_drop_newest():
+    queue, release, handled = blocked_queue("drop_newest")
+    results = [queue.put(i) for i in range(5)]
+
+    release.set()
+    assert queue.join(timeout=3)
+    assert results == [True, True, False, False, False]
+    assert handled == ["first", 0, 1]
+    assert queue.dropped == 3
+
+
+def test_keep_latest():
+    queue, release, handled = blocked_queue("keep_latest", max_size=10)
+    for i in range(5):
+        queue.put(i)
+    assert queue.depth == 1
+
+    release.set()
+    assert queue.join(timeout=3)
+    assert handled == ["first", 4]
+    assert queue.dropped == 4
+
+
+def test_block_waits_for_room():
+    queue, release, handled = blocked_queue("block", max_size=1)
+    queue.put(0)
+    put_done = Event()
+
+    def put():
+        queue.put(1)
+        put_done.set()
+
+    Thread(target=put).start()
+    assert not put_done.wait(timeout=0.1), "Put should block while the queue is full"
+
+    release.set()
+    assert put_done.wait(timeout=3)
+    assert queue.join(timeout=3)
+    assert handled == ["first", 0, 1]
+    assert queue.dropped == 0
+
+
+def test_closed_queue_rejects_messages():
+    handled = []
+    queue = SubscriberQueue(handled.append)
+    queue.close()
+
+    assert not queue.put(1)
+
+
+def test_invalid_policy_raises():
+    with pytest.raises(ValueError):
+        SubscriberQueue(lambda m: None, policy="unknown")
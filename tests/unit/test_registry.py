@@ -0,0 +1,208 @@
+import uuid
+from threading import Event
+
+import numpy
+import pytest
+
+from compas_eve import InMemoryTransport
+from compas_eve import Message
+from compas_eve import Publisher
+from compas_eve import Subscriber
+from compas_eve import Topic
+from compas_eve import codecs
+from compas_eve.codecs import CompressedMessageCodec
+from compas_eve.codecs import FastJsonMessageCodec
+from compas_eve.codecs import JsonMessageCodec
+from compas_eve.codecs import MessageCodec
+from compas_eve.codecs import MsgPackMessageCodec
+from compas_eve.codecs import NumpyMessageCodec
+from compas_eve.codecs.registry import MAGIC
+from compas_eve.codecs.registry import CodecRegistry
+from compas_eve.codecs.registry import is_tagged
+from compas_eve.codecs.registry import register_codec_id
+from compas_eve.codecs.registry import tag_buffers
+from compas_eve.codecs.registry import untag_payload
+from compas_eve.shm import SharedMemoryTransport
+
+
+def test_tag_roundtrip():
+    tagged = b"".join(tag_buffers("application/json", [b'{"a":', b"1}"]))
+
+    assert is_tagged(tagged)
+    content_type, data = untag_payload(tagged)
+    assert content_type == "application/json"
+    assert bytes(data) == b'{"a":1}'
+
+
+def test_tags_have_one_byte_per_codec():
+    content_type = "application/x-compas-eve-compressed+application/x-compas-eve-numpy+application/msgpack"
+    tag = tag_buffers(content_type, [b"data"])[0]
+
+    assert len(tag) == len(MAGIC) + 3
+    assert untag_payload(tag + b"data")[0] == content_type
+
+
+def test_invalid_tags():
+    with pytest.raises(ValueError):
+        tag_buffers("application/x-unknown", [b"data"])
+    with pytest.raises(ValueError):
+        tag_buffers("application/x-compas-eve-numpy", [b"data"])
+    with pytest.raises(ValueError):
+        untag_payload(MAGIC + b"\x80")
+    with pytest.raises(ValueError):
+        untag_payload(MAGIC + b"\x7f")
+
+
+def test_untagged_payloads():
+    assert not is_tagged(b'{"a":1}')
+    assert not is_tagged('{"a":1}')
+    assert not is_tagged(b"")
+
+
+@pytest.mark.skipif(not codecs.MSGPACK_AVAILABLE, reason="msgpack is not installed")
+def test_registry_prefers_registered_codecs():
+    registry = CodecRegistry()
+    codec = CompressedMessageCodec(NumpyMessageCodec(MsgPackMessageCodec()), algorithm="zlib")
+    registry.register(codec)
+
+    assert registry.get(codec.content_type) is codec
+
+
+@pytest.mark.skipif(not codecs.MSGPACK_AVAILABLE, reason="msgpack is not installed")
+def test_registry_creates_default_codecs():
+    registry = CodecRegistry()
+
+    codec = registry.get("application/x-compas-eve-compressed+application/x-compas-eve-numpy+application/msgpack")
+
+    assert isinstance(codec, CompressedMessageCodec)
+    assert isinstance(codec.codec, NumpyMessageCodec)
+    assert isinstance(codec.codec.codec, MsgPackMessageCodec)
+    assert isinstance(registry.get("application/json"), JsonMessageCodec)
+
+
+def test_registry_unknown_content_type():
+    with pytest.raises(ValueError):
+        CodecRegistry().get("application/x-unknown")
+
+
+def test_codec_without_content_type_cannot_be_used_on_topics():
+    with pytest.raises(ValueError):
+        CodecRegistry().register(MessageCodec())
+
+
+@pytest.mark.skipif(not codecs.MSGPACK_AVAILABLE, reason="msgpack is not installed")
+def test_topic_codecs_share_a_transport():
+    tx = InMemoryTransport(codec=FastJsonMessageCodec())
+    status = Topic("/compas_eve/test_registry/status/")
+    points = Topic("/compas_eve/test_registry/points/", codec=NumpyMessageCodec(MsgPackMessageCodec()))
+    received = []
+    Subscriber(Topic("/compas_eve/test_registry/#"), received.append, transport=tx).subscribe()
+
+    Publisher(status, transport=tx).publish(Message(state="scanning"))
+    Publisher(points, transport=tx).publish(Message(points=numpy.ones((10, 3))))
+
+    assert received[0].state == "scanning"
+    numpy.testing.assert_array_equal(received[1].points, numpy.ones((10, 3)))
+
+
+@pytest.mark.skipif(not codecs.MSGPACK_AVAILABLE, reason="msgpack is not installed")
+def test_topic_codec_with_batches_and_retain():
+    tx = InMemoryTransport()
+    topic = Topic("/compas_eve/test_registry/batches/", codec=MsgPackMessageCodec())
+    publisher = Publisher(topic, transport=tx)
+    publisher.publish(Message(i=-1), retain=True)
+    received = []
+    Subscriber(topic, received.append, transport=tx).subscribe()
+
+    publisher.publish_many([Message(i=i) for i in range(3)])
+
+    assert [msg.i for msg in received] == [-1, 0, 1, 2]
+
+
+@pytest.mark.skipif(not codecs.MSGPACK_AVAILABLE, reason="msgpack is not installed")
+def test_topic_codec_on_shared_memory():
+    tx = SharedMemoryTransport(slot_count=4, slot_size=4096, namespace="compas_eve_test_{}".format(uuid.uuid4().hex))
+    topic = Topic("/compas_eve/test_registry/shm/", codec=NumpyMessageCodec(MsgPackMessageCodec()))
+    event = Event()
+    received = []
+
+    def callback(msg):
+        received.append(msg.points)
+        event.set()
+
+    try:
+        Subscriber(Topic(topic.name), callback, transport=tx).subscribe()
+        Publisher(topic, transport=tx).publish(Message(points=numpy.arange(6.0)))
+
+        assert event.wait(timeout=3), "Message not received"
+        numpy.testing.assert_array_equal(received[0], numpy.arange(6.0))
+    finally:
+        tx.close(unlink=True)
+
+
+class ReversedJsonMessageCodec(JsonMessageCodec):
+    content_type = "application/x-compas-eve-test-reversed-json"
+
+    def encode(self, message):
+        return super(ReversedJsonMessageCodec, self).encode(message)[::-1]
+
+    def decode(self, encoded_data, message_type):
+        return super(ReversedJsonMessageCodec, self).decode(bytes(encoded_data).decode("utf-8")[::-1], message_type)
+
+
+def test_registered_codec_ids():
+    register_codec_id(ReversedJsonMessageCodec.content_type, 0x7F)
+    tx = InMemoryTransport()
+    topic = Topic("/compas_eve/test_registry/reversed/", codec=ReversedJsonMessageCodec())
+    received = []
+    Subscriber(topic, received.append, transport=tx).subscribe()
+
+    Publisher(topic, transport=tx).publish(Message(value=42))
+
+    assert received[0].value == 42
+    with pytest.raises(ValueError):
+        register_codec_id("application/x-compas-eve-test-other", 0x7F)
+    with pytest.raises(ValueError):
+        register_codec_id("application/x-compas-eve-test-other", 0x10)
+
+
+def test_codec_without_codec_id_cannot_be_used_on_topics():
+    class UnknownCodec(JsonMessageCodec):
+        content_type = "application/x-compas-eve-test-unknown"
+
+    with pytest.raises(ValueError):
+        CodecRegistry().register(UnknownCodec())
+
+
+@pytest.mark.skipif(not codecs.ZSTD_AVAILABLE, reason="zstandard is not installed")
+def test_topics_decode_with_their_own_codec():
+    def codec(robot):
+        samples = [Message(robot=robot, joints=[i / 10.0, 0.2, 0.3], state="moving") for i in range(500)]
+        return CompressedMessageCodec(algorithm="zstd", min_size=0, dictionary=CompressedMessageCodec.train_dictionary(samples, size=2048))
+
+    first = Topic("/compas_eve/test_registry/dictionaries/r1/", codec=codec("r1"))
+    second = Topic("/compas_eve/test_registry/dictionaries/r2/", codec=codec("r2"))
+    sender = CodecRegistry()
+    payloads = [b"".join(sender.encode_buffers(topic.options["codec"], Message(robot=robot, joints=[0.5, 0.2, 0.3]))) for topic, robot in [(first, "r1"), (second, "r2")]]
+
+    # Both topics are subscribed to on the receiving transport before any message arrives
+    tx = InMemoryTransport()
+    received = []
+    handlers = [tx._payload_handler(first, received.append), tx._payload_handler(second, received.append)]
+    for handler, payload in zip(handlers, payloads):
+        handler(tx._shared_payload(payload))
+
+    assert [msg.robot for msg in received] == ["r1", "r2"]
+
+
+def test_codecs_are_registered_once():
+    registry = CodecRegistry()
+    codec = FastJsonMessageCodec()
+    calls = []
+    register = registry.register
+    registry.register = lambda codec: (calls.append(codec), register(codec))
+
+    for i in range(3):
+        registry.encode_buffers(codec, Message(i=i))
+
+    assert calls == [codec]
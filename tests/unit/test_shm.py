@@ -0,0 +1,143 @@
+import subprocess
+import sys
+import uuid
+from threading import Event
+
+import pytest
+
+from compas_eve import Message
+from compas_eve import Publisher
+from compas_eve import Subscriber
+from compas_eve import Topic
+from compas_eve.shm import SharedMemoryTransport
+
+PUBLISHER_SCRIPT = """
+import sys
+from compas_eve import Message, Publisher, Topic
+from compas_eve.shm import SharedMemoryTransport
+
+tx = SharedMemoryTransport(namespace=sys.argv[1])
+publisher = Publisher(Topic("/messages_compas_eve_test/shm_process/"), transport=tx)
+for i in range(5):
+    publisher.publish(Message(value=i))
+tx.close()
+"""
+
+
+@pytest.fixture
+def namespace():
+    return "compas_eve_test_{}".format(uuid.uuid4().hex)
+
+
+@pytest.fixture
+def tx(namespace):
+    tx = SharedMemoryTransport(slot_count=8, slot_size=1024, namespace=namespace)
+    yield tx
+    tx.close(unlink=True)
+
+
+def test_pubsub(tx):
+    event = Event()
+    topic = Topic("/messages_compas_eve_test/shm_pubsub/", Message)
+    result = dict(value=None)
+
+    def callback(msg):
+        result["value"] = msg.value
+        event.set()
+
+    Subscriber(topic, callback, transport=tx).subscribe()
+    Publisher(topic, transport=tx).publish(Message(value=42))
+
+    assert event.wait(timeout=3), "Message not received"
+    assert result["value"] == 42
+
+
+def test_pubsub_numpy_arrays(namespace):
+    numpy = pytest.importorskip("numpy")
+    from compas_eve.codecs import NumpyMessageCodec
+
+    tx = SharedMemoryTransport(codec=NumpyMessageCodec(), slot_count=2, slot_size=64 * 1024, namespace=namespace)
+    event = Event()
+    topic = Topic("/messages_compas_eve_test/shm_numpy/", Message)
+    points = numpy.random.rand(1000, 3)
+    received = []
+
+    def callback(msg):
+        received.append(msg.points)
+        event.set()
+
+    try:
+        Subscriber(topic, callback, transport=tx).subscribe()
+        Publisher(topic, transport=tx).publish(Message(points=points))
+
+        assert event.wait(timeout=3), "Message not received"
+        numpy.testing.assert_array_equal(received[0], points)
+    finally:
+        tx.close(unlink=True)
+
+
+def test_pubsub_across_processes(tx, namespace):
+    topic = Topic("/messages_compas_eve_test/shm_process/", Message)
+    received = []
+    done = Event()
+
+    def callback(msg):
+        received.append(msg.value)
+        if msg.value == 4:
+            done.set()
+
+    Subscriber(topic, callback, transport=tx).subscribe()
+    subprocess.check_call([sys.executable, "-c", PUBLISHER_SCRIPT, namespace])
+
+    assert done.wait(timeout=5), "Messages from other process not received"
+    assert received == list(range(5))
+
+
+def test_retain_delivers_to_late_subscriber(tx):
+    topic = Topic("/messages_compas_eve_test/shm_retain/", Message)
+    Publisher(topic, transport=tx).publish(Message(value=1), retain=True)
+    Publisher(topic, transport=tx).publish(Message(value=2))
+
+    received = []
+    Subscriber(topic, lambda msg: received.append(msg.value), transport=tx).subscribe()
+
+    assert received == [1]
+
+
+def test_slow_subscriber_detects_overrun(tx):
+    topic = Topic("/messages_compas_eve_test/shm_overrun/", Message)
+    release = Event()
+    first_received = Event()
+    received = []
+    overruns = []
+
+    def callback(msg):
+        received.append(msg.value)
+        first_received.set()
+        release.wait(timeout=3)
+
+    tx.on("overrun", lambda topic_name, count: overruns.append(count))
+    Subscriber(topic, callback, transport=tx).subscribe()
+    publisher = Publisher(topic, transport=tx)
+
+    publisher.publish(Message(value=0))
+    assert first_received.wait(timeout=3)
+    for i in range(1, 21):
+        publisher.publish(Message(value=i))
+    release.set()
+
+    while not received or received[-1] != 20:
+        first_received.clear()
+        assert first_received.wait(timeout=3), "Remaining messages not received"
+
+    assert sum(overruns) == tx.dropped_messages[topic.name]
+    assert tx.dropped_messages[topic.name] > 0
+    assert received[0] == 0
+    assert received[-8:] == list(range(13, 21))
+
+
+def test_message_larger_than_slot_raises(tx):
+    topic = Topic("/messages_compas_eve_test/shm_too_large/", Message)
+
+    with pytest.raises(ValueError):
+        Publisher(topic, transport=tx).publish(Message(value="x" * 2048))
@@ -0,0 +1,135 @@
+import pytest
+
+from compas_eve import InMemoryTransport
+from compas_eve import Message
+from compas_eve import Publisher
+from compas_eve import Subscriber
+from compas_eve import Topic
+from compas_eve.codecs import JsonMessageCodec
+from compas_eve.codecs import StructMessageCodec
+from compas_eve.memory import ReferencePayload
+from compas_eve.structs import StructMessage
+
+
+class JointState(StructMessage):
+    __fields__ = [("sequence", "I"), ("timestamp", "d"), ("positions", "6d"), ("robot", "8s"), ("moving", "?")]
+
+
+class TimedJointState(JointState):
+    __fields__ = [("latency", "f")]
+
+
+def test_pack_unpack():
+    state = JointState(7, 1.5, positions=(0.0, 0.1, 0.2, 0.3, 0.4, 0.5), robot="r1", moving=True)
+
+    encoded = state.pack()
+    decoded = JointState.unpack(encoded)
+
+    assert len(encoded) == JointState.size() == 4 + 8 + 6 * 8 + 8 + 1
+    assert decoded == state
+    assert decoded.sequence == 7
+    assert decoded.positions == (0.0, 0.1, 0.2, 0.3, 0.4, 0.5)
+    assert decoded.robot == "r1"
+    assert decoded.moving is True
+
+
+def test_defaults_and_slots():
+    state = JointState()
+
+    assert state.data == dict(sequence=0, timestamp=0.0, positions=(0.0,) * 6, robot="", moving=False)
+    assert not hasattr(state, "__dict__")
+    with pytest.raises(AttributeError):
+        state.unknown = 1
+    with pytest.raises(TypeError):
+        JointState(unknown=1)
+
+
+def test_inherited_fields():
+    state = TimedJointState(sequence=1, latency=0.25)
+
+    assert TimedJointState.field_names() == ["sequence", "timestamp", "positions", "robot", "moving", "latency"]
+    assert TimedJointState.unpack(state.pack()) == state
+    assert not hasattr(state, "__dict__")
+
+
+def test_message_compatibility():
+    state = JointState(sequence=3, robot="r2")
+
+    assert state["sequence"] == 3
+    state["timestamp"] = 2.0
+    assert state.timestamp == 2.0
+    assert state.__jsondump__()["robot"] == "r2"
+
+    codec = JsonMessageCodec()
+    decoded = codec.decode(codec.encode(state).encode("utf-8"), JointState)
+    assert isinstance(decoded, JointState)
+    assert decoded.sequence == 3
+
+
+def test_invalid_declarations():
+    with pytest.raises(ValueError):
+
+        class InvalidFormat(StructMessage):
+            __fields__ = [("value", "z")]
+
+    with pytest.raises(ValueError):
+
+        class DuplicateField(StructMessage):
+            __fields__ = [("value", "d"), ("value", "f")]
+
+
+def test_unpack_wrong_size_raises():
+    with pytest.raises(ValueError):
+        JointState.unpack(b"\0" * 10)
+
+
+def test_struct_codec():
+    codec = StructMessageCodec()
+    state = JointState(sequence=1, positions=(1.0,) * 6)
+
+    assert codec.encode(state) == state.pack()
+    assert codec.decode(state.pack(), JointState) == state
+
+    # Other messages go through the wrapped codec
+    encoded = codec.encode(Message(text="hello"))
+    assert codec.decode(encoded.encode("utf-8"), Message).text == "hello"
+
+
+def test_struct_codec_transport():
+    tx = InMemoryTransport(codec=StructMessageCodec())
+    topic = Topic("/messages_compas_eve_test/structs/", JointState)
+    received = []
+
+    Subscriber(topic, received.append, transport=tx).subscribe()
+    publisher = Publisher(topic, transport=tx)
+    for i in range(3):
+        publisher.publish(JointState(sequence=i, timestamp=i * 0.001))
+
+    assert [state.sequence for state in received] == [0, 1, 2]
+    assert all(isinstance(state, JointState) for state in received)
+
+
+def test_reference_payload_conversion():
+    state = JointState(sequence=5, robot="r1")
+    payload = ReferencePayload(state)
+
+    assert not isinstance(state, Message)
+    assert payload.decode(JointState) is state
+    message = payload.decode(Message)
+    assert isinstance(message, Message)
+    assert message.data == state.data
+    timed = payload.decode(TimedJointState)
+    assert timed.sequence == 5 and timed.robot == "r1" and timed.latency == 0.0
+    assert ReferencePayload(state, deepcopy=True).decode(JointState) == state
+
+
+def test_passthrough_to_message_subscribers():
+    tx = InMemoryTransport(passthrough=True)
+    topic = Topic("/messages_compas_eve_test/structs_passthrough/", JointState)
+    received = []
+
+    Subscriber(Topic(topic.name, Message), received.append, transport=tx).subscribe()
+    Publisher(topic, transport=tx).publish(JointState(sequence=1, moving=True))
+
+    assert isinstance(received[0], Message)
+    assert received[0].sequence == 1 and received[0].moving is True
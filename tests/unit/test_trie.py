@@ -0,0 +1,135 @@
+import sys
+from threading import Event
+from threading import Thread
+
+from compas_eve.trie import MQTT_WILDCARDS
+from compas_eve.trie import TopicTrie
+from compas_eve.trie import is_wildcard
+from compas_eve.trie import to_mqtt_pattern
+from compas_eve.trie import to_zenoh_pattern
+from compas_eve.trie import topic_matches
+
+
+def test_exact_match():
+    trie = TopicTrie()
+    trie.add("robots/r1/state")
+
+    assert trie.match("robots/r1/state") == ["robots/r1/state"]
+    assert trie.match("robots/r2/state") == []
+    assert trie.match("robots/r1") == []
+
+
+def test_single_level_wildcards():
+    assert topic_matches("robots/+/state", "robots/r1/state")
+    assert topic_matches("robots/*/state", "robots/r1/state")
+    assert not topic_matches("robots/+/state", "robots/r1/arm/state")
+    assert not topic_matches("robots/+", "robots/r1/state")
+
+
+def test_multi_level_wildcards():
+    assert topic_matches("robots/#", "robots/r1/state")
+    assert topic_matches("robots/#", "robots")
+    assert topic_matches("robots/**/state", "robots/r1/arm/state")
+    assert topic_matches("robots/**/state", "robots/state")
+    assert not topic_matches("robots/**/state", "robots/r1/pose")
+    assert topic_matches("#", "/messages_compas_eve_test/")
+
+
+def test_wildcards_do_not_match_system_topics():
+    assert not topic_matches("#", "$SYS/broker/uptime")
+    assert not topic_matches("+/broker/uptime", "$SYS/broker/uptime")
+    assert topic_matches("$SYS/#", "$SYS/broker/uptime")
+
+
+def test_match_returns_each_pattern_once():
+    trie = TopicTrie()
+    for pattern in ["robots/r1/state", "robots/+/state", "robots/#", "robots/**", "#", "robots/r2/state"]:
+        trie.add(pattern)
+
+    assert sorted(trie.match("robots/r1/state")) == sorted(["robots/r1/state", "robots/+/state", "robots/#", "robots/**", "#"])
+
+
+def test_remove_is_reference_counted():
+    trie = TopicTrie()
+    trie.add("robots/+/state")
+    trie.add("robots/+/state")
+
+    trie.remove("robots/+/state")
+    assert trie.match("robots/r1/state") == ["robots/+/state"]
+
+    trie.remove("robots/+/state")
+    assert trie.match("robots/r1/state") == []
+    assert len(trie) == 0
+    assert not trie._root.children, "Empty branches should be pruned"
+
+
+def test_remove_all():
+    trie = TopicTrie()
+    trie.add("robots/#")
+    trie.add("robots/#")
+
+    trie.remove("robots/#", all=True)
+    assert "robots/#" not in trie
+
+
+def test_pattern_conversion():
+    assert is_wildcard("robots/+/state")
+    assert is_wildcard("robots/**")
+    assert not is_wildcard("robots/r1/state")
+    assert to_mqtt_pattern("robots/*/state/**") == "robots/+/state/#"
+    assert to_zenoh_pattern("robots/+/state/#") == "robots/*/state/**"
+
+
+def test_mqtt_wildcards_only():
+    trie = TopicTrie(MQTT_WILDCARDS)
+    trie.add("robots/*/state")
+    trie.add("robots/**")
+
+    assert trie.match("robots/*/state") == ["robots/*/state"]
+    assert trie.match("robots/r1/state") == []
+    assert not is_wildcard("robots/*/state", MQTT_WILDCARDS)
+    assert not topic_matches("robots/**", "robots/r1", MQTT_WILDCARDS)
+    assert topic_matches("robots/+/state", "robots/*/state", MQTT_WILDCARDS)
+
+
+def test_match_while_patterns_change():
+    trie = TopicTrie()
+    trie.add("robots/+/state")
+    errors = []
+    done = Event()
+
+    def change(i):
+        try:
+            for j in range(5000):
+                pattern = "robots/r{}/sensor{}/#".format(i, j % 2)
+                trie.add(pattern)
+                trie.remove(pattern)
+        except Exception as error:
+            errors.append(error)
+
+    def match():
+        try:
+            while not done.is_set():
+                assert "robots/+/state" in trie.match("robots/r1/state")
+                trie.match("robots/r1/sensor1/x")
+        except Exception as error:
+            errors.append(error)
+
+    readers = [Thread(target=match) for _ in range(2)]
+    writers = [Thread(target=change, args=(i % 2,)) for i in range(4)]
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        for thread in readers + writers:
+            thread.start()
+        for thread in writers:
+            thread.join()
+        done.set()
+        for thread in readers:
+            thread.join()
+    finally:
+        sys.setswitchinterval(interval)
+
+    assert errors == []
+    assert trie.patterns() == {"robots/+/state": 1}
+    assert list(trie._root.children) == ["robots"]